@@ -8,16 +8,22 @@ import pyglet
 import autoprop
 
 from vecrec import Vector, Rect
-from glooey import containers
+from glooey import drawing, containers
 from glooey.widget import Widget
 from glooey.containers import Deck, Stack
 from glooey.text import Label
 from glooey.images import Image, Background
 from glooey.helpers import *
 
-@autoprop
-class Rollover(Deck):
-    custom_predicate = lambda self, w: True
+class RolloverMixin:
+    """
+    Change state to match the rollover state of one or more controller 
+    widgets.
+
+    This is the logic shared by `Rollover` and `RolloverBackground`.  Classes 
+    using this mixin need to call `_init_controllers()` from their constructor, 
+    and to implement `set_state()` and `is_state_missing()`.
+    """
     custom_rollover_state_priorities = {
             'base': 0,
             'over': 1,
@@ -25,12 +31,12 @@ class Rollover(Deck):
             'off': 3,
     }
 
-    def __init__(self, controller, initial_state, predicate=None, **states):
-        super().__init__(initial_state, **states)
+    def _init_controllers(self, controller):
         self._controllers = [controller]
-        self._predicate = predicate or self.custom_predicate
 
     def do_attach(self):
+        super().do_attach()
+
         for widget in self._controllers:
             self._add_handlers(widget)
 
@@ -39,6 +45,8 @@ class Rollover(Deck):
         self._update_state()
 
     def do_detach(self):
+        super().do_detach()
+
         for widget in self._controllers:
             self._remove_handlers(widget)
 
@@ -50,19 +58,6 @@ class Rollover(Deck):
         self._controllers.remove(widget)
         self._remove_handlers(widget)
 
-    def get_predicate(self):
-        return self._predicate
-
-    def set_predicate(self, new_predicate):
-        self._predicate = new_predicate
-
-    def is_state_missing(self, state):
-        if state not in self.known_states:
-            return True
-        else:
-            widget = self.get_widget(state)
-            return not self.predicate(widget)
-
     def _update_state(self, *ignored_event_args):
         state = 'base'
         priority = self.custom_rollover_state_priorities
@@ -100,6 +95,103 @@ class Rollover(Deck):
         )
 
 
+@autoprop
+class Rollover(RolloverMixin, Deck):
+    custom_predicate = lambda self, w: True
+
+    def __init__(self, controller, initial_state, predicate=None, **states):
+        super().__init__(initial_state, **states)
+        self._init_controllers(controller)
+        self._predicate = predicate or self.custom_predicate
+
+    def get_predicate(self):
+        return self._predicate
+
+    def set_predicate(self, new_predicate):
+        self._predicate = new_predicate
+
+    def is_state_missing(self, state):
+        if state not in self.known_states:
+            return True
+        else:
+            widget = self.get_widget(state)
+            return not self.predicate(widget)
+
+
+@autoprop
+class RolloverBackground(RolloverMixin, Background):
+    """
+    A background that changes its appearance to match the rollover state of 
+    one or more controller widgets.
+
+    `Rollover` switches between a different widget for each state, which means 
+    deleting the vertex lists for one widget and creating new ones for the 
+    other every time the mouse moves on or off a button.  This widget instead 
+    keeps a single set of vertex lists, and just changes their colors and 
+    texture coordinates when the state changes.  The vertex lists are only 
+    recreated if the states are drawn differently enough that it can't be 
+    avoided, e.g. if one state has an outline and another doesn't, or if the 
+    images for different states aren't in the same texture.
+
+    The appearance of each state is given by the same options that are 
+    accepted by `Background.set_appearance()`.
+    """
+
+    def __init__(self, controller, **appearances):
+        super().__init__()
+        self._init_controllers(controller)
+        self._state = 'base'
+        self._appearances = {k: {} for k in self.known_states}
+        self._min_sizes = {k: (0, 0) for k in self.known_states}
+
+        for state, appearance in appearances.items():
+            self.set_state_appearance(state, **appearance)
+
+    def do_claim(self):
+        # Claim enough space for the biggest state, so that changing state 
+        # never requires a repack.
+        return (
+                max(w for w, h in self._min_sizes.values()),
+                max(h for w, h in self._min_sizes.values()),
+        )
+
+    def get_state(self):
+        return self._state
+
+    def set_state(self, new_state):
+        if new_state not in self._appearances:
+            raise ValueError(f"unknown state '{new_state}'")
+
+        if self._state != new_state:
+            self._state = new_state
+            self._artist.set_appearance(**self._appearances[new_state])
+
+    def get_known_states(self):
+        return tuple(self.custom_rollover_state_priorities)
+
+    def get_state_appearance(self, state):
+        return self._appearances[state]
+
+    def set_state_appearance(self, state, **appearance):
+        if state not in self._appearances:
+            raise ValueError(f"unknown state '{state}'")
+
+        self._appearances[state] = appearance
+
+        # Measure the appearance without making any vertex lists for it.
+        self._min_sizes[state] = drawing.Background(
+                hidden=True, **appearance).min_size
+
+        if state == self._state:
+            self._artist.set_appearance(**appearance)
+        self._repack()
+
+    def is_state_missing(self, state):
+        appearance = self._appearances.get(state)
+        return not appearance or all(
+                v is None or v == 'auto' for v in appearance.values())
+
+
 @autoprop
 class Button(Widget):
     """
@@ -149,6 +241,13 @@ class Button(Widget):
     `Background` (the default) and `Image` are the only two built-in widgets 
     which implement these methods.
 
+    Alternatively, setting ``custom_shared_background = True`` makes the button 
+    use a single `RolloverBackground` for all of its states.  This is faster 
+    when the mouse moves over lots of buttons, but it means the background 
+    must be configured with appearance options (e.g. ``custom_base_color``) 
+    rather than with widgets, and the `Button.Background` family of inner 
+    classes is ignored.
+
     The most common way to customize a `Button` subclass is using custom 
     attributes.  You can specify different attributes for each background 
     widget using the following shorthand notation: ``custom_<state>_<attr> = 
@@ -216,6 +315,16 @@ class Button(Widget):
     which is sometimes desirable.
     """
 
+    custom_shared_background = False
+    """
+    Use one `RolloverBackground` widget for every rollover state, rather than 
+    a separate `Button.Background` widget for each one.
+
+    This means that the background vertex lists are reused (i.e. their colors 
+    and texture coordinates are updated in place) when the rollover state 
+    changes.  See the class docstring for the restrictions this imposes.
+    """
+
     custom_text = None
     """
     The text to display on the button.
@@ -251,14 +360,20 @@ class Button(Widget):
 
         self._foreground = self.Foreground(*args, **kwargs) \
                 if self.Foreground else None
-        self._background = Rollover(
-                self, 'base', predicate=lambda w: not w.is_empty)
-        self._background.add_states(
-                base = (self.Base or self.Background)(),
-                over = (self.Over or self.Background)(),
-                down = (self.Down or self.Background)(),
-                off  = (self.Off  or self.Background)(),
-        )
+        # Only the base background is created right away.  The others are 
+        # given to the rollover as factories, so they're only created if the 
+        # mouse actually interacts with the button (or if it's disabled).
+        if self.custom_shared_background:
+            self._background = RolloverBackground(self)
+        else:
+            self._background = Rollover(
+                    self, 'base', predicate=lambda w: not w.is_empty)
+            self._background.add_states(
+                    base = self.Base or self.Background,
+                    over = self.Over or self.Background,
+                    down = self.Down or self.Background,
+                    off  = self.Off  or self.Background,
+            )
 
         if self.custom_text is not None:
             self._foreground.text = self.custom_text
@@ -367,7 +482,8 @@ class Button(Widget):
             # If we just got the name of a state with no suffix, replace that 
             # state with the given argument (which should be a widget).
             if len(tokens) == 1:
-                self._background.add_state(arg)
+                self._require_separate_backgrounds()
+                self._background.add_state(tokens[0], arg)
 
             # Otherwise, pass the argument through to the `set_appearance()` 
             # method for the indicated background widget.
@@ -375,37 +491,54 @@ class Button(Widget):
                 appearance_args[tokens[0]][tokens[1]] = arg
 
         # We have to make only one call to `set_appearance()` per background 
-        # widget, otherwise later calls would override earlier calls.
+        # widget, otherwise later calls would override earlier calls.  Don't 
+        # create any background widgets that haven't been needed yet, though.
         for key, args in appearance_args.items():
-            self._background[key].set_appearance(**args)
+            if self.custom_shared_background:
+                self._background.set_state_appearance(key, **args)
+            else:
+                self._background.configure_state(
+                        key, lambda w, args=args: w.set_appearance(**args))
 
     def del_background(self):
         self.set_background()
 
     def get_base_background(self):
+        self._require_separate_backgrounds()
         return self._background['base']
 
     def set_base_background(self, widget):
+        self._require_separate_backgrounds()
         self._background.add_state('base', widget)
 
     def get_over_background(self):
+        self._require_separate_backgrounds()
         return self._background['over']
 
     def set_over_background(self, widget):
+        self._require_separate_backgrounds()
         self._background.add_state('over', widget)
 
     def get_down_background(self):
+        self._require_separate_backgrounds()
         return self._background['down']
 
     def set_down_background(self, widget):
+        self._require_separate_backgrounds()
         self._background.add_state('down', widget)
 
     def get_off_background(self):
+        self._require_separate_backgrounds()
         return self._background['off']
 
     def set_off_background(self, widget):
+        self._require_separate_backgrounds()
         self._background.add_state('off', widget)
 
+    def _require_separate_backgrounds(self):
+        if self.custom_shared_background:
+            raise UsageError("buttons with a shared background don't have separate background widgets for each rollover state; use set_background() to change the appearance of each state instead.")
+
     def _yield_layers(self):
         if self._foreground:
             yield self._foreground
@@ -421,20 +554,71 @@ class Button(Widget):
         """
         background_args = {}
 
+        # Look up the values with getattr() rather than taking them from the 
+        # class dictionaries, so that descriptors (e.g. lazy theme assets) are 
+        # resolved and subclasses take precedence over their bases.
         for key in self._background.known_states:
             background_args.update({
-                    k[len('custom_'):]: v
+                    k[len('custom_'):]: getattr(self, k)
                     for cls in self.__class__.__mro__
-                    for k, v in cls.__dict__.items()
+                    for k in cls.__dict__
                     if k.startswith(f'custom_{key}_')
             })
 
         if background_args:
             self.set_background(**background_args)
             
+class CheckboxMixin:
+    """
+    Toggle between the checked and unchecked states when clicked, either 
+    directly or via proxy widgets.
+
+    This is the logic shared by `Checkbox` and `SpriteCheckbox`.  Classes 
+    using this mixin need to set ``_defer_clicks_to_proxies`` from their 
+    constructor, and to implement `_get_checked_state()`, 
+    `_set_checked_state()`, `_add_proxy_controller()`, and 
+    `_remove_proxy_controller()`.
+    """
+
+    def on_click(self, widget):
+        if self._defer_clicks_to_proxies and widget is self:
+            return
+        else:
+            self.toggle()
+
+    def toggle(self):
+        if self.is_enabled:
+            self._set_checked_state(not self.is_checked)
+            self.dispatch_event('on_toggle', self)
+
+    def check(self):
+        if not self.is_checked:
+            self.toggle()
+
+    def uncheck(self):
+        if self.is_checked:
+            self.toggle()
+
+    @property
+    def is_checked(self):
+        return self._get_checked_state()
+
+    def add_proxy(self, widget, exclusive=False):
+        widget.push_handlers(on_click=self.on_click)
+        widget.push_handlers(on_detach=self.remove_proxy)
+        self._add_proxy_controller(widget)
+        self._defer_clicks_to_proxies = exclusive
+
+    def remove_proxy(self, widget, exclusive=False):
+        widget.remove_handlers(on_click=self.on_click)
+        widget.remove_handlers(on_detach=self.remove_proxy)
+        self._remove_proxy_controller(widget)
+        self._defer_clicks_to_proxies = exclusive
+
+
 @autoprop
 @register_event_type('on_toggle')
-class Checkbox(Widget):
+class Checkbox(CheckboxMixin, Widget):
     """
     A button that can be in one of two states: checked and unchecked.
 
@@ -481,51 +665,38 @@ class Checkbox(Widget):
     def do_claim(self):
         return self._deck.claimed_size
 
-    def on_click(self, widget):
-        if self._defer_clicks_to_proxies and widget is self:
-            return
-        else:
-            self.toggle()
-
-    def toggle(self):
-        if self.is_enabled:
-            self._deck.state = not self._deck.state
-            self.dispatch_event('on_toggle', self)
-
-    def check(self):
-        if not self.is_checked:
-            self.toggle()
-
-    def uncheck(self):
-        if self.is_checked:
-            self.toggle()
-
-    @property
-    def is_checked(self):
-        return self._deck.state
-
     def set_images(self, *,
             checked_base=None, unchecked_base=None,
             checked_over=None, unchecked_over=None,
             checked_down=None, unchecked_down=None,
             checked_off=None,  unchecked_off=None):
 
-        checked = Rollover(self, 'base')
-        checked.add_states_if(
-                lambda w: w.image is not None,
-                base=Image(checked_base),
-                over=Image(checked_over),
-                down=Image(checked_down),
-                off=Image(checked_off),
-        )
-        unchecked = Rollover(self, 'base')
-        unchecked.add_states_if(
-                lambda w: w.image is not None,
-                base=Image(unchecked_base),
-                over=Image(unchecked_over),
-                down=Image(unchecked_down),
-                off=Image(unchecked_off),
-        )
+        # Leave out the states that don't have images, and don't make images 
+        # for the other states until they're actually shown.  Likewise, don't 
+        # make the rollover for whichever of checked/unchecked isn't showing.
+        def image_factories(**images): #
+            return {
+                    k: (lambda image=image: Image(image))
+                    for k, image in images.items()
+                    if image is not None
+            }
+
+        def checked(): #
+            return Rollover(self, 'base', **image_factories(
+                    base=checked_base,
+                    over=checked_over,
+                    down=checked_down,
+                    off=checked_off,
+            ))
+
+        def unchecked(): #
+            return Rollover(self, 'base', **image_factories(
+                    base=unchecked_base,
+                    over=unchecked_over,
+                    down=unchecked_down,
+                    off=unchecked_off,
+            ))
+
         with self._deck.hold_updates():
             self._deck[True] = checked
             self._deck[False] = unchecked
@@ -533,67 +704,225 @@ class Checkbox(Widget):
     def del_images(self):
         self._deck.clear_states()
 
-    def add_proxy(self, widget, exclusive=False):
-        widget.push_handlers(on_click=self.on_click)
-        widget.push_handlers(on_detach=self.remove_proxy)
+    def _get_checked_state(self):
+        return self._deck.state
+
+    def _set_checked_state(self, is_checked):
+        self._deck.state = is_checked
+
+    def _add_proxy_controller(self, widget):
         self._deck[True].add_controller(widget)
         self._deck[False].add_controller(widget)
-        self._defer_clicks_to_proxies = exclusive
 
-    def remove_proxy(self, widget, exclusive=False):
-        widget.remove_handlers(on_click=self.on_click)
-        widget.remove_handlers(on_detach=self.remove_proxy)
+    def _remove_proxy_controller(self, widget):
         self._deck[True].remove_controller(widget)
         self._deck[False].remove_controller(widget)
-        self._defer_clicks_to_proxies = exclusive
 
 @autoprop
-class RadioButton(Checkbox):
+@register_event_type('on_toggle')
+class SpriteCheckbox(CheckboxMixin, RolloverMixin, Widget):
     """
-    A checkbox in a group of checkboxes, where only one can be checked at any 
-    given time.
+    A checkbox that draws all eight of its states using a single sprite.
+
+    `Checkbox` makes a separate image widget (each with its own sprite) for 
+    every state it shows.  This class instead keeps one sprite and just changes 
+    which image it displays.  If the images are all regions of the same texture 
+    (e.g. cut from a sprite sheet or packed into a texture atlas), changing 
+    states only updates the sprite's texture coordinates.  This makes a big 
+    difference for GUIs with hundreds of checkboxes.
+
+    The images can be specified using the same custom attributes as 
+    `Checkbox`, or all at once using `custom_sprite_sheet`.  A sprite sheet is 
+    divided into two rows and four columns.  The top row holds the unchecked 
+    images and the bottom row holds the checked images.  The columns hold the 
+    base, over, down, and off images, from left to right.
     """
+    custom_sprite_sheet = None
+    custom_checked_base = None; custom_unchecked_base = None
+    custom_checked_over = None; custom_unchecked_over = None
+    custom_checked_down = None; custom_unchecked_down = None
+    custom_checked_off  = None; custom_unchecked_off  = None
+    custom_alignment = 'center'
 
-    def __init__(self, peers=None, *, is_checked=False):
+    def __init__(self, is_checked=False):
         """
-        Instantiate a new radio button.
+        Instantiate a new checkbox.
 
         Arguments:
-            peers (list):
-                A list of radio buttons to group together, such that only one 
-                can be checked at a time.  This button will be added to the 
-                list automatically.  A common idiom is to create an empty list 
-                and pass it to the constructor of each radio button in a group, 
-                e.g.::
-
-                    >>> import glooey
-                    >>> g = []
-                    >>> b1 = glooey.RadioButton(g)
-                    >>> b2 = glooey.RadioButton(g)
-                    >>> b3 = glooey.RadioButton(g)
-
-                Since each button holds a reference to the same list, and each 
-                button adds itself to that list, this lets each button in the 
-                group know about all of its peers.
-
             is_checked (bool):
                 If true, the checkbox will begin in the checked state.  See 
                 `Checkbox.__init__` for details.
-                
         """
-        super().__init__(is_checked=is_checked)
-        self.peers = peers if peers is not None else []
+        super().__init__()
+        self._init_controllers(self)
+        self._is_checked = bool(is_checked)
+        self._state = 'base'
+        self._images = {}
+        self._sprite = None
+        self._defer_clicks_to_proxies = False
+
+        if self.custom_sprite_sheet is not None:
+            self.set_sprite_sheet(self.custom_sprite_sheet)
+        else:
+            self.set_images(
+                    checked_base=self.custom_checked_base,
+                    checked_over=self.custom_checked_over,
+                    checked_down=self.custom_checked_down,
+                    checked_off=self.custom_checked_off,
+                    unchecked_base=self.custom_unchecked_base,
+                    unchecked_over=self.custom_unchecked_over,
+                    unchecked_down=self.custom_unchecked_down,
+                    unchecked_off=self.custom_unchecked_off,
+            )
+
+    def do_claim(self):
+        # Claim enough space for the biggest image, so that changing states 
+        # never requires a repack.
+        width = max((x.width for x in self._images.values()), default=0)
+        height = max((x.height for x in self._images.values()), default=0)
+        return width, height
+
+    def do_regroup(self):
+        if self._sprite is not None:
+            self._sprite.batch = self.batch
+            self._sprite.group = self.group
+
+    def do_draw(self):
+        image = self._images.get((self._is_checked, self._state))
+
+        if image is None:
+            self.do_undraw()
+            return
+
+        if self._sprite is None:
+            self._sprite = pyglet.sprite.Sprite(
+                    image, batch=self.batch, group=self.group)
+        elif self._sprite.image is not image:
+            self._sprite.image = image
+
+        self._sprite.position = (
+                self.rect.left + (self.rect.width - image.width) // 2,
+                self.rect.bottom + (self.rect.height - image.height) // 2,
+        )
+
+    def do_undraw(self):
+        if self._sprite is not None:
+            self._sprite.delete()
+            self._sprite = None
+
+    def get_state(self):
+        return self._state
+
+    def set_state(self, new_state):
+        self._state = new_state
+        self._draw()
+
+    def is_state_missing(self, state):
+        return (self._is_checked, state) not in self._images
+
+    def set_images(self, *,
+            checked_base=None, unchecked_base=None,
+            checked_over=None, unchecked_over=None,
+            checked_down=None, unchecked_down=None,
+            checked_off=None,  unchecked_off=None):
+
+        images = {
+                (True, 'base'): checked_base,
+                (True, 'over'): checked_over,
+                (True, 'down'): checked_down,
+                (True, 'off'): checked_off,
+                (False, 'base'): unchecked_base,
+                (False, 'over'): unchecked_over,
+                (False, 'down'): unchecked_down,
+                (False, 'off'): unchecked_off,
+        }
+        self._images = {k: v for k, v in images.items() if v is not None}
+        self._repack()
+        self._update_state()
+
+    def del_images(self):
+        self.set_images()
+
+    def set_sprite_sheet(self, sheet):
+        # Make a texture grid, so that every image is a region of the same 
+        # texture.  Note that row 0 is the bottom row of the sheet.
+        grid = pyglet.image.TextureGrid(pyglet.image.ImageGrid(sheet, 2, 4))
+        states = 'base', 'over', 'down', 'off'
+
+        self.set_images(
+                **{f'checked_{k}': grid[0, i] for i, k in enumerate(states)},
+                **{f'unchecked_{k}': grid[1, i] for i, k in enumerate(states)},
+        )
+
+    def _get_checked_state(self):
+        return self._is_checked
+
+    def _set_checked_state(self, is_checked):
+        self._is_checked = is_checked
+        self._update_state()
+
+    def _add_proxy_controller(self, widget):
+        self.add_controller(widget)
+
+    def _remove_proxy_controller(self, widget):
+        self.remove_controller(widget)
+
+
+class RadioGroup(list):
+    """
+    A list of radio buttons that keeps track of which one is checked.
+
+    Radio buttons can be grouped using a plain list, but then checking one 
+    button means looping through all of its peers to uncheck them.  When the 
+    buttons are grouped using this class instead, only the button that was 
+    checked before needs to be unchecked.
+    """
+
+    def __init__(self, buttons=()):
+        super().__init__(buttons)
+        self._checked = None
+
+    @property
+    def checked(self):
+        """
+        The radio button in this group that is currently checked, or None if 
+        no button is checked.
+        """
+        return self._checked
+
+    def _on_toggle(self, button):
+        if button.is_checked:
+            previous, self._checked = self._checked, button
+            if previous is not None and previous is not button:
+                previous.uncheck()
+
+        elif button is self._checked:
+            self._checked = None
+
+
+@autoprop
+class RadioMixin:
+    """
+    Uncheck the other buttons in a group when this button is checked.
+
+    This is the logic shared by `RadioButton` and `SpriteRadioButton`.  
+    Classes using this mixin need to set the ``peers`` attribute from their 
+    constructor.
+    """
 
     def on_click(self, widget):
         if self._defer_clicks_to_proxies and widget is self:
             return
-        elif self._deck.state:
+        elif self.is_checked:
             return
         else:
             self.toggle()
 
     def on_toggle(self, widget):
-        if self.is_checked:
+        if isinstance(self.peers, RadioGroup):
+            self.peers._on_toggle(self)
+
+        elif self.is_checked:
             for peer in self.peers:
                 if peer is not self:
                     peer.uncheck()
@@ -606,4 +935,59 @@ class RadioButton(Checkbox):
             peers.append(self)
         self._peers = peers
 
+        if isinstance(peers, RadioGroup) and self.is_checked:
+            peers._on_toggle(self)
 
+
+@autoprop
+class RadioButton(RadioMixin, Checkbox):
+    """
+    A checkbox in a group of checkboxes, where only one can be checked at any 
+    given time.
+    """
+
+    def __init__(self, peers=None, *, is_checked=False):
+        """
+        Instantiate a new radio button.
+
+        Arguments:
+            peers (list):
+                A list of radio buttons to group together, such that only one 
+                can be checked at a time.  This button will be added to the 
+                list automatically.  A common idiom is to create an empty group 
+                and pass it to the constructor of each radio button in it, 
+                e.g.::
+
+                    >>> import glooey
+                    >>> g = glooey.RadioGroup()
+                    >>> b1 = glooey.RadioButton(g)
+                    >>> b2 = glooey.RadioButton(g)
+                    >>> b3 = glooey.RadioButton(g)
+
+                Since each button holds a reference to the same group, and each 
+                button adds itself to that group, this lets each button in the 
+                group know about all of its peers.  A plain list also works, 
+                but a `RadioGroup` remembers which button is checked, so it 
+                doesn't have to visit every peer each time a button is checked.
+
+            is_checked (bool):
+                If true, the checkbox will begin in the checked state.  See 
+                `Checkbox.__init__` for details.
+                
+        """
+        super().__init__(is_checked=is_checked)
+        self.peers = peers if peers is not None else RadioGroup()
+
+
+@autoprop
+class SpriteRadioButton(RadioMixin, SpriteCheckbox):
+    """
+    A radio button that draws all eight of its states using a single sprite.
+
+    See `SpriteCheckbox` for how to specify the images, and `RadioButton` for 
+    how to group the buttons together.
+    """
+
+    def __init__(self, peers=None, *, is_checked=False):
+        super().__init__(is_checked=is_checked)
+        self.peers = peers if peers is not None else RadioGroup()
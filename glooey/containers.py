@@ -9,6 +9,7 @@ flexible and ad-hoc layouts, see `Board`.  For putting backgrounds and borders
 around other widgets, see `Frame`.
 """
 
+import bisect
 import pyglet
 import autoprop
 import vecrec
@@ -268,6 +269,14 @@ class Grid(Widget):
     about this option.
     """
 
+    custom_sparse = False
+    """
+    Only keep track of the cells that have widgets in them.
+
+    This is meant for big grids where most of the cells are empty, e.g. maps.  
+    See `set_sparse()` for more details about this option.
+    """
+
     def __init__(self, num_rows=None, num_cols=None, default_row_height=None, 
             default_col_width=None):
 
@@ -277,6 +286,7 @@ class Grid(Widget):
         self._grid = drawing.Grid(
                 num_rows=num_rows or self.custom_num_rows,
                 num_cols=num_cols or self.custom_num_cols,
+                sparse=self.custom_sparse,
         )
         self.cell_padding = first_not_none((
                 self.custom_cell_padding, self.custom_padding, 0))
@@ -433,10 +443,37 @@ class Grid(Widget):
         For example, if a grid has a child in position (1,1) and none anywhere 
         else, then it has 2 rows and columns and this method would return:
         [(0,0), (0,1), (1,0), (1,1)]
+
+        If the grid is sparse, only the cells that are associated with widgets 
+        are returned.  In the above example, that would be: [(1,1)]
         """
+        if self.sparse:
+            return sorted(self._children)
+
         return [(i,j) for i in range(self.num_rows)
                       for j in range(self.num_cols)]
 
+    def get_sparse(self):
+        """
+        Return true if the grid only keeps track of the cells that have widgets 
+        in them.
+        """
+        return self._grid.sparse
+
+    def set_sparse(self, new_sparse):
+        """
+        Set whether or not the grid should only keep track of the cells that 
+        have widgets in them.
+
+        This doesn't affect how the grid is laid out, but it makes the grid 
+        cost time and memory in proportion to the number of widgets rather 
+        than the number of rows times the number of columns.  For example, a 
+        500x500 map with a few hundred widgets in it would otherwise have to 
+        account for 250,000 cells.  The downside is that `get_cell_indices()` 
+        no longer includes empty cells.
+        """
+        self._grid.sparse = new_sparse
+
     def get_padding(self):
         """
         Return the padding on all sides of this widget, plus the padding 
@@ -1138,6 +1175,21 @@ class Stack(Widget):
         self._children = {} # {child: layer}
         self.one_child_gets_mouse = self.custom_one_child_gets_mouse
 
+        # Keep the children sorted from front to back, so they don't need to 
+        # be sorted every time they're iterated over.  The sort keys are 
+        # (-layer, n) tuples, where n counts up with each insertion, so that 
+        # children in the same layer stay in the order they were added.
+        self._sort_keys = {} # {child: (-layer, n)}
+        self._sorted_keys = []
+        self._sorted_children = []
+        self._children_tuple = ()
+        self._num_insertions = 0
+
+        # Keep one group for each layer, rather than making new ones every time 
+        # the children are regrouped.
+        self._layer_groups = {}
+        self._layer_groups_parent = None
+
     def __iter__(self):
         yield from self._children.items()
 
@@ -1157,7 +1209,7 @@ class Stack(Widget):
 
         See `add()` for more details.
         """
-        layer = max(self.layers) + 1 if self.layers else 0
+        layer = -self._sorted_keys[0][0] + 1 if self._sorted_keys else 0
         self.insert(widget, layer)
 
     def add_back(self, widget):
@@ -1166,7 +1218,7 @@ class Stack(Widget):
 
         See `add()` for more details.
         """
-        layer = min(self.layers) - 1 if self.layers else 0
+        layer = -self._sorted_keys[-1][0] - 1 if self._sorted_keys else 0
         self.insert(widget, layer)
 
     def insert(self, widget, layer):
@@ -1183,7 +1235,15 @@ class Stack(Widget):
         """
         self._attach_child(widget)
         self._children[widget] = layer
-        self._repack_and_regroup_children()
+
+        key = self._sort_keys[widget] = (-layer, self._num_insertions)
+        index = bisect.bisect(self._sorted_keys, key)
+        self._sorted_keys.insert(index, key)
+        self._sorted_children.insert(index, widget)
+        self._children_tuple = None
+        self._num_insertions += 1
+
+        self._repack_and_regroup_child(widget)
 
     def remove(self, widget):
         """
@@ -1191,7 +1251,24 @@ class Stack(Widget):
         """
         self._detach_child(widget)
         del self._children[widget]
-        self._repack_and_regroup_children()
+
+        key = self._sort_keys.pop(widget)
+        index = bisect.bisect_left(self._sorted_keys, key)
+        del self._sorted_keys[index]
+        del self._sorted_children[index]
+        self._children_tuple = None
+
+        # Forget the group for this layer if no other children are using it.
+        neighbors = self._sorted_keys[max(index - 1, 0):index + 1]
+        if all(k[0] != key[0] for k in neighbors):
+            self._layer_groups.pop(-key[0], None)
+
+        # If there's only one child left, it needs to be moved out of its 
+        # layer group (see do_regroup_children()).
+        if len(self._children) == 1:
+            self._repack_and_regroup_children()
+        elif self.is_attached_to_gui:
+            self._repack()
 
     def clear(self):
         """
@@ -1200,6 +1277,11 @@ class Stack(Widget):
         for child in self.children:
             self._detach_child(child)
         self._children = {}
+        self._sort_keys = {}
+        self._sorted_keys = []
+        self._sorted_children = []
+        self._children_tuple = ()
+        self._layer_groups = {}
         self._repack_and_regroup_children()
 
     def do_claim(self):
@@ -1235,8 +1317,8 @@ class Stack(Widget):
             child = next(iter(self.children))
             child._regroup(self.group)
         else:
-            for child, layer in self._children.items():
-                child._regroup(pyglet.graphics.OrderedGroup(layer, self.group))
+            for child in self._children:
+                self._regroup_child(child)
 
     def do_find_children_near_mouse(self, x, y):
         """
@@ -1258,16 +1340,55 @@ class Stack(Widget):
         such that the widgets in the foreground come first.
         """
         # Cast to a tuple so that basic indexing operations are supported and 
-        # so that the list is immutable.
-        return sorted(self._children.keys(),
-                key=lambda x: self._children[x], reverse=True)
+        # so that the list is immutable.  The tuple is cached until the 
+        # children change.
+        if self._children_tuple is None:
+            self._children_tuple = tuple(self._sorted_children)
+        return self._children_tuple
 
     def get_layers(self):
         """
         Return the layer numbers of the widgets making up the stack, sorted so 
         that the foreground layers come first.
         """
-        return sorted(self._children.values(), reverse=True)
+        return [-layer for layer, n in self._sorted_keys]
+
+    def _repack_and_regroup_child(self, child):
+        """
+        Like `_repack_and_regroup_children()`, but only regroup the given 
+        child, unless the other children need to be regrouped too.
+        """
+        if not self.is_attached_to_gui:
+            return
+
+        self._repack()
+
+        # Going from one child to two means that the first child needs to be 
+        # put into its own layer group.
+        if len(self._children) == 2:
+            self.do_regroup_children()
+        else:
+            self._regroup_child(child)
+
+    def _regroup_child(self, child):
+        if len(self._children) == 1:
+            child._regroup(self.group)
+            return
+
+        # The layer groups all depend on the stack's own group, so start over 
+        # if that changes.
+        if self._layer_groups_parent is not self.group:
+            self._layer_groups = {}
+            self._layer_groups_parent = self.group
+
+        layer = self._children[child]
+        try:
+            group = self._layer_groups[layer]
+        except KeyError:
+            group = self._layer_groups[layer] = \
+                    pyglet.graphics.OrderedGroup(layer, self.group)
+
+        child._regroup(group)
 
 
 @autoprop
@@ -1315,6 +1436,17 @@ class Deck(Widget):
     Use the `set_state()` method to control which state is currently visible:
 
     >>> d.set_state('over')
+
+    States can also be given as factories (i.e. any callable that isn't 
+    itself a widget, such as a widget class), in which case the widget for 
+    that state won't be created until it's first needed.  This is worthwhile 
+    for states that are rarely or never shown, e.g. the "down" and "off" 
+    states of a button:
+
+    >>> d = glooey.Deck('base',
+    ...         base=glooey.Image(...),
+    ...         down=lambda: glooey.Image(...),
+    ... )
     """
 
     def __init__(self, initial_state, **states):
@@ -1337,15 +1469,23 @@ class Deck(Widget):
         self._current_state = initial_state
         self._previous_state = initial_state
         self._states = {}
+        self._factories = {}
+        self._configure_callbacks = {}
         self.add_states(**states)
 
     def __iter__(self):
+        for state in list(self._factories):
+            self._build_state(state)
         yield from self._states.items()
 
     def __getitem__(self, state):
         """
         Get the widget associated with the given state.
+
+        If the state was given as a factory, the widget will be created now.
         """
+        if state in self._factories:
+            self._build_state(state)
         return self._states[state]
 
     def __setitem__(self, state, widget):
@@ -1360,7 +1500,9 @@ class Deck(Widget):
         """
         Claim enough space for the biggest child.
 
-        This eliminates the need to repack when changing state.
+        This eliminates the need to repack when changing state.  States that 
+        haven't been created yet (see `add_state()`) aren't considered, so 
+        changing to one of those states could cause a repack.
         """
         return claim_stacked_widgets(*self._states.values())
 
@@ -1373,6 +1515,12 @@ class Deck(Widget):
         its claim and its alignment.  Typically every widget in the deck will 
         be the same size, to allow for smooth transitions between states.  If 
         the given state already exists, it will be overwritten without error.
+
+        Instead of a widget, you can also give a factory: any callable that 
+        isn't a widget and that returns a widget when called with no arguments 
+        (e.g. a widget class).  In that case the widget won't be created until 
+        the state is first shown or accessed via `get_widget()`.  States that 
+        are never used then cost nothing.
         """
         self._remove_state(state)
         self._add_state(state, widget)
@@ -1465,12 +1613,44 @@ class Deck(Widget):
         """
         self.remove_states(*self.known_states)
 
+    def configure_state(self, state, callback):
+        """
+        Call the given function with the widget for the given state.
+
+        If the state was given as a factory and its widget hasn't been created 
+        yet, the function will be called when it is, rather than creating the 
+        widget just to configure it.
+        """
+        if state in self._factories:
+            self._configure_callbacks.setdefault(state, []).append(callback)
+        else:
+            callback(self._states[state])
+
+    def is_state_built(self, state):
+        """
+        Return true if the widget for the given state has been created.
+
+        This is only false for states that were given as factories and that 
+        haven't been needed yet.
+        """
+        return state in self._states
+
     def _add_state(self, state, widget):
+        if not isinstance(widget, Widget) and callable(widget):
+            self._factories[state] = widget
+            # The current state always needs to have a widget.
+            if state == self.state:
+                self._build_state(state, repack=False)
+            return
+
         widget.unhide() if state == self.state else widget.hide()
         self._states[state] = widget
         self._attach_child(widget)
 
     def _remove_state(self, state):
+        self._factories.pop(state, None)
+        self._configure_callbacks.pop(state, None)
+
         if state in self._states:
             self._detach_child(self._states[state])
             # Unhide the child so it'll show up if the user tries to reattach 
@@ -1478,6 +1658,16 @@ class Deck(Widget):
             self._states[state].unhide(draw=False)
             del self._states[state]
 
+    def _build_state(self, state, repack=True):
+        factory = self._factories.pop(state)
+        self._add_state(state, factory())
+
+        for callback in self._configure_callbacks.pop(state, []):
+            callback(self._states[state])
+
+        if repack:
+            self._repack_and_regroup_children()
+
     def get_state(self):
         """
         Return the currently visible child widget.
@@ -1497,6 +1687,9 @@ class Deck(Widget):
         self._current_state = new_state
 
         if self._current_state != self._previous_state:
+            if self._current_state in self._factories:
+                self._build_state(self._current_state)
+
             self._states[self._current_state].unhide()
 
             # The previous state could've been removed since the state was last 
@@ -1531,8 +1724,11 @@ class Deck(Widget):
     def get_known_states(self):
         """
         Return all the states currently available to the deck.
+
+        This includes states that were given as factories, whether or not 
+        their widgets have been created yet.
         """
-        return self._states.keys()
+        return (*self._states, *self._factories)
 
 
 @autoprop
@@ -1565,6 +1761,10 @@ class Board(Widget):
     def __init__(self):
         super().__init__()
         self._pins = {}
+        self._min_child_sizes = {}
+        self._min_child_widths = Multiset()
+        self._min_child_heights = Multiset()
+        self._min_size = None
 
     def add(self, widget, **kwargs):
         # Making the pin could fail, so do it before attaching the child.
@@ -1576,92 +1776,154 @@ class Board(Widget):
         self._repack_and_regroup_children()
 
     def move(self, widget, **kwargs):
-        self._pins[widget] = self._make_pin(kwargs)
-        self._repack_and_regroup_children()
+        pin = self._make_pin(kwargs)
+        old_pin = self._pins[widget]
+
+        # If the board hasn't been laid out yet, there's nothing to be gained 
+        # by trying to be clever.
+        if self.rect is None or widget not in self._min_child_sizes:
+            self._pins[widget] = pin
+            self._repack_and_regroup_children()
+            return
+
+        # Moving a widget usually doesn't change how much space the board 
+        # needs, and in that case there's no need to repack the whole board.  
+        # This matters when lots of widgets are being moved every frame (e.g.  
+        # units on a game map).  Measure the moved widget before changing 
+        # anything, because this is where impossible pins are caught.
+        min_child_sizes = self._find_min_child_sizes(widget, pin)
+        self._forget_min_child_sizes(widget)
+        self._remember_min_child_sizes(widget, min_child_sizes)
+        self._pins[widget] = pin
+
+        if self._find_min_size() != self._min_size:
+            self._repack_and_regroup_children()
+            return
+
+        if pin.get('layer') != old_pin.get('layer'):
+            self._regroup_child(widget, pin)
+
+        self._resize_child(widget, pin)
 
     def remove(self, widget):
         self._detach_child(widget)
         del self._pins[widget]
+        self._forget_min_child_sizes(widget)
 
     def clear(self):
         for child, pin in self._pins.items():
             self._detach_child(child)
         self._pins = {}
+        self._reset_min_child_sizes()
         self._repack_and_regroup_children()
 
     def do_claim(self):
-        min_width = 0
-        min_height = 0
-
+        # Remember how much space each child needs, so that move() can tell 
+        # whether or not moving a child changes the size of the board.
+        self._reset_min_child_sizes()
         for child, pin in self._pins.items():
-            min_child_width = self._find_min_child_size('width', child, pin)
-            min_child_height = self._find_min_child_size('height', child, pin)
-
-            min_width = max(min_width, min_child_width)
-            min_height = max(min_height, min_child_height)
+            self._remember_min_child_sizes(
+                    child, self._find_min_child_sizes(child, pin))
 
-        return min_width, min_height
+        self._min_size = self._find_min_size()
+        return self._min_size
 
     def do_resize_children(self):
         for child, pin in self._pins.items():
-            rect = Rect.null()
+            self._resize_child(child, pin)
 
-            if 'width' in pin:
-                rect.width = pin['width']
-            if 'width_percent' in pin:
-                rect.width = self.rect.width * pin['width_percent']
+    def do_regroup_children(self):
+        for child, pin in self._pins.items():
+            self._regroup_child(child, pin)
+
+    def _find_min_size(self):
+        # The multisets keep track of the biggest child sizes as children are 
+        # moved, so this doesn't have to look at every child.
+        return (
+                max(self._min_child_widths.get_max() or 0, 0),
+                max(self._min_child_heights.get_max() or 0, 0),
+        )
 
-            if 'height' in pin:
-                rect.height = pin['height']
-            if 'height_percent' in pin:
-                rect.height = self.rect.height * pin['height_percent']
+    def _remember_min_child_sizes(self, child, sizes):
+        self._min_child_sizes[child] = sizes
+        self._min_child_widths.add(sizes[0])
+        self._min_child_heights.add(sizes[1])
+
+    def _forget_min_child_sizes(self, child):
+        sizes = self._min_child_sizes.pop(child, None)
+        if sizes is not None:
+            self._min_child_widths.remove(sizes[0])
+            self._min_child_heights.remove(sizes[1])
+
+    def _reset_min_child_sizes(self):
+        self._min_child_sizes = {}
+        self._min_child_widths = Multiset()
+        self._min_child_heights = Multiset()
+
+    def _find_min_child_sizes(self, child, pin):
+        return (
+                self._find_min_child_size('width', child, pin),
+                self._find_min_child_size('height', child, pin),
+        )
 
-            rect.width = max(rect.width, child.claimed_width)
-            rect.height = max(rect.height, child.claimed_height)
+    def _resize_child(self, child, pin):
+        rect = Rect.null()
 
-            if 'left' in pin:
-                rect.left = pin['left']
-            if 'left_percent' in pin:
-                rect.left = self.rect.width * pin['left_percent']
+        if 'width' in pin:
+            rect.width = pin['width']
+        if 'width_percent' in pin:
+            rect.width = self.rect.width * pin['width_percent']
 
-            if 'right' in pin:
-                rect.right = pin['right']
-            if 'right_percent' in pin:
-                rect.right = self.rect.width * pin['right_percent']
+        if 'height' in pin:
+            rect.height = pin['height']
+        if 'height_percent' in pin:
+            rect.height = self.rect.height * pin['height_percent']
 
-            if 'center_x' in pin:
-                rect.center_x = pin['center_x']
-            if 'center_x_percent' in pin:
-                rect.center_x = self.rect.width * pin['center_x_percent']
+        rect.width = max(rect.width, child.claimed_width)
+        rect.height = max(rect.height, child.claimed_height)
 
-            if 'top' in pin:
-                rect.top = pin['top']
-            if 'top_percent' in pin:
-                rect.top = self.rect.height * pin['top_percent']
+        if 'left' in pin:
+            rect.left = pin['left']
+        if 'left_percent' in pin:
+            rect.left = self.rect.width * pin['left_percent']
 
-            if 'bottom' in pin:
-                rect.bottom = pin['bottom']
-            if 'bottom_percent' in pin:
-                rect.bottom = self.rect.height * pin['bottom_percent']
+        if 'right' in pin:
+            rect.right = pin['right']
+        if 'right_percent' in pin:
+            rect.right = self.rect.width * pin['right_percent']
 
-            if 'center_y' in pin:
-                rect.center_y = pin['center_y']
-            if 'center_y_percent' in pin:
-                rect.center_y = self.rect.height * pin['center_y_percent']
+        if 'center_x' in pin:
+            rect.center_x = pin['center_x']
+        if 'center_x_percent' in pin:
+            rect.center_x = self.rect.width * pin['center_x_percent']
 
-            rect.left += self.rect.left
-            rect.bottom += self.rect.bottom
+        if 'top' in pin:
+            rect.top = pin['top']
+        if 'top_percent' in pin:
+            rect.top = self.rect.height * pin['top_percent']
 
-            child._resize(rect)
+        if 'bottom' in pin:
+            rect.bottom = pin['bottom']
+        if 'bottom_percent' in pin:
+            rect.bottom = self.rect.height * pin['bottom_percent']
 
-    def do_regroup_children(self):
-        for child, pin in self._pins.items():
-            if 'layer' in pin:
-                group = pyglet.graphics.OrderedGroup(pin['layer'], self.group)
-            else:
-                group = self.group
+        if 'center_y' in pin:
+            rect.center_y = pin['center_y']
+        if 'center_y_percent' in pin:
+            rect.center_y = self.rect.height * pin['center_y_percent']
+
+        rect.left += self.rect.left
+        rect.bottom += self.rect.bottom
 
-            child._regroup(group)
+        child._resize(rect)
+
+    def _regroup_child(self, child, pin):
+        if 'layer' in pin:
+            group = pyglet.graphics.OrderedGroup(pin['layer'], self.group)
+        else:
+            group = self.group
+
+        child._regroup(group)
 
     def _make_pin(self, kwargs):
 
@@ -1669,17 +1931,7 @@ class Board(Widget):
         # keys have been used, so we can give a nice error if we find an 
         # unexpected (i.e. misspelled) argument.
 
-        class argdict(dict): #
-
-            def __init__(self, kwargs): #
-                self.update(kwargs)
-                self.unused_keys = set(kwargs.keys())
-
-            def __getitem__(self, key): #
-                self.unused_keys.discard(key)
-                return super().__getitem__(key)
-
-        kwargs = argdict(kwargs)
+        kwargs = _ArgDict(kwargs)
 
         # Check to make sure the position of the widget isn't over- or 
         # under-specified.
@@ -1938,10 +2190,37 @@ class Board(Widget):
         assert board_size > -1
         return board_size
 
+class _ArgDict(dict):
+    """
+    A dictionary that keeps track of which keys have been used.  See 
+    `Board._make_pin()`.
+    """
+
+    def __init__(self, kwargs):
+        self.update(kwargs)
+        self.unused_keys = set(kwargs.keys())
+
+    def __getitem__(self, key):
+        self.unused_keys.discard(key)
+        return super().__getitem__(key)
+
+
 def align_widget_in_box(widget, box_rect, alignment='fill', widget_rect=None):
     if widget_rect is None:
-        widget_rect = widget.claimed_rect
-    drawing.align(alignment, widget_rect, box_rect)
+        widget_size = widget.claimed_size
+    else:
+        widget_size = widget_rect.width, widget_rect.height
+
+    aligned_lbwh = drawing.align_tuple(
+            alignment, widget_size,
+            (box_rect.left, box_rect.bottom, box_rect.width, box_rect.height))
+
+    if widget_rect is None:
+        widget_rect = Rect(*aligned_lbwh)
+    else:
+        widget_rect.left, widget_rect.bottom, \
+                widget_rect.width, widget_rect.height = aligned_lbwh
+
     widget._resize(widget_rect)
 
 def claim_stacked_widgets(*widgets):
@@ -4,3 +4,4 @@ from .artists import *
 from .stencil import *
 from .alignment import *
 from .grid import *
+from .images import *
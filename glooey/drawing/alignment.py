@@ -1,13 +1,39 @@
 #!/usr/bin/env python3
 
+from vecrec import Rect
 from glooey.helpers import *
 
 alignments = {}
+_tuple_alignments = {}
+
+# The sanity checks in align() are on by default whenever python itself is 
+# running in debug mode (i.e. not with -O), but they're also fairly expensive, 
+# so they can be turned off separately.  See set_alignment_checks().
+_check_alignments = __debug__
 
 def alignment(func):
-    alignments[func.__name__.replace('_', ' ')] = func
+    key = func.__name__.replace('_', ' ')
+    alignments[key] = func
+    # If a built-in alignment is being replaced, forget its precompiled 
+    # counterpart so the new function is always the one that gets used.
+    _tuple_alignments.pop(key, None)
     return func
 
+def get_alignment_checks():
+    return _check_alignments
+
+def set_alignment_checks(enabled):
+    """
+    Turn the sanity checks performed by `align()` on or off.
+
+    The checks make sure that alignment functions don't modify the parent 
+    rectangle and don't put the child rectangle outside the parent.  They're 
+    useful when writing new alignment functions, but they take as much time as 
+    the alignment itself.  They default to on unless python is run with -O.
+    """
+    global _check_alignments
+    _check_alignments = enabled
+
 @alignment
 def fill(child_rect, parent_rect):
     child_rect.set(parent_rect)
@@ -40,7 +66,7 @@ def fill_left(child_rect, parent_rect):
 @alignment
 def fill_right(child_rect, parent_rect):
     child_rect.height = parent_rect.height
-    child_rect.top_right = parent_rect.top_right
+    child_rect.bottom_right = parent_rect.bottom_right
 
 @alignment
 def top_left(child_rect, parent_rect):
@@ -79,39 +105,121 @@ def bottom_right(child_rect, parent_rect):
     child_rect.bottom_right = parent_rect.bottom_right
 
 
-def align(key_or_function, child_rect, parent_rect, outside_ok=False):
-    if isinstance(key_or_function, str):
-        try:
-            alignment_func = alignments[key_or_function]
-        except KeyError:
-            newline = '\n'
-            raise UsageError(f"""\
-{repr(key_or_function)} is not an alignment.  Did you mean:
-
-{newline.join('  ' + repr(k) for k in alignments)}
+# The same built-in alignments, but precompiled to work on plain numbers 
+# instead of `vecrec.Rect` objects.  Each takes the width and height of the 
+# child and the left, bottom, width, and height of the parent, and returns the 
+# left, bottom, width, and height of the child.  The arithmetic is exactly the 
+# same as what the Rect properties do, so the results are identical.  These are 
+# used by `align_tuple()` during the layout pass, where making and modifying 
+# rectangles for every widget would add up.
+
+_tuple_alignments.update({
+    'fill':
+        lambda w, h, pl, pb, pw, ph: (pl, pb, pw, ph),
+    'fill horz':
+        lambda w, h, pl, pb, pw, ph: (pl, pb + ph / 2 - h / 2, pw, h),
+    'fill vert':
+        lambda w, h, pl, pb, pw, ph: (pl + pw / 2 - w / 2, pb, w, ph),
+    'fill top':
+        lambda w, h, pl, pb, pw, ph: (pl, pb + ph - h, pw, h),
+    'fill bottom':
+        lambda w, h, pl, pb, pw, ph: (pl, pb, pw, h),
+    'fill left':
+        lambda w, h, pl, pb, pw, ph: (pl, pb, w, ph),
+    'fill right':
+        lambda w, h, pl, pb, pw, ph: (pl + pw - w, pb, w, ph),
+    'top left':
+        lambda w, h, pl, pb, pw, ph: (pl, pb + ph - h, w, h),
+    'top':
+        lambda w, h, pl, pb, pw, ph: (pl + pw / 2 - w / 2, pb + ph - h, w, h),
+    'top right':
+        lambda w, h, pl, pb, pw, ph: (pl + pw - w, pb + ph - h, w, h),
+    'left':
+        lambda w, h, pl, pb, pw, ph: (pl, pb + ph / 2 - h / 2, w, h),
+    'center':
+        lambda w, h, pl, pb, pw, ph: (pl + pw / 2 - w / 2, pb + ph / 2 - h / 2, w, h),
+    'right':
+        lambda w, h, pl, pb, pw, ph: (pl + pw - w, pb + ph / 2 - h / 2, w, h),
+    'bottom left':
+        lambda w, h, pl, pb, pw, ph: (pl, pb, w, h),
+    'bottom':
+        lambda w, h, pl, pb, pw, ph: (pl + pw / 2 - w / 2, pb, w, h),
+    'bottom right':
+        lambda w, h, pl, pb, pw, ph: (pl + pw - w, pb, w, h),
+})
 
-You can also use a function to specify an alignment, and you can register a new 
-alignment string using the ``@glooey.drawing.alignment`` decorator.""")
-
-    else:
-        alignment_func = key_or_function
+def align(key_or_function, child_rect, parent_rect, outside_ok=False):
+    alignment_func = _get_alignment_func(key_or_function)
 
-    if __debug__:
+    if _check_alignments:
         parent_copy = parent_rect.copy()
 
     alignment_func(child_rect, parent_rect)
 
     # Sanity check the alignment function.
-    if __debug__:
+    if _check_alignments:
         if parent_rect != parent_copy:
             raise RuntimeError(f"{repr(key_or_function)} changed the parent rectangle (second argument) from {parent_copy} to {parent_rect}.  Alignment functions should only modify the child rectangle (first argument).")
         # Grow the parent rectangle by 1 px to be resilient to rounding errors.
         if not outside_ok and not child_rect.inside(parent_rect.get_grown(1)):
             raise RuntimeError(f"{repr(key_or_function)} placed the child rectangle outside the parent rectangle.  This most likely indicates a bug in '{alignment_func.__qualname__}()'.\nchild:  {child_rect}\nparent: {parent_rect}")
 
+def align_tuple(key_or_function, child_size, parent_lbwh, outside_ok=False):
+    """
+    Align a child of the given size within the given parent, without making 
+    any `vecrec.Rect` objects.
+
+    The parent is given as a (left, bottom, width, height) tuple, and the 
+    aligned child is returned in the same form.  The built-in alignments are 
+    looked up in a precompiled table.  Alignment functions and custom 
+    alignment strings are still supported, but they go through `align()`.
+    """
+    width, height = child_size
+    left, bottom, parent_width, parent_height = parent_lbwh
+
+    try:
+        tuple_func = _tuple_alignments[key_or_function]
+    except (KeyError, TypeError):
+        child_rect = Rect.from_size(width, height)
+        parent_rect = Rect(*parent_lbwh)
+        align(key_or_function, child_rect, parent_rect, outside_ok)
+        return child_rect.left, child_rect.bottom, \
+                child_rect.width, child_rect.height
+
+    child_lbwh = tuple_func(
+            width, height, left, bottom, parent_width, parent_height)
+
+    # The built-in alignments can't change the parent, but they can still 
+    # place the child outside of a parent that's too small for it.
+    if _check_alignments and not outside_ok:
+        child_left, child_bottom, child_width, child_height = child_lbwh
+        if child_left < left - 1 or \
+                child_bottom < bottom - 1 or \
+                child_left + child_width > left + parent_width + 1 or \
+                child_bottom + child_height > bottom + parent_height + 1:
+            raise RuntimeError(f"{repr(key_or_function)} placed the child rectangle outside the parent rectangle.\nchild:  {Rect(*child_lbwh)}\nparent: {Rect(*parent_lbwh)}")
+
+    return child_lbwh
+
 def fixed_size_align(key_or_function, child_rect, parent_rect, outside_ok=False):
     fixed_size = child_rect.size
     align(key_or_function, child_rect, parent_rect, outside_ok)
     if child_rect.size != fixed_size:
         raise UsageError(f"a fixed-sized alignment was required, but {repr(key_or_function)} resized the rect being aligned from {'x'.join(fixed_size)} to {'x'.join(child_rect.size)}.")
 
+
+def _get_alignment_func(key_or_function):
+    if not isinstance(key_or_function, str):
+        return key_or_function
+
+    try:
+        return alignments[key_or_function]
+    except KeyError:
+        newline = '\n'
+        raise UsageError(f"""\
+{repr(key_or_function)} is not an alignment.  Did you mean:
+
+{newline.join('  ' + repr(k) for k in alignments)}
+
+You can also use a function to specify an alignment, and you can register a new 
+alignment string using the ``@glooey.drawing.alignment`` decorator.""")
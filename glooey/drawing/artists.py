@@ -8,6 +8,7 @@ from pyglet.gl import *
 from glooey.helpers import *
 from glooey.drawing.grid import Grid
 from glooey.drawing.color import Color
+from glooey.drawing.images import ManagedImage
 
 @autoprop
 class Artist(HoldUpdatesMixin):
@@ -236,11 +237,28 @@ class Tile(Artist):
                 if vtile is None or self._vtile == vtile:
                     return
 
+        # Images from the same texture (e.g. an atlas) can share a group, in 
+        # which case the vertex list doesn't need to be migrated, just given 
+        # new texture coordinates.  Hidden tiles don't have a vertex list, so 
+        # don't compare their textures; that would load managed images that 
+        # aren't needed yet.
+        is_same_texture = False
+
+        if self._vertex_list is not None:
+            _acquire_image(new_image)
+            old_texture = self._image.get_texture()
+            new_texture = new_image.get_texture()
+            is_same_texture = \
+                    old_texture.target == new_texture.target and \
+                    old_texture.id == new_texture.id
+            _release_image(self._image)
+
         self._image = new_image
         if htile is not None: self._htile = htile
         if vtile is not None: self._vtile = vtile
 
-        self._update_group()
+        if not is_same_texture:
+            self._update_group()
         self._update_vertex_list()
 
     def get_htile(self):
@@ -275,6 +293,17 @@ class Tile(Artist):
             self._blend_dest = new_blend_dest
             self._update_group()
 
+    def hide(self):
+        if self._vertex_list is not None:
+            _release_image(self._image)
+        super().hide()
+
+    def _create_vertex_list(self):
+        # Managed images only keep their textures in memory while something is 
+        # drawing them.
+        _acquire_image(self._image)
+        super()._create_vertex_list()
+
     @update_function
     def _update_vertex_list(self):
         if self._vertex_list is None:
@@ -356,6 +385,149 @@ avoids this logic at the expense of less well-organized memory."""
         )
 
 
+@autoprop
+class BitmapText(Artist):
+    """
+    Draw text in a `BitmapFont`, using one textured quad per character.
+
+    All the quads go into a single vertex list, and the group used to bind the 
+    glyph sheet only depends on the font's texture and the parent group.  That 
+    means that every piece of text using the same font under the same parent 
+    group is drawn with the same OpenGL state.
+
+    The text is drawn from the top-left corner of the given rectangle.  Each 
+    line is aligned within the width of the rectangle according to the 
+    ``align`` argument ('left', 'center', or 'right').
+    """
+
+    def __init__(self, font, text='', rect=None, color='white', *,
+            align='left', line_spacing=None, wrap_width=0,
+            batch=None, group=None, usage='dynamic', hidden=False):
+
+        self._font = font
+        self._text = text
+        self._rect = rect or Rect.null()
+        self._color = Color.from_anything(color)
+        self._align = align or 'left'
+        self._line_spacing = line_spacing
+        self._wrap_width = wrap_width
+
+        data = 'v2f/' + usage, 't3f/' + usage, 'c4B/' + usage
+        super().__init__(batch, group, 0, GL_QUADS, data, hidden)
+
+    def get_font(self):
+        return self._font
+
+    def set_font(self, new_font):
+        if self._font is not new_font:
+            self._font = new_font
+            self._update_group()
+            self._update_vertex_list()
+
+    def get_text(self):
+        return self._text
+
+    def set_text(self, new_text):
+        if self._text != new_text:
+            self._text = new_text
+            self._update_vertex_list()
+
+    def get_rect(self):
+        return self._rect
+
+    def set_rect(self, new_rect):
+        if self._rect != new_rect:
+            self._rect = new_rect
+            self._update_vertex_list()
+
+    def get_color(self):
+        return self._color
+
+    def set_color(self, new_color):
+        self._color = Color.from_anything(new_color)
+        if self._vertex_list is not None:
+            self._vertex_list.colors = self._count * self._color.tuple
+
+    def get_align(self):
+        return self._align
+
+    def set_align(self, new_align):
+        if self._align != new_align:
+            self._align = new_align or 'left'
+            self._update_vertex_list()
+
+    def get_line_spacing(self):
+        return self._line_spacing
+
+    def set_line_spacing(self, new_spacing):
+        if self._line_spacing != new_spacing:
+            self._line_spacing = new_spacing
+            self._update_vertex_list()
+
+    def get_wrap_width(self):
+        return self._wrap_width
+
+    def set_wrap_width(self, new_width):
+        if self._wrap_width != new_width:
+            self._wrap_width = new_width
+            self._update_vertex_list()
+
+    @update_function
+    def _update_vertex_list(self):
+        if self._vertex_list is None:
+            return
+
+        vertices = []
+        tex_coords = []
+        line_spacing = self._line_spacing or self._font.line_height
+        line_top = self._rect.top
+
+        for line in self._font.split_lines(self._text, self._wrap_width):
+            x = self._rect.left
+
+            if self._align != 'left':
+                extra_space = self._rect.width - self._font.get_line_width(line)
+                x += extra_space / 2 if self._align == 'center' else extra_space
+
+            prev_char = None
+            for char in line:
+                glyph = self._font.get_glyph(char)
+                if glyph is None:
+                    continue
+
+                x += self._font.get_kerning(prev_char, char)
+                prev_char = char
+
+                # Don't make quads for glyphs with nothing to draw (e.g. 
+                # spaces).
+                if glyph.width and glyph.height:
+                    left = x + glyph.x_offset
+                    top = line_top - glyph.y_offset
+                    right = left + glyph.width
+                    bottom = top - glyph.height
+
+                    vertices += left, bottom, right, bottom, right, top, left, top
+                    tex_coords += glyph.tex_coords
+
+                x += glyph.advance
+
+            line_top -= line_spacing
+
+        self._count = len(vertices) // 2
+        self._vertex_list.resize(self._count)
+        self._vertex_list.vertices = vertices
+        self._vertex_list.tex_coords = tex_coords
+        self._vertex_list.colors = self._count * self._color.tuple
+
+    def _group_factory(self, parent):
+        return pyglet.sprite.SpriteGroup(
+                self._font.texture,
+                GL_SRC_ALPHA,
+                GL_ONE_MINUS_SRC_ALPHA,
+                parent=parent,
+        )
+
+
 @autoprop
 class Background(HoldUpdatesMixin):
     """\
@@ -692,4 +864,10 @@ frame.  The only difference is that, if 'htile' or 'vtile' are set to 'auto'
             self._update_tiles()
 
 
+def _acquire_image(image):
+    if isinstance(image, ManagedImage):
+        image.acquire()
 
+def _release_image(image):
+    if isinstance(image, ManagedImage):
+        image.release()
@@ -1,21 +1,35 @@
 #!/usr/bin/env python3
 
 import math
+import bisect
+import operator
+import itertools
 import autoprop
+from collections import defaultdict
+from collections.abc import Mapping
 from vecrec import Vector, Rect
 from glooey.helpers import *
 
+# NumPy is optional.  If it's installed, the grid uses it to accumulate the 
+# row and column edges of large grids.  Everything else (e.g. keeping track of 
+# the biggest cell in each row and column) is plain python.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 @autoprop
 class Grid:
 
     def __init__(self, *, bounding_rect=None, min_cell_rects=None,
             num_rows=0, num_cols=0, padding=None, inner_padding=None, 
             outer_padding=None, row_heights=None, col_widths=None,
-            default_row_height='expand', default_col_width='expand'):
+            default_row_height='expand', default_col_width='expand',
+            backend='auto', sparse=False):
 
         # Attributes that the user can set to affect the shape of the grid.  
         self._bounding_rect = bounding_rect or Rect.null()
-        self._min_cell_rects = min_cell_rects or {}
+        self._min_cell_rects = {}
         self._requested_num_rows = num_rows
         self._requested_num_cols = num_cols
         self._inner_padding = first_not_none((inner_padding, padding, 0))
@@ -24,10 +38,13 @@ class Grid:
         self._requested_col_widths = col_widths or {}
         self._default_row_height = default_row_height
         self._default_col_width = default_col_width
+        self.backend = backend
 
         # Read-only attributes that reflect the current state of the grid.
         self._num_rows = 0
         self._num_cols = 0
+        self._cell_heights = {}
+        self._cell_widths = {}
         self._max_cell_heights = {}
         self._max_cell_widths = {}
         self._fixed_rows = set()
@@ -46,14 +63,26 @@ class Grid:
         self._col_widths = {}
         self._width = 0
         self._height = 0
-        self._row_tops = {}
-        self._col_lefts = {}
-        self._cell_rects = {}
+        self._row_tops = []
+        self._col_lefts = []
+        self._cell_rects = _CellRects()
+
+        # Cell boundaries, used to find cells by binary search if they are 
+        # sorted.
+        self._neg_row_bottoms = []
+        self._col_rights = []
+        self._are_rows_sorted = True
+        self._are_cols_sorted = True
 
         # Attributes that manage the cache.
         self._is_shape_stale = True
         self._is_claim_stale = True
         self._are_cells_stale = True
+        self._stale_rows = set()
+        self._stale_cols = set()
+
+        self.min_cell_rects = min_cell_rects or {}
+        self.sparse = sparse
 
     def make_claim(self, min_cell_rects=None):
         if min_cell_rects is not None:
@@ -64,6 +93,15 @@ class Grid:
         return self._min_width, self._min_height
 
     def make_cells(self, bounding_rect=None):
+        """
+        Lay out the grid and return a mapping from (row, col) tuples to cell 
+        rectangles.
+
+        The mapping is a live, read-only view of the grid: every call returns 
+        the same object, and it reflects the most recent layout.  Copy it (e.g. 
+        with ``dict()``) to keep the rectangles from a particular layout.  The 
+        rectangles themselves are cached, so they shouldn't be modified.
+        """
         if bounding_rect is not None:
             self.bounding_rect = bounding_rect
 
@@ -84,24 +122,41 @@ class Grid:
         # cells.  In practice, the algorithm will identify the top-left-most 
         # cell first and return it.  So the algorithm isn't really ambiguous, 
         # but it is more dependent on what's really an implementation detail.
+        #
+        # The rows are stored from top to bottom, so I keep the row bottoms 
+        # negated to get an ascending list that can be bisected.  The first 
+        # row whose bottom is at or below the mouse is the only candidate, 
+        # because every row after it is even lower.  If the mouse is above the 
+        # top of that row, it must be in the padding.  The same logic applies 
+        # to the columns, going left to right.
+        #
+        # That reasoning only holds if the edges really are sorted, which isn't 
+        # the case if any row, column, or padding has a negative size.  Then I 
+        # fall back on checking every row and column in order.
 
         # Find the row the mouse is over.
-        for i in range(self._num_rows):
-            row_top = self._row_tops[i]
-            row_bottom = row_top - self._row_heights[i]
-            if row_top >= y >= row_bottom:
-                break
+        if self._are_rows_sorted:
+            i = bisect.bisect_left(self._neg_row_bottoms, -y)
+            if i == self._num_rows or self._row_tops[i] < y:
+                return None
         else:
-            return None
+            for i in range(self._num_rows):
+                if self._row_tops[i] >= y >= -self._neg_row_bottoms[i]:
+                    break
+            else:
+                return None
 
         # Find the col the mouse is over.
-        for j in range(self._num_cols):
-            col_left = self._col_lefts[j]
-            col_right = col_left + self._col_widths[j]
-            if col_left <= x <= col_right:
-                break
+        if self._are_cols_sorted:
+            j = bisect.bisect_left(self._col_rights, x)
+            if j == self._num_cols or self._col_lefts[j] > x:
+                return None
         else:
-            return None
+            for j in range(self._num_cols):
+                if self._col_lefts[j] <= x <= self._col_rights[j]:
+                    break
+            else:
+                return None
 
         return i, j
 
@@ -138,32 +193,66 @@ class Grid:
             self._bounding_rect = new_rect
             self._invalidate_cells()
 
+    def get_backend(self):
+        return self._backend
+
+    def set_backend(self, new_backend):
+        if new_backend not in ('auto', 'python', 'numpy'):
+            raise UsageError(f"unknown grid backend: {new_backend!r}")
+        if new_backend == 'numpy' and numpy is None:
+            raise UsageError("the 'numpy' grid backend requires numpy to be installed")
+
+        self._backend = new_backend
+        self._invalidate_cells()
+
+    def get_sparse(self):
+        return self._sparse
+
+    def set_sparse(self, new_sparse):
+        # In sparse mode, only the cells that have a minimum size (i.e. the 
+        # cells that are actually occupied) are included in `cell_rects`.  
+        # That way, iterating over a big but mostly empty grid only costs as 
+        # much as the number of cells in it.
+        self._sparse = new_sparse
+        self._cell_rects._occupied = self._min_cell_rects if new_sparse else None
+
     def get_min_cell_rect(self, i, j):
         return self._min_cell_rects[i,j]
 
     def set_min_cell_rect(self, i, j, new_rect):
         if (i,j) not in self._min_cell_rects or \
                 self._min_cell_rects[i,j] != new_rect:
-            self._min_cell_rects[i,j] = new_rect
-            self._invalidate_shape()
+            self._remove_min_cell_rect(i, j)
+            self._add_min_cell_rect(i, j, new_rect)
 
     def del_min_cell_rect(self, i, j):
-        if (i,j) in self._min_cell_rects:
-            del self._min_cell_rects[i,j]
-            self._invalidate_shape()
+        self._remove_min_cell_rect(i, j)
 
     def get_min_cell_rects(self):
         return self._min_cell_rects
 
     def set_min_cell_rects(self, new_rects):
-        if self._min_cell_rects != new_rects:
-            self._min_cell_rects = new_rects
-            self._invalidate_shape()
+        # Containers give the grid a whole new set of cells every time any of 
+        # their children change size, but usually only one or two of those 
+        # cells are actually different.  Only update the rows and columns of 
+        # the cells that changed, so the rest of the grid can stay cached.
+        old_rects = self._min_cell_rects
+
+        # Filling an empty grid (e.g. the first time a container is laid out) 
+        # is much faster to do all at once than one cell at a time.
+        if not old_rects:
+            self._reset_min_cell_rects(new_rects)
+            return
+
+        for ij in [ij for ij in old_rects if ij not in new_rects]:
+            self._remove_min_cell_rect(*ij)
+
+        for ij, new_rect in new_rects.items():
+            if ij not in old_rects or old_rects[ij] != new_rect:
+                self.set_min_cell_rect(*ij, new_rect)
 
     def del_min_cell_rects(self):
-        if self._min_cell_rects:
-            self._min_cell_rects = {}
-            self._invalidate_shape()
+        self._reset_min_cell_rects({})
 
     def get_num_rows(self):
         return self._num_rows
@@ -217,8 +306,9 @@ class Grid:
         return self._row_heights
 
     def set_row_heights(self, new_heights):
-        self._requested_row_heights = new_heights
-        self._invalidate_claim()
+        if self._requested_row_heights != new_heights:
+            self._requested_row_heights = new_heights
+            self._invalidate_claim()
 
     def del_row_heights(self):
         self._requested_row_heights = {}
@@ -240,8 +330,9 @@ class Grid:
         return self._col_widths
 
     def set_col_widths(self, new_widths):
-        self._requested_col_widths = new_widths
-        self._invalidate_claim()
+        if self._requested_col_widths != new_widths:
+            self._requested_col_widths = new_widths
+            self._invalidate_claim()
 
     def del_col_widths(self):
         self._requested_col_widths = {}
@@ -292,16 +383,80 @@ class Grid:
     def _invalidate_cells(self):
         self._are_cells_stale = True
 
+    def _invalidate_row(self, i):
+        self._stale_rows.add(i)
+        self._invalidate_cells()
+
+    def _invalidate_col(self, j):
+        self._stale_cols.add(j)
+        self._invalidate_cells()
+
+    def _add_min_cell_rect(self, i, j, rect):
+        self._min_cell_rects[i,j] = rect
+
+        # Adding the first cell to a row or column can change the number of 
+        # rows or columns in the grid, so in that case the whole grid has to 
+        # be reconsidered.
+        if i not in self._cell_heights:
+            self._cell_heights[i] = Multiset()
+            self._invalidate_shape()
+        if j not in self._cell_widths:
+            self._cell_widths[j] = Multiset()
+            self._invalidate_shape()
+
+        self._cell_heights[i].add(rect.height)
+        self._cell_widths[j].add(rect.width)
+        self._invalidate_row(i)
+        self._invalidate_col(j)
+
+    def _reset_min_cell_rects(self, new_rects):
+        cell_heights = defaultdict(list)
+        cell_widths = defaultdict(list)
+
+        for (i, j), rect in new_rects.items():
+            cell_heights[i].append(rect.height)
+            cell_widths[j].append(rect.width)
+
+        # Update the existing dictionary, because `_CellRects` may be using it 
+        # to know which cells are occupied.
+        self._min_cell_rects.clear()
+        self._min_cell_rects.update(new_rects)
+
+        self._cell_heights = {
+                i: Multiset(heights) for i, heights in cell_heights.items()}
+        self._cell_widths = {
+                j: Multiset(widths) for j, widths in cell_widths.items()}
+        self._invalidate_shape()
+
+    def _remove_min_cell_rect(self, i, j):
+        if (i,j) not in self._min_cell_rects:
+            return
+
+        rect = self._min_cell_rects.pop((i,j))
+        self._cell_heights[i].remove(rect.height)
+        self._cell_widths[j].remove(rect.width)
+        self._invalidate_row(i)
+        self._invalidate_col(j)
+
+        # Likewise, removing the last cell from a row or column can change the 
+        # number of rows or columns in the grid.
+        if not self._cell_heights[i]:
+            del self._cell_heights[i]
+            self._invalidate_shape()
+        if not self._cell_widths[j]:
+            del self._cell_widths[j]
+            self._invalidate_shape()
+
     def _update_shape(self):
         if self._is_shape_stale:
             self._find_num_rows()
             self._find_num_cols()
-            self._find_max_cell_dimensions()
-            self.is_shape_stale = False
+            self._is_shape_stale = False
 
     def _update_claim(self):
         if self._is_claim_stale:
             self._update_shape()
+            self._find_max_cell_dimensions()
             self._find_which_rows_expand()
             self._find_which_cols_expand()
             self._find_fixed_row_heights()
@@ -312,8 +467,16 @@ class Grid:
             self._find_padding_width()
             self._find_min_height()
             self._find_min_width()
+            self._stale_rows = set()
+            self._stale_cols = set()
             self._is_claim_stale = False
 
+        elif self._stale_rows or self._stale_cols:
+            self._update_stale_rows()
+            self._update_stale_cols()
+            self._find_min_height()
+            self._find_min_width()
+
     def _update_cells(self):
         if self._are_cells_stale:
             self._update_claim()
@@ -329,9 +492,7 @@ class Grid:
             self._are_cells_stale = False
 
     def _find_num_rows(self):
-        min_num_rows = 0
-        for i,j in self._min_cell_rects:
-            min_num_rows = max(i+1, min_num_rows)
+        min_num_rows = max(self._cell_heights, default=-1) + 1
 
         if self._requested_num_rows:
             self._num_rows = self._requested_num_rows
@@ -342,9 +503,7 @@ class Grid:
             raise UsageError("not enough rows requested")
 
     def _find_num_cols(self):
-        min_num_cols = 0
-        for i,j in self._min_cell_rects:
-            min_num_cols = max(j+1, min_num_cols)
+        min_num_cols = max(self._cell_widths, default=-1) + 1
 
         if self._requested_num_cols:
             self._num_cols = self._requested_num_cols
@@ -358,17 +517,67 @@ class Grid:
         """
         Find the tallest and widest cell in each dimension.
         """
-        self._max_cell_heights = {}
-        self._max_cell_widths = {}
+        self._max_cell_heights = {
+                i: heights.get_max()
+                for i, heights in self._cell_heights.items()
+        }
+        self._max_cell_widths = {
+                j: widths.get_max()
+                for j, widths in self._cell_widths.items()
+        }
+
+    def _update_stale_rows(self):
+        """
+        Update the heights of just the rows that had cells change size.
+        """
+        for i in self._stale_rows:
+            # Rows that still have the same tallest cell don't need to be 
+            # updated at all.  This is the common case, e.g. when a cell that 
+            # isn't the tallest in its row changes size.
+            max_height = self._cell_heights[i].get_max() \
+                    if i in self._cell_heights else None
+            if self._max_cell_heights.get(i) == max_height:
+                continue
+
+            if max_height is None:
+                del self._max_cell_heights[i]
+            else:
+                self._max_cell_heights[i] = max_height
 
-        for i,j in self._min_cell_rects:
-            # Use -math.inf so that negative cell sizes can be used.
-            self._max_cell_heights[i] = max(
-                    self._min_cell_rects[i,j].height,
-                    self._max_cell_heights.get(i, -math.inf))
-            self._max_cell_widths[j] = max(
-                    self._min_cell_rects[i,j].width,
-                    self._max_cell_widths.get(j, -math.inf))
+            if i in self._fixed_rows:
+                self._fixed_row_heights[i] = max(
+                        self._get_requested_row_height(i),
+                        self._max_cell_heights.get(i, -math.inf))
+            else:
+                self._min_expandable_row_heights[i] = \
+                        self._max_cell_heights.get(i, 0)
+
+        self._stale_rows = set()
+
+    def _update_stale_cols(self):
+        """
+        Update the widths of just the columns that had cells change size.
+        """
+        for j in self._stale_cols:
+            max_width = self._cell_widths[j].get_max() \
+                    if j in self._cell_widths else None
+            if self._max_cell_widths.get(j) == max_width:
+                continue
+
+            if max_width is None:
+                del self._max_cell_widths[j]
+            else:
+                self._max_cell_widths[j] = max_width
+
+            if j in self._fixed_cols:
+                self._fixed_col_widths[j] = max(
+                        self._get_requested_col_width(j),
+                        self._max_cell_widths.get(j, -math.inf))
+            else:
+                self._min_expandable_col_widths[j] = \
+                        self._max_cell_widths.get(j, 0)
+
+        self._stale_cols = set()
 
     def _find_which_rows_expand(self):
         self._fixed_rows = set()
@@ -493,28 +702,62 @@ class Grid:
                 + self._padding_width
 
     def _find_cell_rects(self):
-        self._row_tops = {}
-        self._col_lefts = {}
-        self._cell_rects = {}
-
-        top_cursor = self._bounding_rect.top
-
+        # Work out where every row and column starts and ends, by accumulating 
+        # the padding and the row/column sizes in order.  The cell rectangles 
+        # themselves aren't made until someone asks for them, see _CellRects.
+        row_steps = [self._bounding_rect.top]
         for i in range(self._num_rows):
-            top_cursor -= self._get_row_padding(i)
-            left_cursor = self._bounding_rect.left
-            row_height = self._row_heights[i]
-            self._row_tops[i] = top_cursor
-
-            for j in range(self._num_cols):
-                left_cursor += self._get_col_padding(j)
-                col_width = self._col_widths[j]
-
-                self._cell_rects[i,j] = Rect.from_size(col_width, row_height)
-                self._cell_rects[i,j].top_left = left_cursor, top_cursor
-                self._col_lefts[j] = left_cursor
+            row_steps += [self._get_row_padding(i), self._row_heights[i]]
 
-                left_cursor += col_width
-            top_cursor -= row_height
+        col_steps = [self._bounding_rect.left]
+        for j in range(self._num_cols):
+            col_steps += [self._get_col_padding(j), self._col_widths[j]]
+
+        row_edges = self._accumulate(row_steps, operator.sub)
+        col_edges = self._accumulate(col_steps, operator.add)
+
+        row_tops = row_edges[1::2]
+        col_lefts = col_edges[1::2]
+        neg_row_bottoms = [-x for x in row_edges[2::2]]
+        col_rights = col_edges[2::2]
+
+        # Only forget the rectangles for the cells that actually moved or 
+        # changed size.  When a single row changes height, that's the cells in 
+        # that row and every row below it (and likewise for columns).  Cells 
+        # above and to the left of the change keep their old rectangles.  If 
+        # the number of rows or columns changed, just start over.
+        if len(neg_row_bottoms) != len(self._neg_row_bottoms) or \
+                len(col_rights) != len(self._col_rights):
+            first_row = first_col = 0
+        else:
+            first_row = _find_first_change(
+                    row_tops, self._row_tops,
+                    neg_row_bottoms, self._neg_row_bottoms)
+            first_col = _find_first_change(
+                    col_lefts, self._col_lefts,
+                    col_rights, self._col_rights)
+
+        self._row_tops = row_tops
+        self._col_lefts = col_lefts
+        self._neg_row_bottoms = neg_row_bottoms
+        self._col_rights = col_rights
+        self._are_rows_sorted = _is_sorted(row_edges, operator.ge)
+        self._are_cols_sorted = _is_sorted(col_edges, operator.le)
+
+        self._cell_rects._update(
+                row_tops, [self._row_heights[i] for i in range(self._num_rows)],
+                col_lefts, [self._col_widths[j] for j in range(self._num_cols)],
+                first_row, first_col)
+
+    def _accumulate(self, steps, op):
+        if self._backend == 'numpy' or (
+                self._backend == 'auto' and
+                numpy is not None and
+                len(steps) > _NUMPY_MIN_STEPS):
+            ufunc = numpy.subtract if op is operator.sub else numpy.add
+            return ufunc.accumulate(numpy.array(steps)).tolist()
+        else:
+            return list(itertools.accumulate(steps, op))
 
     def _get_requested_row_height(self, i):
         return self._requested_row_heights.get(i, self._default_row_height)
@@ -528,12 +771,119 @@ class Grid:
     def _get_col_padding(self, j):
         return self._outer_padding if j == 0 else self._inner_padding
 
+class _CellRects(Mapping):
+    """
+    Map (row, col) indices to the rectangle for each cell in the grid.
+
+    The rectangles are only made when they're asked for, and are then cached 
+    until the cell they belong to moves or changes size.  This keeps the cost 
+    of laying out the grid proportional to the number of rows and columns, 
+    rather than to the number of cells.  That matters for big grids (e.g. tile 
+    maps) where most of the cells are never looked at.
+
+    If the grid is sparse, only the occupied cells are included.  The 
+    `_occupied` attribute refers to the grid's own dictionary of minimum cell 
+    sizes in that case, so it's always up-to-date.
+
+    This mapping is returned directly by `Grid.make_cells()`, so it's a live 
+    view that changes every time the grid is laid out, see that method.
+    """
+
+    def __init__(self):
+        self._row_tops = []
+        self._row_heights = []
+        self._col_lefts = []
+        self._col_widths = []
+        self._rects = {}
+        self._occupied = None
+
+    def __getitem__(self, ij):
+        # Check that the cell still exists before looking in the cache, since 
+        # in a sparse grid a cell can be removed without the rows or columns 
+        # changing (and therefore without its cached rectangle being dropped).
+        if ij not in self:
+            raise KeyError(ij)
+
+        try:
+            return self._rects[ij]
+        except KeyError:
+            pass
+
+        i, j = ij
+
+        rect = self._rects[ij] = Rect(
+                self._col_lefts[j],
+                self._row_tops[i] - self._row_heights[i],
+                self._col_widths[j],
+                self._row_heights[i],
+        )
+        return rect
+
+    def __iter__(self):
+        if self._occupied is not None:
+            return (ij for ij in self._occupied if self._is_in_range(ij))
+        else:
+            return itertools.product(
+                    range(len(self._row_tops)), range(len(self._col_lefts)))
+
+    def __len__(self):
+        if self._occupied is not None:
+            return sum(1 for ij in self)
+        else:
+            return len(self._row_tops) * len(self._col_lefts)
+
+    def __contains__(self, ij):
+        if self._occupied is not None and ij not in self._occupied:
+            return False
+        return self._is_in_range(ij)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def _is_in_range(self, ij):
+        try:
+            i, j = ij
+        except (TypeError, ValueError):
+            return False
+        return 0 <= i < len(self._row_tops) and 0 <= j < len(self._col_lefts)
+
+    def _update(self, row_tops, row_heights, col_lefts, col_widths,
+            first_row=0, first_col=0):
+        self._row_tops = row_tops
+        self._row_heights = row_heights
+        self._col_lefts = col_lefts
+        self._col_widths = col_widths
+
+        if first_row == first_col == 0:
+            self._rects = {}
+        else:
+            self._rects = {
+                    (i,j): rect
+                    for (i,j), rect in self._rects.items()
+                    if i < first_row and j < first_col
+            }
+
+
+# Below this many steps, the overhead of making a numpy array is bigger than the 
+# time it saves.
+_NUMPY_MIN_STEPS = 256
+
+def _find_first_change(new_starts, old_starts, new_ends, old_ends):
+    for k, end in enumerate(new_ends):
+        if end != old_ends[k] or new_starts[k] != old_starts[k]:
+            return k
+    return len(new_ends)
+
+def _is_sorted(edges, op):
+    return all(op(a, b) for a, b in zip(edges, edges[1:]))
+
 def make_grid(rect, cells={}, num_rows=0, num_cols=0, padding=None,
         inner_padding=None, outer_padding=None, row_heights={}, col_widths={}, 
         default_row_height='expand', default_col_width='expand'):
     """
     Return rectangles for each cell in the specified grid.  The rectangles are 
-    returned in a dictionary where the keys are (row, col) tuples.
+    returned in a new dictionary where the keys are (row, col) tuples, unlike 
+    `Grid.make_cells()` which returns a live view of the grid.
     """
     grid = Grid(
             bounding_rect=rect,
@@ -548,5 +898,5 @@ def make_grid(rect, cells={}, num_rows=0, num_cols=0, padding=None,
             default_row_height=default_row_height,
             default_col_width=default_col_width,
     )
-    return grid.make_cells()
+    return dict(grid.make_cells())
 
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+
+import collections
+import concurrent.futures
+import pyglet
+import autoprop
+
+from glooey.helpers import *
+
+__all__ = [
+        'load_image_async',
+        'process_pending_images',
+        'get_image_upload_budget',
+        'set_image_upload_budget',
+        'get_texture_budget',
+        'set_texture_budget',
+        'get_texture_memory',
+        'PendingImage',
+        'ManagedImage',
+]
+
+def load_image_async(filename, file=None, decoder=None, *,
+        placeholder=None, size_hint=None):
+    """
+    Start decoding the given image in a background thread, and return a 
+    `PendingImage` that can be used in its place until it's ready.
+
+    The ``filename``, ``file``, and ``decoder`` arguments are the same as for 
+    `pyglet.image.load()`.  Decoding happens in a thread pool, but the decoded 
+    images are uploaded to the GPU on the main thread, a few at a time, by 
+    `process_pending_images()`.  This is scheduled to happen once per frame 
+    automatically, so the only requirement is that the pyglet clock is 
+    running.
+
+    `Image` and `Background` widgets accept pending images anywhere a regular 
+    image would go.  Until the image is ready, they show the given placeholder 
+    image (if any).  `Image` widgets also reserve space for the given size 
+    hint (if any) or the placeholder, so they only need to be repacked when 
+    the image arrives if it turns out to be a different size.  If the image 
+    can't be decoded, they just keep showing the placeholder.
+    """
+    global _num_pending_images
+
+    pending = PendingImage(placeholder, size_hint)
+    pending._future = _get_executor().submit(
+            _decode_image, pending, filename, file, decoder)
+
+    if not _num_pending_images:
+        pyglet.clock.schedule(process_pending_images)
+    _num_pending_images += 1
+
+    return pending
+
+def process_pending_images(dt=None, *, budget=None):
+    """
+    Upload images that have finished decoding to the GPU, and return how many 
+    were uploaded.
+
+    Only as many images as fit in the upload budget (see 
+    `set_image_upload_budget()`) are uploaded per call, but at least one image 
+    is always uploaded if any are ready.  A different budget can be given for 
+    a single call, e.g. ``float('inf')`` to upload everything that's ready.
+
+    This function is scheduled to run every frame while any images are 
+    pending, so there's usually no need to call it directly.  It could be 
+    useful in a loading screen, though.
+    """
+    global _num_pending_images
+
+    budget = _upload_budget if budget is None else budget
+    num_uploaded = 0
+
+    while _decoded_images and (budget > 0 or not num_uploaded):
+        pending, image, error = _decoded_images.popleft()
+
+        _num_pending_images -= 1
+        if not _num_pending_images:
+            pyglet.clock.unschedule(process_pending_images)
+
+        # Don't raise decoding errors here.  This function is usually called by 
+        # the clock, so raising would just skip every other image in the 
+        # queue.  Instead, give the error to the pending image, which re-raises 
+        # it from `wait()`, and keep going.
+        if error is not None:
+            pending._fail(error)
+            continue
+
+        num_uploaded += 1
+        texture = image.get_texture()
+        budget -= texture.width * texture.height
+        pending._resolve(texture)
+
+    return num_uploaded
+
+def get_texture_budget():
+    """
+    Return the number of bytes of texture memory that `ManagedImage` textures 
+    can use before the least recently drawn ones are evicted, or None if 
+    there is no limit.
+    """
+    return _texture_budget
+
+def set_texture_budget(num_bytes):
+    """
+    Set the number of bytes of texture memory that `ManagedImage` textures can 
+    use before the least recently drawn ones are evicted.  None means that 
+    there is no limit, which is the default.
+
+    Textures that are being drawn are never evicted, so the budget can be 
+    exceeded if that's what it takes to draw everything that's visible.
+    """
+    global _texture_budget
+
+    if num_bytes is not None and num_bytes < 0:
+        raise UsageError(f"the texture budget can't be negative, not {num_bytes}.")
+
+    _texture_budget = num_bytes
+    _evict_textures()
+
+def get_texture_memory():
+    """
+    Return the number of bytes of texture memory currently being used by 
+    `ManagedImage` textures.
+    """
+    return _texture_memory
+
+def get_image_upload_budget():
+    """
+    Return the number of pixels that `process_pending_images()` uploads to 
+    the GPU each frame.
+    """
+    return _upload_budget
+
+def set_image_upload_budget(pixels):
+    """
+    Set the number of pixels that `process_pending_images()` uploads to the 
+    GPU each frame.
+
+    A bigger budget means that images show up sooner, at the cost of frames 
+    that might take longer to draw.
+    """
+    global _upload_budget
+
+    if pixels <= 0:
+        raise UsageError(f"the image upload budget must be positive, not {pixels}.")
+
+    _upload_budget = pixels
+
+@autoprop
+class PendingImage:
+    """
+    A handle to an image that is still being decoded.
+
+    Pending images are returned by `load_image_async()`.  Once the image is 
+    ready, the ``image`` attribute returns it (as a texture) and any callbacks 
+    that were registered with `add_callback()` are called.  Until then, 
+    ``image`` is None and the ``current`` attribute returns the placeholder.
+
+    If the image can't be decoded, the callbacks are still called, but 
+    ``image`` stays None and the ``error`` attribute holds the exception that 
+    was raised.  `wait()` raises the same exception.
+    """
+
+    def __init__(self, placeholder=None, size_hint=None):
+        self._placeholder = placeholder
+        self._size_hint = size_hint
+        self._image = None
+        self._error = None
+        self._future = None
+        self._callbacks = []
+
+    def __repr__(self):
+        if self.is_ready:
+            state = 'ready'
+        elif self.is_failed:
+            state = 'failed'
+        else:
+            state = 'pending'
+        return f'<{self.__class__.__name__} {state}>'
+
+    def get_image(self):
+        return self._image
+
+    def get_error(self):
+        return self._error
+
+    def get_placeholder(self):
+        return self._placeholder
+
+    def get_current(self):
+        """
+        Return the image if it's ready, or the placeholder otherwise.
+        """
+        return self._image if self._image is not None else self._placeholder
+
+    def get_size(self):
+        """
+        Return the size of the image if it's ready.  Otherwise return the size 
+        hint, or the size of the placeholder if there's no size hint.
+        """
+        if self._image is not None:
+            return self._image.width, self._image.height
+        if self._size_hint is not None:
+            return self._size_hint
+        if self._placeholder is not None:
+            return self._placeholder.width, self._placeholder.height
+        return 0, 0
+
+    def get_width(self):
+        return self.size[0]
+
+    def get_height(self):
+        return self.size[1]
+
+    @property
+    def is_ready(self):
+        return self._image is not None
+
+    @property
+    def is_failed(self):
+        return self._error is not None
+
+    def add_callback(self, callback):
+        """
+        Arrange for ``callback(pending_image)`` to be called when the image 
+        is ready, or when it fails to decode.  If that has already happened, 
+        the callback is called right away.
+        """
+        if self.is_ready or self.is_failed:
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+
+    def remove_callback(self, callback):
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+
+    def wait(self):
+        """
+        Block until the image has been decoded, then upload it (and any other 
+        images that have been decoded) right away.  If the image couldn't be 
+        decoded, raise the error that occurred.
+        """
+        if self._future is not None:
+            self._future.result()
+
+        while not (self.is_ready or self.is_failed) and _decoded_images:
+            process_pending_images(budget=float('inf'))
+
+        if self._error is not None:
+            raise self._error
+
+        return self._image
+
+    def _resolve(self, image):
+        self._image = image
+        self._call_callbacks()
+
+    def _fail(self, error):
+        self._error = error
+        self._call_callbacks()
+
+    def _call_callbacks(self):
+        callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            callback(self)
+
+
+@autoprop
+class ManagedImage:
+    """
+    An image whose texture is only kept in memory while it's needed.
+
+    Managed images can be used anywhere a regular image would go in `Image` 
+    widgets and `Background` widgets (or `Tile` artists).  Each widget holds 
+    on to the texture while it's drawn, and lets go of it when it's undrawn 
+    (e.g. because it was scrolled out of view, or it's in a `Deck` state that 
+    isn't being shown).  Textures that aren't being used by any widget are 
+    evicted, least recently drawn first, whenever the total texture memory 
+    exceeds the budget set by `set_texture_budget()`.  Evicted textures are 
+    transparently reloaded from the source the next time they're drawn.
+
+    The source can be either a filename, or a function that takes no 
+    arguments and returns an image.  If ``downscale`` is true, images drawn 
+    by responsive `Image` widgets at half their size or less are drawn from a 
+    smaller copy, which is managed in the same way as the full-size texture.
+    """
+
+    def __init__(self, source, *, downscale=False):
+        self._source = source
+        self._downscale = downscale
+        self._size = None
+        self._textures = {}
+        self._num_users = {}
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {self._source!r}>'
+
+    def get_source(self):
+        return self._source
+
+    def get_downscale(self):
+        return self._downscale
+
+    def get_size(self):
+        # The first time the size is needed, the image has to be loaded.  The 
+        # texture goes into the cache, because it'll probably be drawn soon.
+        if self._size is None:
+            self.get_texture()
+        return self._size
+
+    def get_width(self):
+        return self.size[0]
+
+    def get_height(self):
+        return self.size[1]
+
+    def get_texture(self, factor=1):
+        """
+        Return the texture for this image, loading it if necessary.
+
+        If a factor is given, return a copy of the texture that is that many 
+        times smaller in each dimension.
+        """
+        try:
+            texture = self._textures[factor]
+        except KeyError:
+            texture = self._load(factor)
+
+        if (self, factor) in _unused_textures:
+            _unused_textures.move_to_end((self, factor))
+
+        return texture
+
+    def get_downscale_factor(self, scale):
+        """
+        Return the factor that should be passed to `get_texture()` to draw 
+        this image at the given scale.
+
+        This is the biggest power of two that the image could be shrunk by 
+        without being drawn bigger than its texture, or 1 if downscaling is 
+        disabled.
+        """
+        factor = 1
+        if self._downscale:
+            while scale * factor * 2 <= 1:
+                factor *= 2
+        return factor
+
+    def acquire(self, factor=1):
+        """
+        Load the texture for this image (see `get_texture()`) and keep it in 
+        memory until `release()` is called.
+        """
+        self._num_users[factor] = self._num_users.get(factor, 0) + 1
+        _unused_textures.pop((self, factor), None)
+        return self.get_texture(factor)
+
+    def release(self, factor=1):
+        """
+        Allow the texture for this image to be evicted, once every call to 
+        `acquire()` has been matched by a call to this method.
+        """
+        self._num_users[factor] -= 1
+
+        if not self._num_users[factor]:
+            del self._num_users[factor]
+            if factor in self._textures:
+                _unused_textures[self, factor] = None
+            _evict_textures()
+
+    def evict(self):
+        """
+        Unload any textures for this image that aren't being used.
+        """
+        for factor in list(self._textures):
+            if factor not in self._num_users:
+                _unused_textures.pop((self, factor), None)
+                self._unload(factor)
+
+    @property
+    def is_loaded(self):
+        return bool(self._textures)
+
+    def _load(self, factor):
+        global _texture_memory
+
+        if callable(self._source):
+            image = self._source()
+        else:
+            image = pyglet.image.load(str(self._source))
+
+        self._size = image.width, image.height
+
+        if factor > 1:
+            image = _downscale_image(image, factor)
+
+        # Make room for the new texture before adding it to the cache, so it 
+        # can't be evicted right away.
+        texture = self._textures[factor] = image.get_texture()
+        _texture_memory += _get_texture_memory(texture)
+        _evict_textures()
+
+        if factor not in self._num_users:
+            _unused_textures[self, factor] = None
+
+        return texture
+
+    def _unload(self, factor):
+        global _texture_memory
+
+        # The texture itself is deleted by pyglet once nothing refers to it.
+        texture = self._textures.pop(factor)
+        _texture_memory -= _get_texture_memory(texture)
+
+
+def _get_executor():
+    global _executor
+
+    if _executor is None:
+        _executor = concurrent.futures.ThreadPoolExecutor(
+                thread_name_prefix='glooey-image-decoder')
+
+    return _executor
+
+def _decode_image(pending, filename, file, decoder):
+    # Only decode the image here; making textures requires the GL context, 
+    # which belongs to the main thread.
+    image, error = None, None
+
+    try:
+        image = pyglet.image.load(filename, file=file, decoder=decoder)
+    except Exception as err:
+        error = err
+
+    _decoded_images.append((pending, image, error))
+
+def _evict_textures():
+    while _texture_budget is not None and \
+            _texture_memory > _texture_budget and _unused_textures:
+        (image, factor), _ = _unused_textures.popitem(last=False)
+        image._unload(factor)
+
+def _get_texture_memory(texture):
+    texture = getattr(texture, 'owner', texture)
+    return texture.width * texture.height * 4
+
+def _downscale_image(image, factor):
+    # Keep every nth pixel of every nth row.  This is crude, but the copy is 
+    # only ever drawn at a fraction of the original size anyway.
+    width = max(image.width // factor, 1)
+    height = max(image.height // factor, 1)
+    data = image.get_image_data().get_data('RGBA', image.width * 4)
+    pixels = memoryview(data).cast('I')
+
+    rows = [
+            pixels[y * image.width : (y + 1) * image.width : factor][:width]
+            for y in range(0, height * factor, factor)
+    ]
+    data = b''.join(row.tobytes() for row in rows)
+    return pyglet.image.ImageData(width, height, 'RGBA', data)
+
+_executor = None
+_decoded_images = collections.deque()
+_num_pending_images = 0
+_upload_budget = 512 * 512
+_texture_budget = None
+_texture_memory = 0
+_unused_textures = collections.OrderedDict()
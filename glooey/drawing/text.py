@@ -1,5 +1,39 @@
 #!/usr/bin/env python3
 
+import os
+import math
+import time
+import json
+import shlex
+import string
+import struct
+import hashlib
+import weakref
+import collections
+import functools
+import pyglet
+import autoprop
+
+from pathlib import Path
+from collections import namedtuple
+from glooey.helpers import *
+
+__all__ = [
+        'lorem_ipsum',
+        'load_font',
+        'get_font_metrics',
+        'prewarm_font',
+        'clear_font_cache',
+        'FontMetrics',
+        'SharedTextLayout',
+        'BitmapFont',
+        'load_bitmap_font',
+        'register_font_file',
+        'get_text_raster',
+        'set_text_raster_cache_dir',
+        'clear_text_raster_cache',
+]
+
 def lorem_ipsum(num_sentences=None, num_paragraphs=None):
     """
     Return the given amount of "Lorem ipsum..." text.
@@ -42,6 +76,603 @@ def lorem_ipsum(num_sentences=None, num_paragraphs=None):
 
     return lorem
 
+def load_font(name=None, size=None, bold=False, italic=False):
+    """
+    Return the pyglet font with the given name, size, and style.
+
+    Fonts are kept in a process-wide registry, so only the first request for 
+    any particular (name, size, bold, italic) combination actually goes 
+    through `pyglet.font.load()`.  The registry also holds a strong reference 
+    to each font, which keeps pyglet's own (weak) font cache populated for the 
+    text layouts that look up the same fonts.  Like pyglet's cache, the 
+    registry is kept separately for each set of GL contexts that share 
+    objects, because each font's glyphs live in textures that belong to the 
+    context that was current when the font was loaded.
+    """
+    key = _make_font_key(name, size, bold, italic)
+    fonts = _get_context_cache(_fonts)
+
+    try:
+        return fonts[key]
+    except KeyError:
+        name, size, bold, italic = key
+        font = fonts[key] = pyglet.font.load(
+                list(name) if isinstance(name, tuple) else name,
+                size, bold=bold, italic=italic)
+        return font
+
+def get_font_metrics(name=None, size=None, bold=False, italic=False):
+    """
+    Return the cached `FontMetrics` for the given font.
+
+    The arguments are the same as for `load_font()`.
+    """
+    key = _make_font_key(name, size, bold, italic)
+    font_metrics = _get_context_cache(_font_metrics)
+
+    try:
+        return font_metrics[key]
+    except KeyError:
+        metrics = font_metrics[key] = FontMetrics(load_font(*key))
+        return metrics
+
+def prewarm_font(name=None, size=None, bold=False, italic=False, chars=None):
+    """
+    Rasterize the given characters in the given font, and return how many 
+    seconds that took.
+
+    pyglet renders each glyph into the font's texture the first time it's 
+    used, which can cause a noticeable hitch the first time some text is 
+    shown.  Calling this function while the game is loading moves that cost 
+    out of the first frame.  If no characters are given, all the printable 
+    ASCII characters are rasterized.  The other arguments are the same as for 
+    `load_font()`.
+    """
+    start = time.perf_counter()
+    get_font_metrics(name, size, bold, italic).prewarm(
+            printable_ascii if chars is None else chars)
+    return time.perf_counter() - start
+
+def clear_font_cache():
+    """
+    Forget every font and metric loaded by `load_font()` and 
+    `get_font_metrics()`.
+
+    This is only necessary if the fonts themselves change, e.g. if a font 
+    file with the same name as one that's already been loaded is added.
+    """
+    _fonts.clear()
+    _font_metrics.clear()
+
+@autoprop
+class FontMetrics:
+    """
+    Measure text in a particular font without making a text layout.
+
+    The ascent and descent are copied from the font when the metrics are 
+    created.  The advance of each character is looked up (which may require 
+    the glyph to be rasterized) the first time it's needed, and cached after 
+    that.  Use `get_font_metrics()` to get an instance that's shared with the 
+    rest of the process.
+    """
+
+    def __init__(self, font):
+        self._font = font
+        self._ascent = font.ascent
+        self._descent = font.descent
+        self._advances = {}
+
+    def get_font(self):
+        return self._font
+
+    def get_ascent(self):
+        return self._ascent
+
+    def get_descent(self):
+        return self._descent
+
+    def get_line_height(self):
+        return self._ascent - self._descent
+
+    def get_advance(self, char):
+        try:
+            return self._advances[char]
+        except KeyError:
+            glyph, = self._font.get_glyphs(char)
+            self._advances[char] = glyph.advance
+            return glyph.advance
+
+    def get_advances(self, text):
+        return [self.get_advance(x) for x in text]
+
+    def prewarm(self, chars):
+        """
+        Rasterize and measure all of the given characters at once.
+
+        This is faster than measuring each character individually, because 
+        pyglet can render all the new glyphs in a single pass.
+        """
+        new_chars = ''.join(x for x in set(chars) if x not in self._advances)
+        glyphs = self._font.get_glyphs(new_chars)
+
+        for char, glyph in zip(new_chars, glyphs):
+            self._advances[char] = glyph.advance
+
+    def measure(self, text):
+        """
+        Return the width and height of the given text, as a single line.
+
+        Kerning isn't taken into account, so the width may differ slightly 
+        from what a pyglet text layout would report for the same string.
+        """
+        return sum(self.get_advances(text)), self.line_height
+
+
+class SharedTextLayout(pyglet.text.layout.TextLayout):
+    """
+    A text layout that shares its OpenGL state with every other shared layout 
+    that has an equal parent group.
+
+    pyglet only lets text layouts share groups if their parent groups are the 
+    exact same object.  But glooey often gives widgets groups that are equal 
+    without being identical, e.g. every `Stack` makes a new `OrderedGroup` for 
+    each of its layers.  This layout compares parent groups by equality 
+    instead, so (for example) the captions of every button in a panel can be 
+    drawn with a single set of state changes per font texture.
+    """
+
+    class Group(pyglet.text.layout.TextLayoutGroup):
+
+        def __hash__(self):
+            return hash((self.__class__, self.parent))
+
+        def __eq__(self, other):
+            return self.__class__ is other.__class__ and \
+                    self.parent == other.parent
+
+    def _init_groups(self, group):
+        from pyglet.text.layout import (
+                TextLayoutForegroundGroup,
+                TextLayoutForegroundDecorationGroup,
+        )
+        # If there isn't a parent group, pyglet's class-level groups are 
+        # already shared by every layout.
+        if group:
+            self.top_group = self.Group(group)
+            self.background_group = pyglet.graphics.OrderedGroup(
+                    0, self.top_group)
+            self.foreground_group = TextLayoutForegroundGroup(
+                    1, self.top_group)
+            self.foreground_decoration_group = \
+                    TextLayoutForegroundDecorationGroup(2, self.top_group)
+
+
+@autoprop
+class BitmapFont:
+    """
+    A font made of glyphs that have already been drawn into a single image.
+
+    Bitmap fonts are described by a glyph sheet (an image) and a metrics file 
+    in the text format used by AngelCode's BMFont tool.  Most pixel-art fonts 
+    are distributed in this format, or can easily be converted to it.  Only 
+    single-page fonts are supported.  Labels that use a bitmap font (see 
+    ``Label.custom_bitmap_font``) don't need pyglet's text layout machinery at 
+    all: each character is just a textured quad.
+
+    Use `load_bitmap_font()` or `ResourceLoader.bitmap_font()` to load a font 
+    from a file.
+    """
+    Glyph = namedtuple('Glyph', 'x_offset y_offset width height advance tex_coords')
+
+    def __init__(self, texture, glyphs, line_height, baseline, kernings=None):
+        self._texture = texture
+        self._glyphs = glyphs
+        self._line_height = line_height
+        self._baseline = baseline
+        self._kernings = kernings or {}
+
+        # Many labels will ask for the size of the same strings (e.g. when 
+        # being repacked), so remember the answers.
+        self._measure = functools.lru_cache(maxsize=1024)(self._measure)
+
+    @classmethod
+    def from_fnt(cls, file, load_image):
+        """
+        Parse a font from a BMFont metrics file (in the text format).
+
+        The ``file`` argument can be any iterable of lines.  The 
+        ``load_image`` argument must be a function that takes the name of the 
+        glyph sheet (as given in the metrics file) and returns the 
+        corresponding pyglet image.
+        """
+        common = {}
+        pages = {}
+        chars = {}
+        kernings = {}
+
+        for line in file:
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+
+            tag, *fields = shlex.split(line) or ['']
+            fields = dict(x.split('=', 1) for x in fields if '=' in x)
+
+            if tag == 'common':
+                common = fields
+            elif tag == 'page':
+                pages[int(fields['id'])] = fields['file']
+            elif tag == 'char':
+                chars[int(fields['id'])] = fields
+            elif tag == 'kerning':
+                key = chr(int(fields['first'])), chr(int(fields['second']))
+                kernings[key] = int(fields['amount'])
+
+        if len(pages) != 1:
+            raise UsageError(f"bitmap fonts must have exactly one page, not {len(pages)}.")
+
+        texture = load_image(pages.popitem()[1]).get_texture()
+        glyphs = {}
+
+        for id, fields in chars.items():
+            x, y, w, h = (int(fields[k]) for k in ('x', 'y', 'width', 'height'))
+
+            # BMFont measures y from the top of the image, pyglet from the 
+            # bottom.
+            region = texture.get_region(x, texture.height - y - h, w, h)
+
+            glyphs[chr(id)] = cls.Glyph(
+                    x_offset=int(fields['xoffset']),
+                    y_offset=int(fields['yoffset']),
+                    width=w,
+                    height=h,
+                    advance=int(fields['xadvance']),
+                    tex_coords=region.tex_coords,
+            )
+
+        return cls(
+                texture, glyphs,
+                line_height=int(common['lineHeight']),
+                baseline=int(common['base']),
+                kernings=kernings,
+        )
+
+    def get_texture(self):
+        return self._texture
+
+    def get_line_height(self):
+        return self._line_height
+
+    def get_baseline(self):
+        return self._baseline
+
+    def get_glyph(self, char):
+        """
+        Return the glyph for the given character, or None if the font doesn't 
+        have one.  Characters that are missing from the font are drawn as '?', 
+        if the font has that.
+        """
+        if char == '\t':
+            char = ' '
+        return self._glyphs.get(char) or self._glyphs.get('?')
+
+    def get_kerning(self, left, right):
+        return self._kernings.get((left, right), 0)
+
+    def get_line_width(self, line):
+        width = 0
+        prev_char = None
+
+        # Characters without glyphs are skipped entirely, so they don't affect 
+        # the kerning of the characters around them.  This has to match how 
+        # `BitmapText` draws the text.
+        for char in line:
+            glyph = self.get_glyph(char)
+            if glyph is None:
+                continue
+
+            width += glyph.advance + self.get_kerning(prev_char, char)
+            prev_char = char
+
+        return width
+
+    def split_lines(self, text, wrap_width=0):
+        """
+        Split the given text into the lines that will be drawn.
+
+        The text is always split on newlines.  If a wrap width is given, lines 
+        that are too wide are also split between words.
+        """
+        lines = []
+
+        for paragraph in text.split('\n'):
+            if not wrap_width:
+                lines.append(paragraph)
+                continue
+
+            line = ''
+            for word in paragraph.split(' '):
+                candidate = f'{line} {word}' if line else word
+                if line and self.get_line_width(candidate) > wrap_width:
+                    lines.append(line)
+                    line = word
+                else:
+                    line = candidate
+
+            lines.append(line)
+
+        return lines
+
+    def measure(self, text, wrap_width=0, line_spacing=None):
+        """
+        Return the width and height of the given text.
+
+        If a wrap width is given, it is used as the width of the text (as is 
+        the case for pyglet text layouts).
+        """
+        return self._measure(text, wrap_width, line_spacing)
+
+    def _measure(self, text, wrap_width, line_spacing):
+        lines = self.split_lines(text, wrap_width)
+        width = wrap_width or max(self.get_line_width(x) for x in lines)
+        height = len(lines) * (line_spacing or self._line_height)
+        return width, height
+
+
+def load_bitmap_font(path):
+    """
+    Load a `BitmapFont` from the given BMFont metrics file.  The glyph sheet 
+    is expected to be in the same directory as the metrics file.
+    """
+    path = Path(path)
+    with path.open() as file:
+        return BitmapFont.from_fnt(
+                file, lambda name: pyglet.image.load(str(path.parent / name)))
+
+
+def register_font_file(file):
+    """
+    Take note of a font file that may be used to render text.
+
+    The contents of each registered font file are part of the key used to 
+    cache text rasterized in that font (see `get_text_raster()`), so that 
+    rasters saved to disk are ignored if the font changes.  
+    `ResourceLoader.add_font()` calls this function automatically.
+    """
+    data = file.read()
+    family = _read_font_family(data)
+    digest = hashlib.sha256(data).hexdigest()
+    _font_file_hashes.setdefault(family, set()).add(digest)
+
+def get_text_raster(text, style, wrap_width=0):
+    """
+    Return a texture with the given text drawn into it.
+
+    The text is drawn in white, and its coverage is stored in the alpha 
+    channel, so the texture can be drawn in any color by tinting it (e.g. with 
+    the ``color`` attribute of a sprite).  The ``color`` and 
+    ``background_color`` styles are ignored for this reason.  The ``style`` 
+    and ``wrap_width`` arguments are otherwise interpreted in the same way as 
+    by `Label`.
+
+    Rasters are cached in memory, keyed by a hash of the text, the style, and 
+    the registered font file for the style's font (if any).  Only the most 
+    recently used rasters are kept in memory.  If `set_text_raster_cache_dir()` has been 
+    called, rasters are also saved to (and loaded from) that directory, so 
+    text that doesn't change between runs only has to be laid out once.
+    """
+    style = {
+            k: v for k, v in style.items()
+            if k not in ('color', 'background_color')
+    }
+    key = _make_raster_key(text, style, wrap_width)
+
+    try:
+        _text_rasters.move_to_end(key)
+        return _text_rasters[key]
+    except KeyError:
+        pass
+
+    path = _text_raster_dir / f'{key}.png' if _text_raster_dir else None
+
+    if path and path.exists():
+        image = pyglet.image.load(str(path))
+    else:
+        image = _rasterize_text(text, style, wrap_width)
+        if path:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            image.save(str(path))
+
+    texture = _text_rasters[key] = image.get_texture()
+
+    while len(_text_rasters) > _max_text_rasters:
+        _text_rasters.popitem(last=False)
+
+    return texture
+
+def set_text_raster_cache_dir(dir):
+    """
+    Save rasterized text in the given directory, or stop saving it if None is 
+    given.  See `get_text_raster()`.
+    """
+    global _text_raster_dir
+    _text_raster_dir = Path(dir) if dir is not None else None
+
+def clear_text_raster_cache():
+    """
+    Forget every texture made by `get_text_raster()`.  Rasters that have been 
+    saved to disk are not deleted.
+    """
+    _text_rasters.clear()
+
+
+def _get_context_cache(caches):
+    # Key the caches on the same object that pyglet keys its own font cache 
+    # on.  The object space goes away with the last context that shares it, 
+    # and so do the fonts that were loaded for it.
+    object_space = pyglet.gl.current_context.object_space
+    try:
+        return caches[object_space]
+    except KeyError:
+        cache = caches[object_space] = {}
+        return cache
+
+def _make_font_key(name, size, bold, italic):
+    if isinstance(name, list):
+        name = tuple(name)
+    return name, size, bool(bold), bool(italic)
+
+printable_ascii = string.digits + string.ascii_letters + string.punctuation + ' '
+
+def _make_raster_key(text, style, wrap_width):
+    key = json.dumps([
+            text,
+            sorted(style.items()),
+            wrap_width,
+            _find_font_file_hashes(style.get('font_name')),
+            pyglet.version,
+    ])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+def _find_font_file_hashes(font_name):
+    # pyglet uses the first of the given font names that it can find, so only 
+    # that font's files (or the files whose family names couldn't be read) 
+    # affect how the text will be rendered.
+    hashes = set(_font_file_hashes.get(None, ()))
+    names = font_name if isinstance(font_name, (list, tuple)) else [font_name]
+
+    for name in names:
+        if name is None:
+            continue
+        if name.lower() in _font_file_hashes:
+            hashes |= _font_file_hashes[name.lower()]
+            break
+        if pyglet.font.have_font(name):
+            break
+
+    return sorted(hashes)
+
+def _read_font_family(data):
+    # pyglet can only read the name table from a file on disk, so parse it 
+    # directly from the bytes we already have.  Only the 'family' name (ID 1) 
+    # is needed.  Anything unexpected (e.g. font collections) just means the 
+    # font can't be tied to a particular family.
+    try:
+        num_tables, = struct.unpack_from('>H', data, 4)
+        for i in range(num_tables):
+            tag, _, offset, _ = struct.unpack_from('>4sIII', data, 12 + 16 * i)
+            if tag == b'name':
+                break
+        else:
+            return None
+
+        _, count, string_offset = struct.unpack_from('>HHH', data, offset)
+        names = {}
+        for i in range(count):
+            platform, _, _, name_id, length, name_offset = \
+                    struct.unpack_from('>HHHHHH', data, offset + 6 + 12 * i)
+            if name_id != 1:
+                continue
+
+            start = offset + string_offset + name_offset
+            raw = data[start:start + length]
+
+            # Windows (3) and Unicode (0) names are UTF-16, Macintosh (1) 
+            # names are single bytes.
+            if platform in (0, 3):
+                names.setdefault(platform, raw.decode('utf-16-be'))
+            elif platform == 1:
+                names.setdefault(platform, raw.decode('mac-roman'))
+
+        for platform in (3, 0, 1):
+            if platform in names:
+                return names[platform].lower()
+
+    except (struct.error, UnicodeDecodeError):
+        pass
+
+    return None
+
+def _rasterize_text(text, style, wrap_width):
+    from pyglet.gl import (
+            GLuint, glGenFramebuffersEXT, glBindFramebufferEXT,
+            glFramebufferTexture2DEXT, glDeleteFramebuffersEXT,
+            glPushAttrib, glPopAttrib, glViewport, glMatrixMode, glPushMatrix,
+            glPopMatrix, glLoadIdentity, glOrtho, glClearColor, glClear,
+            GL_FRAMEBUFFER_EXT, GL_COLOR_ATTACHMENT0_EXT, GL_VIEWPORT_BIT,
+            GL_COLOR_BUFFER_BIT, GL_PROJECTION, GL_MODELVIEW,
+    )
+    from ctypes import byref
+
+    white = 255, 255, 255, 255
+    style = {**style, 'color': white}
+    if 'underline' in style:
+        style['underline'] = white
+
+    # Lay out the text in the same way as Label.do_draw().
+    document = pyglet.text.decode_text(text)
+    layout = pyglet.text.layout.TextLayout(
+            document,
+            width=wrap_width or None,
+            multiline=True,
+            wrap_lines=bool(wrap_width),
+    )
+    layout.begin_update()
+    if layout.width is None:
+        layout.width = layout.content_width
+    document.set_style(0, len(text), style)
+    layout.end_update()
+
+    if not wrap_width:
+        layout.width = layout.content_width
+
+    width = max(int(math.ceil(layout.width)), 1)
+    height = max(int(math.ceil(layout.content_height)), 1)
+    texture = pyglet.image.Texture.create(width, height)
+
+    # Draw the layout into the texture, using a framebuffer object.
+    framebuffer = GLuint()
+    glGenFramebuffersEXT(1, byref(framebuffer))
+    glBindFramebufferEXT(GL_FRAMEBUFFER_EXT, framebuffer)
+    glFramebufferTexture2DEXT(
+            GL_FRAMEBUFFER_EXT, GL_COLOR_ATTACHMENT0_EXT,
+            texture.target, texture.id, 0)
+
+    glPushAttrib(GL_VIEWPORT_BIT | GL_COLOR_BUFFER_BIT)
+    glViewport(0, 0, width, height)
+    glMatrixMode(GL_PROJECTION)
+    glPushMatrix()
+    glLoadIdentity()
+    glOrtho(0, width, 0, height, -1, 1)
+    glMatrixMode(GL_MODELVIEW)
+    glPushMatrix()
+    glLoadIdentity()
+
+    glClearColor(0, 0, 0, 0)
+    glClear(GL_COLOR_BUFFER_BIT)
+    layout.draw()
+
+    glMatrixMode(GL_PROJECTION)
+    glPopMatrix()
+    glMatrixMode(GL_MODELVIEW)
+    glPopMatrix()
+    glPopAttrib()
+
+    glBindFramebufferEXT(GL_FRAMEBUFFER_EXT, 0)
+    glDeleteFramebuffersEXT(1, byref(framebuffer))
+    layout.delete()
 
+    # Blending white text onto a transparent background leaves the coverage 
+    # in the color channels, but not in the alpha channel (which ends up 
+    # squared).  So build the final image from the red channel.
+    pixels = texture.get_image_data().get_data('RGBA', width * 4)
+    raster = bytearray(b'\xff' * len(pixels))
+    raster[3::4] = pixels[0::4]
 
+    return pyglet.image.ImageData(width, height, 'RGBA', bytes(raster))
 
+_fonts = weakref.WeakKeyDictionary()
+_font_metrics = weakref.WeakKeyDictionary()
+_font_file_hashes = {}
+_text_rasters = collections.OrderedDict()
+_max_text_rasters = 256
+_text_raster_dir = None
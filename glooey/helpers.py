@@ -6,6 +6,7 @@ General-purpose utilities used throughout the project.
 
 import functools
 import contextlib
+import collections
 
 class UsageError (Exception):
     pass
@@ -73,6 +74,40 @@ class HoldUpdatesMixin:
         from more_itertools import unique_everseen as unique
         yield from reversed(list(unique(reversed(self._pending_updates))))
 
+
+class Multiset:
+    """
+    Count how many times each value has been added, so that the largest value 
+    can be kept up-to-date as values are added and removed.
+    """
+
+    def __init__(self, values=()):
+        self._counts = dict(collections.Counter(values))
+        self._max = None
+
+    def __len__(self):
+        return len(self._counts)
+
+    def add(self, value):
+        self._counts[value] = self._counts.get(value, 0) + 1
+        if self._max is not None and value > self._max:
+            self._max = value
+
+    def remove(self, value):
+        self._counts[value] -= 1
+        if not self._counts[value]:
+            del self._counts[value]
+            # Only look for a new maximum when it's next needed, because a 
+            # value is often removed right before a new one is added.
+            if value == self._max:
+                self._max = None
+
+    def get_max(self):
+        if self._max is None and self._counts:
+            self._max = max(self._counts)
+        return self._max
+
+
 def update_function(method):
 
     @functools.wraps(method)
@@ -22,9 +22,12 @@ class Image(Widget):
         if responsive:
             self.custom_alignment = 'fill'
         super().__init__()
-        self._image = image or self.custom_image
+        self._image = None
         self._responsive = responsive
         self._sprite = None
+        self._sprite_image = None
+        self._managed_texture = None
+        self.set_image(image or self.custom_image)
 
     def do_claim(self):
         if self.image is not None and not self._responsive:
@@ -38,39 +41,69 @@ class Image(Widget):
             self._sprite.group = self.group
 
     def do_draw(self):
-        if self.image is None:
+        image = _get_current_image(self._image)
+
+        if image is None:
             self.do_undraw()
             return
 
-        if self._sprite is None:
-            self._sprite = pyglet.sprite.Sprite(
-                    self.image, batch=self.batch, group=self.group)
-        else:
-            self._sprite.image = self.image
-
-        self._sprite.x = self.rect.left
-        self._sprite.y = self.rect.bottom
+        x, y = self.rect.left, self.rect.bottom
+        scale = 1
 
         if self._responsive:
-            scale_x = self.rect.width / self.image.width
-            scale_y = self.rect.height / self.image.height
+            scale_x = self.rect.width / image.width
+            scale_y = self.rect.height / image.height
             scale = min(scale_x, scale_y)
-            self._sprite.scale = scale
 
-            self._sprite.x += (self.rect.width - self._sprite.width) / 2
-            self._sprite.y += (self.rect.height - self._sprite.height) / 2
+            x += (self.rect.width - int(image.width * scale)) / 2
+            y += (self.rect.height - int(image.height * scale)) / 2
+
+        # Managed images only keep their textures in memory while they're 
+        # being drawn, and may be drawn from a smaller copy if they're being 
+        # scaled down a lot.
+        texture, factor = self._acquire_texture(image, scale)
+
+        # Only give the sprite a new image if the image actually changed, 
+        # because pyglet recalculates the texture coordinates and the vertices 
+        # every time the image is set.  Note that we can't just compare against 
+        # `sprite.image`, because that's the texture, not the original image.
+        if self._sprite is None:
+            self._sprite = pyglet.sprite.Sprite(
+                    texture, batch=self.batch, group=self.group)
+            self._sprite_image = texture
+
+        elif self._sprite_image is not texture:
+            self._sprite.image = texture
+            self._sprite_image = texture
+
+        # Setting `x`, `y`, and `scale` one at a time would rewrite the vertices 
+        # three times, so update them all at once (and only if necessary).
+        scale *= factor
+        if self._sprite.position != (x, y) or self._sprite.scale != scale:
+            self._sprite.update(x=x, y=y, scale=scale)
 
     def do_undraw(self):
         if self._sprite is not None:
             self._sprite.delete()
             self._sprite = None
+            self._sprite_image = None
+
+        self._release_texture()
 
     def get_image(self):
         return self._image
 
     def set_image(self, new_image):
         if self._image is not new_image:
+            if isinstance(self._image, drawing.PendingImage):
+                self._image.remove_callback(self._on_image_ready)
+
             self._image = new_image
+
+            if isinstance(new_image, drawing.PendingImage) \
+                    and not new_image.is_ready:
+                new_image.add_callback(self._on_image_ready)
+
             self._repack()
 
     def del_image(self):
@@ -86,6 +119,32 @@ class Image(Widget):
     def is_empty(self):
         return self._image is None
 
+    def _acquire_texture(self, image, scale):
+        if not isinstance(image, drawing.ManagedImage):
+            self._release_texture()
+            return image, 1
+
+        factor = image.get_downscale_factor(scale)
+
+        if self._managed_texture != (image, factor):
+            self._release_texture()
+            image.acquire(factor)
+            self._managed_texture = image, factor
+
+        return image.get_texture(factor), factor
+
+    def _release_texture(self):
+        if self._managed_texture is not None:
+            image, factor = self._managed_texture
+            self._managed_texture = None
+            image.release(factor)
+
+    def _on_image_ready(self, pending_image):
+        # If the image is the same size as the placeholder (or the size hint), 
+        # this will just redraw the widget without repacking its parent.
+        if pending_image is self._image:
+            self._repack()
+
 
 @autoprop
 class Background(Widget):
@@ -106,7 +165,9 @@ class Background(Widget):
 
     def __init__(self, **kwargs):
         super().__init__()
-        self._artist = drawing.Background(
+        self._pending_images = []
+        self._appearance = {}
+        self._artist = drawing.Background(**self._watch_pending_images(
                 color=kwargs.get('color', self.custom_color),
                 outline=kwargs.get('outline', self.custom_outline),
                 image=kwargs.get('image', self.custom_image),
@@ -121,8 +182,7 @@ class Background(Widget):
                 bottom_right=kwargs.get('bottom_right', self.custom_bottom_right),
                 vtile=kwargs.get('vtile', self.custom_vtile),
                 htile=kwargs.get('htile', self.custom_htile),
-                hidden=True,
-        )
+        ), hidden=True)
 
     def do_attach(self):
         self._artist.batch = self.batch
@@ -147,16 +207,17 @@ class Background(Widget):
 
     def set_color(self, new_color):
         self._artist.color = new_color
+        self._appearance['color'] = new_color
 
     def get_outline(self):
         return self._artist.outline
 
     def set_outline(self, new_outline):
         self._artist.outline = new_outline
+        self._appearance['outline'] = new_outline
 
     def set_image(self, image):
-        self._artist.set_image(image)
-        self._repack()
+        self.set_appearance(image=image)
 
     def get_appearance(self):
         return self._artist.appearance
@@ -165,7 +226,7 @@ class Background(Widget):
             bottom=None, left=None, right=None, top_left=None, top_right=None,
             bottom_left=None, bottom_right=None, vtile='auto', htile='auto'):
 
-        self._artist.set_appearance(
+        self._artist.set_appearance(**self._watch_pending_images(
                 color=color,
                 image=image,
                 center=center,
@@ -179,11 +240,40 @@ class Background(Widget):
                 bottom_right=bottom_right,
                 vtile=vtile,
                 htile=htile,
-        )
+        ))
         self._repack()
 
     @property
     def is_empty(self):
         return self._artist.is_empty
 
+    def _watch_pending_images(self, **appearance):
+        # Remember the appearance as it was requested, so it can be reapplied 
+        # once any images that are still being decoded are ready, and use their 
+        # placeholders in the meantime.  The setters for the other attributes 
+        # keep this up-to-date, so reapplying it doesn't undo them.
+        for pending_image in self._pending_images:
+            pending_image.remove_callback(self._on_image_ready)
+
+        self._pending_images = [
+                x for x in appearance.values()
+                if isinstance(x, drawing.PendingImage) and not x.is_ready
+        ]
+        self._appearance = appearance
+
+        for pending_image in self._pending_images:
+            pending_image.add_callback(self._on_image_ready)
+
+        return {k: _get_current_image(v) for k, v in appearance.items()}
+
+    def _on_image_ready(self, pending_image):
+        self._artist.set_appearance(
+                **self._watch_pending_images(**self._appearance))
+        self._repack()
+
 
+def _get_current_image(image):
+    if isinstance(image, drawing.PendingImage):
+        return image.current
+    else:
+        return image
@@ -6,6 +6,8 @@ too big to fit on the screen.
 """
 
 import math
+import bisect
+import itertools
 import pyglet
 import vecrec
 import autoprop
@@ -17,11 +19,13 @@ from glooey.containers import Bin, Frame, Grid, HVBox, HBox, VBox
 from glooey.buttons import Button
 from glooey.images import Image
 from glooey.misc import Spacer
+from glooey.text import Label
 from glooey.helpers import *
 
 @autoprop
 @register_event_type('on_translate')
 class Mover(Bin):
+    custom_cull_margin = 100
 
     class TranslateGroup(pyglet.graphics.Group):
 
@@ -49,6 +53,14 @@ class Mover(Bin):
         self._expand_horz = True
         self._expand_vert = True
 
+        # ``clip_rect`` is the part of the screen where the mover can actually 
+        # be seen, e.g. the scissor box of a scroll pane.  If it's set, any 
+        # widgets that are translated outside of it (plus a margin) aren't 
+        # drawn, so scrolling costs depend on how much is visible rather than 
+        # on how much content there is.
+        self._clip_rect = None
+        self._cull_margin = self.custom_cull_margin
+
     @vecrec.accept_anything_as_vector
     def pan(self, step):
         self.jump(self.position + step)
@@ -63,6 +75,7 @@ class Mover(Bin):
         self._require_rects()
         self._child_position = new_position - self.child.padded_rect.bottom_left
         self._keep_child_in_rect()
+        self._update_culling()
         self.dispatch_event('on_translate', self)
 
     @vecrec.accept_anything_as_vector
@@ -98,6 +111,7 @@ class Mover(Bin):
         child_rect = Rect.from_size(child_width, child_height)
         self.child._resize(child_rect)
         self._keep_child_in_rect()
+        self._update_culling()
 
     def do_regroup_children(self):
         self._translate_group = self.TranslateGroup(self, self.group)
@@ -154,6 +168,34 @@ class Mover(Bin):
 
         return percent
 
+    def get_clip_rect(self):
+        return self._clip_rect
+
+    def set_clip_rect(self, new_rect):
+        self._clip_rect = new_rect.copy() if new_rect is not None else None
+        self._cull_child()
+
+    def get_cull_margin(self):
+        return self._cull_margin
+
+    def set_cull_margin(self, new_margin):
+        self._cull_margin = new_margin
+        self._update_culling()
+
+    def get_visible_rect(self):
+        """
+        Return the part of the child that is visible (plus the cull margin) in 
+        child coordinates, or None if the mover hasn't been told where it's 
+        clipped.
+        """
+        if self._clip_rect is None or self.rect is None:
+            return None
+
+        visible_rect = self._clip_rect.copy()
+        visible_rect.bottom_left = self.screen_to_child_coords(
+                visible_rect.bottom_left)
+        return visible_rect.grow(self._cull_margin)
+
     def get_unoccupied_size(self):
         return self.rect.size - self.child.padded_rect.size
 
@@ -215,6 +257,23 @@ class Mover(Bin):
                 self.rect.height - self.child.padded_rect.top,
         )
 
+    def _update_culling(self):
+        if self._clip_rect is not None:
+            self._cull_child()
+
+    def _cull_children(self, parent_visible_rect):
+        # The rect from our parent is in the wrong coordinates for our child, 
+        # and we know better than our parent which part of the child can be 
+        # seen anyway, so ignore it and cull using our own clip rect.
+        self._cull_child()
+
+    def _cull_child(self):
+        if self.child is not None:
+            self.child._cull(self.visible_rect)
+
+    def _find_visible_rect(self):
+        return self.visible_rect
+
     def _require_rects(self):
         if self.child is None:
             raise UsageError("can't pan/jump until the mover has a child widget.")
@@ -341,7 +400,11 @@ class ScrollPane(Widget):
 
         mover_rect.center = self.rect.center
 
+        # Don't use the `clip_rect` property here, because it would cull the 
+        # mover's child right away, and resizing the mover does that anyway.
+        self._mover._clip_rect = self.rect.copy()
         self._mover._resize(mover_rect)
+        self.dispatch_event('on_resize_children', self)
 
     def do_regroup_children(self):
         self._scissor_group = drawing.ScissorGroup(self.rect, self.group)
@@ -675,6 +738,780 @@ class ScrollBox(Widget):
     def set_mouse_sensitivity(self, new_sensitivity):
         self._mouse_sensitivity = new_sensitivity
 
+@autoprop
+class ListView(ScrollBox):
+    """
+    Display a long list of items, only making widgets for the rows that can be 
+    seen.
+
+    The items can be any sequence.  Rows are made by calling ``row_factory`` 
+    (by default the ``Row`` inner class), and each time a row is scrolled out 
+    of view it is recycled by binding it to an item that is being scrolled into 
+    view.  Reimplement `do_bind_row()` to control how items are displayed; the 
+    default just sets the row's text.  If the items are changed in place, call 
+    `refresh()` to rebind the visible rows.
+
+    Every row gets the same amount of space.  If ``row_height`` is None, it is 
+    estimated from the tallest row that has been displayed so far.  Either way, 
+    the scroll bars are sized as if every row was really there.
+    """
+    Row = Label
+
+    custom_row_height = None
+    """\
+    The height of every row, or None to estimate it from the rows that have 
+    been displayed.
+    """
+
+    custom_buffer_rows = 2
+    """\
+    How many rows to keep bound above and below the visible ones, so that small 
+    scrolls don't need to rebind anything.
+    """
+
+    @autoprop
+    class Content(Widget):
+
+        def __init__(self, row_factory, bind_row):
+            super().__init__()
+            self._row_factory = row_factory
+            self._bind_row = bind_row
+            self._rows = {}
+            self._spare_rows = []
+            self._num_rows = 0
+            self._fixed_row_height = None
+            self._estimated_row_height = 0
+            self._row_width = 0
+            self._is_repacking = False
+
+        def do_claim(self):
+            # Only a few rows exist at any time, so remember the biggest rows 
+            # that have been seen.  Otherwise the content would change size as 
+            # it was scrolled.
+            for row in self._rows.values():
+                self._row_width = max(self._row_width, row.claimed_width)
+                self._estimated_row_height = max(
+                        self._estimated_row_height, row.claimed_height)
+
+            return self._row_width, self._num_rows * self.row_height
+
+        def do_resize_children(self):
+            for i, row in self._rows.items():
+                row._resize(self.get_row_rect(i))
+
+        @update_function
+        def _repack(self):
+            self._is_repacking = True
+            try:
+                super()._repack()
+            finally:
+                self._is_repacking = False
+
+        def do_find_children_near_mouse(self, x, y):
+            if self.row_height:
+                row = self._rows.get(int((self.rect.top - y) // self.row_height))
+                if row is not None:
+                    yield row
+
+        def show_rows(self, first, last, items):
+            with self.hold_updates():
+
+                # Recycle the rows that are no longer in the window.
+                for i in list(self._rows):
+                    if not first <= i < last:
+                        self._spare_rows.append(self._rows.pop(i))
+
+                for i in range(first, last):
+                    if i in self._rows:
+                        continue
+
+                    if self._spare_rows:
+                        row = self._spare_rows.pop()
+                        row.unhide(draw=False)
+                    else:
+                        row = self._attach_child(self._row_factory())
+                        self._repack_and_regroup_children()
+
+                    self._bind_row(row, items[i])
+                    self._rows[i] = row
+                    self._move_row(i, row)
+
+                for row in self._spare_rows:
+                    if row.is_visible:
+                        row.hide()
+
+        def rebind_rows(self, items):
+            with self.hold_updates():
+                for i, row in self._rows.items():
+                    self._bind_row(row, items[i])
+
+        def get_row(self, index):
+            return self._rows.get(index)
+
+        def _move_row(self, index, row):
+            # Rows that still fit in their slot can be moved without repacking 
+            # the whole list, which would make every row claim space again.  
+            # Rows that need more space have already asked for a repack.
+            if self.rect is None or self.row_height == 0:
+                return
+
+            rect = self.get_row_rect(index)
+            if row.claimed_width <= rect.width and \
+                    row.claimed_height <= rect.height:
+                row._resize(rect)
+
+        def _cull_children(self, visible_rect):
+            # There are only widgets for the rows near the view, so there's no 
+            # need for the mover to cull any of them.
+            super()._cull_children(None)
+
+        def _find_visible_rect(self):
+            return None
+
+        def get_is_repacking(self):
+            return self._is_repacking
+
+        def get_row_rect(self, index):
+            rect = Rect.from_size(self.rect.width, self.row_height)
+            rect.top_left = self.rect.left, self.rect.top - index * self.row_height
+            return rect
+
+        def get_num_rows(self):
+            return self._num_rows
+
+        def set_num_rows(self, new_num):
+            self._num_rows = new_num
+            self._repack()
+
+        def get_row_height(self):
+            if self._fixed_row_height is not None:
+                return self._fixed_row_height
+            return self._estimated_row_height
+
+        def set_row_height(self, new_height):
+            self._fixed_row_height = new_height
+            self._repack()
+
+
+    def __init__(self, items=None, row_factory=None):
+        super().__init__()
+
+        self._items = items if items is not None else []
+        self._window = None
+        self._buffer_rows = self.custom_buffer_rows
+
+        self._content = self.Content(
+                row_factory or self.Row, self.do_bind_row)
+        self._content.row_height = self.custom_row_height
+        self._content.num_rows = len(self._items)
+
+        self._pane.vert_scrolling = True
+        self._pane.push_handlers(
+                on_scroll=self.on_pane_scroll,
+                on_resize_children=self.on_pane_resize_children,
+        )
+        self._content.push_handlers(on_repack=self.on_content_repack)
+        self._pane.add(self._content)
+
+    def do_bind_row(self, row, item):
+        """
+        Make the given row widget display the given item.
+
+        The row may have been displaying a different item before, so this 
+        method should update everything about it that depends on the item.
+        """
+        row.text = str(item)
+
+    def on_pane_scroll(self, pane):
+        self._update_rows()
+
+    def on_pane_resize_children(self, pane):
+        # The content's claim can't change until it's done repacking, so 
+        # wait for `on_repack` before showing any new rows.
+        if not self._content.is_repacking:
+            self._update_rows()
+
+    def on_content_repack(self):
+        self._update_rows()
+
+    def refresh(self):
+        """
+        Rebind the visible rows, e.g. after the items were changed in place.
+        """
+        self._window = None
+        self._content.num_rows = len(self._items)
+        self._content.rebind_rows(self._items)
+        self._update_rows()
+
+    def get_items(self):
+        return self._items
+
+    def set_items(self, new_items):
+        self._items = new_items
+        self.refresh()
+
+    def get_row(self, index):
+        """
+        Return the widget displaying the given item, or None if that item 
+        isn't close enough to the view to have a widget.
+        """
+        return self._content.get_row(index)
+
+    def get_row_height(self):
+        return self._content.row_height
+
+    def set_row_height(self, new_height):
+        self._content.row_height = new_height
+
+    def get_buffer_rows(self):
+        return self._buffer_rows
+
+    def set_buffer_rows(self, new_num):
+        self._buffer_rows = new_num
+        self._update_rows()
+
+    def _update_rows(self):
+        content = self._content
+        if content.rect is None or self._pane.rect is None:
+            return
+
+        num_rows = len(self._items)
+        row_height = content.row_height
+
+        # If the row height is being estimated and no rows have been shown yet, 
+        # show just the first one.  The content will be repacked once that row 
+        # claims its height, and then the rest of the rows can be shown.
+        if row_height:
+            view = self._pane.view
+            first = int((content.rect.top - view.top) // row_height)
+            last = math.ceil((content.rect.top - view.bottom) / row_height)
+            first = clamp(first - self._buffer_rows, 0, num_rows)
+            last = clamp(last + self._buffer_rows, first, num_rows)
+        else:
+            first, last = 0, min(1, num_rows)
+
+        if (first, last) != self._window:
+            self._window = first, last
+            content.show_rows(first, last, self._items)
+
+@autoprop
+class TableView(Widget):
+    """
+    Display a large table of items, only making widgets for the cells that can 
+    be seen.
+
+    The data can be any sequence of rows, where each row is a sequence of 
+    items.  The first ``num_header_rows`` rows and ``num_header_cols`` columns 
+    are frozen: the header rows only scroll horizontally and the header columns 
+    only scroll vertically, so they stay in view.  Cells are made from the 
+    ``HeaderCell`` and ``Cell`` inner classes (or ``cell_factory``) and are 
+    recycled as they scroll out of view, see `ListView` for details.  
+    Reimplement `do_bind_cell()` to control how items are displayed.
+
+    Every row has the same height, but each column can have its own width.  
+    Columns that haven't been given a width with `set_col_width()` use the 
+    default column width.  If the row height or the default column width is 
+    None, it is estimated from the biggest cells that have been displayed so 
+    far, separately for each column in the case of the width.  Columns that 
+    haven't displayed any cells yet are assumed to be as wide as the widest 
+    estimate.
+    """
+    Pane = ScrollPane
+    HBar = None
+    VBar = None
+    Corner = None
+    Cell = Label
+    HeaderCell = Label
+
+    custom_row_height = None
+    custom_default_col_width = None
+    custom_col_widths = {}
+    custom_num_header_rows = 0
+    custom_num_header_cols = 0
+    custom_buffer_cells = 1
+    custom_mouse_sensitivity = 15 # px/click
+
+    @autoprop
+    class Cells(Widget):
+        """
+        Claim space for a block of the table, but only hold widgets for the 
+        cells near the view.
+        """
+
+        def __init__(self, table, rows, cols, cell_factory):
+            super().__init__()
+            self._table = table
+            self._rows = rows
+            self._cols = cols
+            self._cell_factory = cell_factory
+            self._cells = {}
+            self._spare_cells = []
+            self._window = None
+            self._row_height = 0
+            self._col_widths = ()
+            self._col_lefts = [0]
+
+        def do_claim(self):
+            for (i, j), cell in self._cells.items():
+                self._table._fit_cell(j, cell)
+
+            # Remember the layout the claim was based on, so the cells are 
+            # placed consistently with the claim even if the estimated sizes 
+            # change before the block is repacked.
+            self._row_height, self._col_widths = self._get_layout()
+            self._col_lefts = [0, *itertools.accumulate(self._col_widths)]
+            return self._col_lefts[-1], len(self._rows) * self._row_height
+
+        def do_resize_children(self):
+            for (i, j), cell in self._cells.items():
+                self._move_cell(i, j, cell)
+
+        def do_find_children_near_mouse(self, x, y):
+            if self._row_height and self._col_lefts[-1]:
+                i = self._rows.start + int((self.rect.top - y) // self._row_height)
+                j = self._cols.start + bisect.bisect(
+                        self._col_lefts, x - self.rect.left) - 1
+                cell = self._cells.get((i, j))
+                if cell is not None:
+                    yield cell
+
+        def show_cells(self, view):
+            """
+            Make sure there are cells for the part of the block that's in the 
+            given view, or for every part of it if the view is None.
+            """
+            if self.rect is None:
+                return
+
+            rows, cols = self._rows, self._cols
+            row_height = self._row_height
+            col_lefts = self._col_lefts
+            buffer = self._table.buffer_cells
+
+            # If the cells don't have a size yet (e.g. none have been measured), 
+            # show just the first one.  Binding it measures it, and then the 
+            # rest can be shown once the block is repacked.
+            if not row_height or not col_lefts[-1]:
+                rows, cols = rows[:1], cols[:1]
+
+            elif view is not None:
+                top = int((self.rect.top - view.top) // row_height)
+                bottom = math.ceil((self.rect.top - view.bottom) / row_height)
+                left = bisect.bisect(col_lefts, view.left - self.rect.left) - 1
+                right = bisect.bisect_left(
+                        col_lefts, view.right - self.rect.left)
+
+                rows = rows[max(top - buffer, 0):max(bottom + buffer, 0)]
+                cols = cols[max(left - buffer, 0):max(right + buffer, 0)]
+
+            if (rows, cols) == self._window:
+                return
+
+            self._window = rows, cols
+
+            with self.hold_updates():
+
+                # Recycle the cells that are no longer in the window.
+                for i, j in list(self._cells):
+                    if i not in rows or j not in cols:
+                        self._spare_cells.append(self._cells.pop((i, j)))
+
+                for i in rows:
+                    for j in cols:
+                        if (i, j) in self._cells:
+                            continue
+
+                        if self._spare_cells:
+                            cell = self._spare_cells.pop()
+                            cell.unhide(draw=False)
+                        else:
+                            cell = self._attach_child(self._cell_factory())
+                            self._repack_and_regroup_children()
+
+                        self._fit_cell_size(j, cell)
+                        self._table.do_bind_cell(
+                                cell, self._table.data[i][j])
+                        self._cells[i, j] = cell
+                        self._move_cell(i, j, cell)
+
+                for cell in self._spare_cells:
+                    if cell.is_visible:
+                        cell.hide()
+
+        def rebind_cells(self):
+            self._window = None
+            with self.hold_updates():
+                for (i, j), cell in self._cells.items():
+                    self._table.do_bind_cell(cell, self._table.data[i][j])
+
+        def get_cell(self, row, col):
+            return self._cells.get((row, col))
+
+        def get_cell_rect(self, row, col):
+            j = col - self._cols.start
+            rect = Rect.from_size(self._col_widths[j], self._row_height)
+            rect.top_left = (
+                    self.rect.left + self._col_lefts[j],
+                    self.rect.top - (row - self._rows.start) * rect.height,
+            )
+            return rect
+
+        def get_rows(self):
+            return self._rows
+
+        def get_cols(self):
+            return self._cols
+
+        def set_rows_cols(self, rows, cols):
+            with self.hold_updates():
+                for i, j in list(self._cells):
+                    if i not in rows or j not in cols:
+                        cell = self._cells.pop((i, j))
+                        cell.hide()
+                        self._spare_cells.append(cell)
+
+                self._rows = rows
+                self._cols = cols
+                self._window = None
+                self._repack()
+
+        def get_is_layout_stale(self):
+            return self._get_layout() != (self._row_height, self._col_widths)
+
+        def _get_layout(self):
+            return self._table.row_height, \
+                   tuple(self._table._get_col_widths(self._cols))
+
+        def _move_cell(self, row, col, cell):
+            # See `ListView.Content._move_row()`.  Cells that are shown before 
+            # the block has claimed space for them are moved when it's repacked.
+            j = col - self._cols.start
+            if not self._row_height or j >= len(self._col_widths) \
+                    or not self._col_widths[j]:
+                return
+
+            rect = self.get_cell_rect(row, col)
+
+            if cell.claimed_width <= rect.width and \
+                    cell.claimed_height <= rect.height:
+                cell._resize(rect)
+
+        def _fit_cell_size(self, col, cell):
+            # Ask for the whole cell, so that binding a new item won't change 
+            # the cell's claim (and repack every other cell in the block) 
+            # unless the item doesn't fit.  Columns without a width of their 
+            # own yet are left alone, so they can be measured.
+            cell_size = self._table._find_col_width(col) or 0, \
+                        self._table.row_height
+            if cell.size_hint != cell_size:
+                cell.size_hint = cell_size
+
+        def _cull_children(self, visible_rect):
+            # See `ListView.Content._cull_children()`.
+            super()._cull_children(None)
+
+        def _find_visible_rect(self):
+            return None
+
+
+    def __init__(self, data=None, cell_factory=None):
+        super().__init__()
+
+        self._data = data if data is not None else []
+        self._fixed_row_height = self.custom_row_height
+        self._fixed_col_widths = dict(self.custom_col_widths)
+        self._default_col_width = self.custom_default_col_width
+        self._estimated_row_height = 0
+        self._estimated_col_widths = {}
+        self._buffer_cells = self.custom_buffer_cells
+        self._mouse_sensitivity = self.custom_mouse_sensitivity
+        self._is_updating_cells = False
+
+        # The table is laid out in a 3x3 grid.  The corner, the header rows, 
+        # the header columns, and the body are in the top-left 2x2 cells, and 
+        # the scroll bars are in the last row and column.
+        self._grid = Grid(3, 3)
+        self._grid.set_row_height(0, 0)
+        self._grid.set_row_height(2, 0)
+        self._grid.set_col_width(0, 0)
+        self._grid.set_col_width(2, 0)
+        self._attach_child(self._grid)
+
+        rows, cols = self._get_header_and_body_ranges()
+        header_factory = self.HeaderCell
+        body_factory = cell_factory or self.Cell
+
+        self._corner_cells = self.Cells(
+                self, rows[0], cols[0], header_factory)
+        self._col_header_cells = self.Cells(
+                self, rows[0], cols[1], header_factory)
+        self._row_header_cells = self.Cells(
+                self, rows[1], cols[0], header_factory)
+        self._body_cells = self.Cells(
+                self, rows[1], cols[1], body_factory)
+
+        self._col_header_pane = self.Pane()
+        self._col_header_pane.horz_scrolling = True
+        self._row_header_pane = self.Pane()
+        self._row_header_pane.vert_scrolling = True
+        self._body_pane = self.Pane()
+        self._body_pane.horz_scrolling = True
+        self._body_pane.vert_scrolling = True
+
+        self._grid.add(0, 0, self._corner_cells)
+        self._grid.add(0, 1, self._col_header_pane)
+        self._grid.add(1, 0, self._row_header_pane)
+        self._grid.add(1, 1, self._body_pane)
+
+        for pane, cells in self._get_panes_and_cells():
+            pane.push_handlers(on_scroll=self.on_pane_scroll)
+            pane.add(cells)
+
+        for cells in self._get_cells():
+            cells.push_handlers(on_repack=self.on_cells_repack)
+
+        self._hbar = None
+        self._vbar = None
+        self._corner = None
+
+        if self.HBar is not None:
+            self._hbar = self.HBar(self._body_pane)
+            self._grid.add(2, 1, self._hbar)
+
+        if self.VBar is not None:
+            self._vbar = self.VBar(self._body_pane)
+            self._grid.add(1, 2, self._vbar)
+
+        if self.Corner is not None:
+            self._corner = self.Corner()
+            self._grid.add(2, 2, self._corner)
+
+    def do_resize_children(self):
+        super().do_resize_children()
+
+        # Wait until the whole table has been laid out before showing any new 
+        # cells, because they might change the size of the headers.
+        self._sync_header_panes()
+        self._update_cells()
+
+    def do_bind_cell(self, cell, item):
+        """
+        Make the given cell widget display the given item.
+
+        The cell may have been displaying a different item before, so this 
+        method should update everything about it that depends on the item.
+        """
+        cell.text = str(item)
+
+    def on_mouse_scroll(self, x, y, scroll_x, scroll_y):
+        self._body_pane.scroll(
+                self.mouse_sensitivity * Vector(scroll_x, scroll_y))
+
+    def on_pane_scroll(self, pane):
+        if pane is self._body_pane:
+            self._sync_header_panes()
+        self._update_cells()
+
+    def on_cells_repack(self):
+        self._update_cells()
+
+    def refresh(self):
+        """
+        Rebind the visible cells, e.g. after the data was changed in place.
+        """
+        rows, cols = self._get_header_and_body_ranges()
+        blocks = zip(self._get_cells(), [
+            (rows[0], cols[0]), (rows[0], cols[1]),
+            (rows[1], cols[0]), (rows[1], cols[1]),
+        ])
+
+        for cells, (block_rows, block_cols) in blocks:
+            cells.set_rows_cols(block_rows, block_cols)
+            cells.rebind_cells()
+
+        self._update_cells()
+
+    def get_data(self):
+        return self._data
+
+    def set_data(self, new_data):
+        self._data = new_data
+        self.refresh()
+
+    def get_cell(self, row, col):
+        """
+        Return the widget displaying the given item, or None if that item isn't 
+        close enough to the view to have a widget.
+        """
+        for cells in self._get_cells():
+            if row in cells.rows and col in cells.cols:
+                return cells.get_cell(row, col)
+
+    def get_num_rows(self):
+        return len(self._data)
+
+    def get_num_cols(self):
+        return len(self._data[0]) if len(self._data) else 0
+
+    def get_num_header_rows(self):
+        return self.custom_num_header_rows
+
+    def get_num_header_cols(self):
+        return self.custom_num_header_cols
+
+    def get_row_height(self):
+        if self._fixed_row_height is not None:
+            return self._fixed_row_height
+        return self._estimated_row_height
+
+    def set_row_height(self, new_height):
+        self._fixed_row_height = new_height
+        self._repack_cells()
+
+    def get_col_width(self, col):
+        """
+        Return the width of the given column.
+        """
+        width = self._find_col_width(col)
+        return width if width is not None else self.default_col_width
+
+    def set_col_width(self, col, new_width):
+        """
+        Set the width of the given column, or estimate it from the cells that 
+        have been displayed in that column if the width is None.
+        """
+        self._fixed_col_widths[col] = new_width
+        self._repack_cells()
+
+    def del_col_width(self, col):
+        """
+        Unset the width of the given column.  The default width will be used 
+        for that column instead.
+        """
+        self._fixed_col_widths.pop(col, None)
+        self._repack_cells()
+
+    def get_default_col_width(self):
+        """
+        Return the width of columns that haven't been given a width of their 
+        own.  If the default width is None, this is the widest width that has 
+        been estimated for any column.
+        """
+        if self._default_col_width is not None:
+            return self._default_col_width
+        return max(self._estimated_col_widths.values(), default=0)
+
+    def set_default_col_width(self, new_width):
+        self._default_col_width = new_width
+        self._repack_cells()
+
+    def get_buffer_cells(self):
+        return self._buffer_cells
+
+    def set_buffer_cells(self, new_num):
+        self._buffer_cells = new_num
+        self._update_cells()
+
+    def get_mouse_sensitivity(self):
+        return self._mouse_sensitivity
+
+    def set_mouse_sensitivity(self, new_sensitivity):
+        self._mouse_sensitivity = new_sensitivity
+
+    def _get_cells(self):
+        return [
+                self._corner_cells,
+                self._col_header_cells,
+                self._row_header_cells,
+                self._body_cells,
+        ]
+
+    def _get_panes_and_cells(self):
+        return [
+                (self._col_header_pane, self._col_header_cells),
+                (self._row_header_pane, self._row_header_cells),
+                (self._body_pane, self._body_cells),
+        ]
+
+    def _get_header_and_body_ranges(self):
+        num_header_rows = min(self.num_header_rows, self.num_rows)
+        num_header_cols = min(self.num_header_cols, self.num_cols)
+        rows = range(num_header_rows), range(num_header_rows, self.num_rows)
+        cols = range(num_header_cols), range(num_header_cols, self.num_cols)
+        return rows, cols
+
+    def _find_col_width(self, col):
+        # Return None if the column doesn't have a width yet.
+        width = self._fixed_col_widths.get(col)
+        if width is None:
+            width = self._default_col_width
+        if width is None:
+            width = self._estimated_col_widths.get(col)
+        return width
+
+    def _get_col_widths(self, cols):
+        default = self.default_col_width
+        widths = (self._find_col_width(j) for j in cols)
+        return [default if x is None else x for x in widths]
+
+    def _fit_cell(self, col, cell):
+        self._estimated_row_height = max(
+                self._estimated_row_height, cell.claimed_height)
+
+        # Cells in columns with a fixed width are stretched to fill them, so 
+        # they don't say anything about how wide the other columns should be.
+        if self._fixed_col_widths.get(col) is None:
+            self._estimated_col_widths[col] = max(
+                    self._estimated_col_widths.get(col, 0), cell.claimed_width)
+
+    def _repack_cells(self):
+        for cells in self._get_cells():
+            cells._repack()
+
+    def _show_cells(self):
+        self._corner_cells.show_cells(None)
+
+        for pane, cells in self._get_panes_and_cells():
+            if pane.rect is not None:
+                cells.show_cells(pane.view)
+
+    def _sync_header_panes(self):
+        # Make the header rows scroll horizontally and the header columns 
+        # scroll vertically with the body.
+        panes = [pane for pane, cells in self._get_panes_and_cells()]
+        if any(pane.rect is None or pane.child.rect is None for pane in panes):
+            return
+
+        position = self._body_pane.position
+        self._col_header_pane.jump((position.x, 0))
+        self._row_header_pane.jump((0, position.y))
+
+    def _update_cells(self):
+        # Showing cells can repack the blocks of cells, which calls this method 
+        # again.  Let the outermost call do all the work.
+        if self._is_updating_cells:
+            return
+
+        self._is_updating_cells = True
+
+        try:
+            # Measure: show the cells that are in view given the current 
+            # layout.  Binding new cells updates the estimated sizes.
+            self._show_cells()
+
+            # Layout: repack the blocks whose rows or columns no longer match 
+            # the estimates, so they stay lined up with each other, then show 
+            # the cells that the new layout brought into view.  Any cells that 
+            # still don't fit are fixed the next time the view changes.
+            stale = [x for x in self._get_cells() if x.is_layout_stale]
+            if stale:
+                for cells in stale:
+                    cells._repack()
+                self._show_cells()
+
+        finally:
+            self._is_updating_cells = False
+
 @autoprop
 class Viewport(ScrollPane):
     custom_horz_scrolling = True
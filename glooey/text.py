@@ -29,12 +29,42 @@ class Label(Widget):
     custom_background_color = None
     custom_text_alignment = None
     custom_line_spacing = None
+    custom_bitmap_font = None
+    """\
+    A `drawing.BitmapFont` to draw the text with, instead of using pyglet's 
+    text layouts.  Bitmap fonts are much cheaper to lay out and draw, but they 
+    ignore the font name, size, bold, italic, underline, kerning, baseline, 
+    and background color styles.  Editable labels can't use bitmap fonts.
+    """
+    custom_rasterize = False
+    """\
+    If true, draw the text into a texture once and then display that texture 
+    as a single quad (see `drawing.get_text_raster()`).  This is meant for 
+    labels that don't change, like menu titles and button captions.  Such 
+    labels are cheaper to draw and, if a raster cache directory is set, to 
+    create, but they ignore the background color style.  Bitmap fonts take 
+    precedence over this setting.
+    """
+
+    custom_shared_layout = False
+    """\
+    If true, lay out the text with `drawing.SharedTextLayout`, so that labels 
+    with equal parent groups share the same OpenGL state.  This lets the 
+    glyphs of many labels (e.g. the captions of every button in a panel) be 
+    drawn with one set of state changes per font texture.
+    """
 
     def __init__(self, text=None, line_wrap=None, **style):
         super().__init__()
         self._layout = None
+        self._bitmap_font = self.custom_bitmap_font
+        self._bitmap_text = None
+        self._rasterize = self.custom_rasterize
+        self._raster = None
+        self._raster_sprite = None
         self._text = text or self.custom_text
         self._line_wrap_width = 0
+        self._is_editing_document = False
         self._style = {}
         self.set_style(
                 font_name=self.custom_font_name,
@@ -68,16 +98,54 @@ class Label(Widget):
 
         return repr.format(**args)
 
+    @classmethod
+    def prewarm_font(cls, chars=None, sizes=None):
+        """
+        Rasterize the given characters in the font used by this class of label, 
+        and return how many seconds that took.
+
+        The font is determined by the ``custom_font_name``, ``custom_bold``, 
+        and ``custom_italic`` attributes.  By default, only ``custom_font_size`` 
+        is prewarmed, but any number of other sizes can be given instead.  See 
+        `drawing.prewarm_font()` for more details.
+        """
+        if sizes is None:
+            sizes = [cls.custom_font_size]
+
+        return sum(
+                drawing.prewarm_font(
+                    cls.custom_font_name, size,
+                    cls.custom_bold, cls.custom_italic,
+                    chars=chars,
+                )
+                for size in sizes
+        )
+
     def do_claim(self):
         # Make sure the label's text and style are up-to-date before we request 
         # space.  Be careful!  This means that do_draw() can be called before 
-        # the widget has self.rect or self.group, which usually cannot happen.
-        self.do_draw(ignore_rect=True)
+        # the widget has self.rect or self.group, which usually cannot happen.  
+        # Bitmap fonts can measure text without laying it out, so they don't 
+        # need to do this, and rasterized labels only need their raster.
+        if self._bitmap_font is None:
+            if self._rasterize:
+                self._raster = drawing.get_text_raster(
+                        self._text, self._style, self._line_wrap_width)
+            else:
+                self.do_draw(ignore_rect=True)
 
         # Return the amount of space needed to render the label.
-        return self._layout.content_width, self._layout.content_height
+        return self._measure_text()
 
     def do_draw(self, ignore_rect=False):
+        if self._bitmap_font is not None:
+            self._draw_bitmap_text()
+            return
+
+        if self._rasterize:
+            self._draw_raster()
+            return
+
         # Any time we need to draw this widget, just delete the underlying 
         # label object and make a new one.  This isn't any slower than keeping 
         # the old object, because all the vertex lists would be redrawn either 
@@ -146,22 +214,42 @@ class Label(Widget):
     def do_undraw(self):
         if self._layout is not None:
             self._layout.delete()
+        if self._bitmap_text is not None:
+            self._bitmap_text.hide()
+            self._bitmap_text = None
+        if self._raster_sprite is not None:
+            self._raster_sprite.delete()
+            self._raster_sprite = None
 
     def do_make_new_layout(self, document, kwargs):
+        if self.custom_shared_layout:
+            return drawing.SharedTextLayout(document, **kwargs)
         return pyglet.text.layout.TextLayout(document, **kwargs)
 
     def on_insert_text(self, start, text):
-        self._text = self._layout.document.text
-        self.dispatch_event('on_edit_text', self)
+        if not self._is_editing_document:
+            self._text = self._layout.document.text
+            self.dispatch_event('on_edit_text', self)
 
     def on_delete_text(self, start, end):
-        self._text = self._layout.document.text
-        self.dispatch_event('on_edit_text', self)
+        if not self._is_editing_document:
+            self._text = self._layout.document.text
+            self.dispatch_event('on_edit_text', self)
 
     def get_text(self):
-        return self._layout.document.text
+        return self._text
 
     def set_text(self, text, width=None, **style):
+        # If only the text is changing and the label is already on the screen, 
+        # edit the document that's being displayed rather than making new 
+        # layouts.  This is much cheaper, e.g. for counters that change every 
+        # frame.  The label only has to be repacked if the new text needs a 
+        # different amount of space than the old text did.
+        if not style and width in (None, self._line_wrap_width) \
+                and self._is_text_drawn():
+            self._edit_text(text)
+            return
+
         self._text = text
         if width is not None:
             self._line_wrap_width = width
@@ -189,6 +277,14 @@ class Label(Widget):
     def del_font_size(self):
         return self.del_style('font_size')
 
+    def get_font(self):
+        return drawing.load_font(
+                self.font_name, self.font_size, self.bold, self.italic)
+
+    def get_font_metrics(self):
+        return drawing.get_font_metrics(
+                self.font_name, self.font_size, self.bold, self.italic)
+
     def get_bold(self):
         return self.get_style('bold')
 
@@ -270,6 +366,29 @@ class Label(Widget):
     def del_line_spacing(self):
         self.del_style('line_spacing')
 
+    def get_bitmap_font(self):
+        return self._bitmap_font
+
+    def set_bitmap_font(self, new_font):
+        if self._bitmap_font is not new_font:
+            self._undraw()
+            self._layout = None
+            self._bitmap_font = new_font
+            self._repack()
+
+    def del_bitmap_font(self):
+        self.set_bitmap_font(None)
+
+    def get_rasterize(self):
+        return self._rasterize
+
+    def set_rasterize(self, new_bool):
+        if self._rasterize != new_bool:
+            self._undraw()
+            self._layout = None
+            self._rasterize = new_bool
+            self._repack()
+
     def enable_line_wrap(self, width):
         self._line_wrap_width = width
         self._repack()
@@ -288,6 +407,113 @@ class Label(Widget):
         del self._style[style]
         self._update_style()
 
+    def _draw_bitmap_text(self):
+        style = dict(
+                text=self._text,
+                rect=self.rect,
+                color=self.color or 'white',
+                align=self.text_alignment,
+                line_spacing=self.line_spacing,
+                wrap_width=self._line_wrap_width,
+        )
+
+        # If a text layout was being used before the font was set, get rid of 
+        # it.
+        if self._layout is not None:
+            self._layout.delete()
+            self._layout = None
+
+        if self._bitmap_text is None:
+            self._bitmap_text = drawing.BitmapText(
+                    self._bitmap_font,
+                    batch=self.batch,
+                    group=self.group,
+                    **style,
+            )
+        else:
+            with self._bitmap_text.hold_updates():
+                self._bitmap_text.batch = self.batch
+                self._bitmap_text.group = self.group
+                for key, value in style.items():
+                    setattr(self._bitmap_text, key, value)
+
+    def _draw_raster(self):
+        if self._layout is not None:
+            self._layout.delete()
+            self._layout = None
+
+        if self._raster_sprite is None:
+            self._raster_sprite = pyglet.sprite.Sprite(
+                    self._raster, batch=self.batch, group=self.group)
+        else:
+            if self._raster_sprite.image is not self._raster:
+                self._raster_sprite.image = self._raster
+            self._raster_sprite.batch = self.batch
+            self._raster_sprite.group = self.group
+
+        # The raster is only as wide as the text, so apply the text alignment 
+        # here rather than within the layout.
+        x = self.rect.left
+        extra_space = self.rect.width - self._raster.width
+        if self.text_alignment == 'center':
+            x += extra_space // 2
+        elif self.text_alignment == 'right':
+            x += extra_space
+
+        color = self.color or (255, 255, 255, 255)
+        self._raster_sprite.update(x=x, y=self.rect.top - self._raster.height)
+        self._raster_sprite.color = color[:3]
+        self._raster_sprite.opacity = color[3]
+
+    def _is_text_drawn(self):
+        if not self.is_attached_to_gui or self.rect is None or self.is_hidden:
+            return False
+
+        if self._bitmap_font is not None:
+            return self._bitmap_text is not None
+
+        # Rasterized labels need a new raster whenever their text changes.
+        if self._rasterize:
+            return False
+
+        return self._layout is not None and self._layout.document is not None
+
+    def _edit_text(self, text):
+        self._text = text
+
+        if self._bitmap_font is not None:
+            self._bitmap_text.text = text
+
+        # Don't emit on_edit_text events for text that the program (rather 
+        # than the user) is changing.
+        else:
+            self._is_editing_document = True
+            try:
+                self._layout.document.text = text
+            finally:
+                self._is_editing_document = False
+
+        # Work out whether the claim would change in the same way _claim() 
+        # does, i.e. taking the size hint and the padding into account.
+        min_width, min_height = self._measure_text()
+        width_hint, height_hint = self.size_hint
+        claim = (
+                max(min_width, width_hint) + self.total_horz_padding,
+                max(min_height, height_hint) + self.total_vert_padding,
+        )
+        if claim != self.claimed_size:
+            self._repack()
+
+    def _measure_text(self):
+        if self._bitmap_font is not None:
+            return self._bitmap_font.measure(
+                    self._text, self._line_wrap_width, self.line_spacing)
+
+        if self._rasterize:
+            return self._raster.width, self._raster.height
+
+        return self._layout.content_width, self._layout.content_height
+
     def _update_style(self):
         # I want users to be able to specify colors using strings or Color 
         # objects, but pyglet expects tuples, so make the conversion here.
@@ -314,6 +540,134 @@ class Label(Widget):
         self._repack()
 
 
+@autoprop
+class LongLabel(Label):
+    """
+    A label for very long text (e.g. logs) that only makes vertex lists for
+    the lines that are actually visible.
+
+    A normal label uploads every glyph in its text to the GPU, even when it's
+    inside a scroll pane and almost all of it is clipped.  This label instead
+    finds the scroll pane it's in (if any) and keeps track of the region that
+    pane is showing.  As the pane scrolls, vertex lists are made for lines
+    that come into view and deleted for lines that go out of view, so the
+    memory and drawing costs depend on the size of the view rather than on
+    the length of the text.  Note that the text is still flowed into lines
+    all at once, because that's how the label knows how much space to claim.
+    """
+
+    class Layout(pyglet.text.layout.IncrementalTextLayout):
+
+        class Group(pyglet.text.layout.IncrementalTextLayoutGroup):
+            # The incremental layout normally clips itself with a scissor test
+            # in its own coordinates, but that doesn't work when the layout is
+            # inside a Mover (the scissor box doesn't get translated).  The
+            # scroll pane already clips everything it contains, so all this
+            # group needs to do is translate the visible lines into place.
+
+            def set_state(self):
+                pyglet.gl.glPushAttrib(
+                        pyglet.gl.GL_ENABLE_BIT |
+                        pyglet.gl.GL_TRANSFORM_BIT |
+                        pyglet.gl.GL_CURRENT_BIT)
+                pyglet.gl.glEnable(pyglet.gl.GL_BLEND)
+                pyglet.gl.glBlendFunc(
+                        pyglet.gl.GL_SRC_ALPHA,
+                        pyglet.gl.GL_ONE_MINUS_SRC_ALPHA)
+                pyglet.gl.glTranslatef(self.translate_x, self.translate_y, 0)
+
+            def unset_state(self):
+                pyglet.gl.glTranslatef(-self.translate_x, -self.translate_y, 0)
+                pyglet.gl.glPopAttrib()
+
+        def _init_groups(self, group):
+            from pyglet.text.layout import (
+                    TextLayoutForegroundGroup,
+                    TextLayoutForegroundDecorationGroup,
+            )
+            self.top_group = self.Group(group)
+            self.background_group = pyglet.graphics.OrderedGroup(
+                    0, self.top_group)
+            self.foreground_group = TextLayoutForegroundGroup(
+                    1, self.top_group)
+            self.foreground_decoration_group = \
+                    TextLayoutForegroundDecorationGroup(2, self.top_group)
+
+        def show_range(self, text_top, view_top, view_bottom):
+            """
+            Only make vertex lists for the lines between the given top and
+            bottom coordinates.  The coordinates are in the same space as the
+            layout itself, and ``text_top`` is where the first line of text
+            should be drawn.
+            """
+            # Setting the height outside of begin_update() makes pyglet build
+            # vertex lists for the whole document, which is exactly what this
+            # class is trying to avoid.
+            self.begin_update()
+            self.y = view_bottom
+            self.height = view_top - view_bottom
+            self.top_group.view_y = view_top - text_top
+            self.end_update()
+
+    def __init__(self, text=None, line_wrap=None, **style):
+        super().__init__(text, line_wrap, **style)
+        self._pane = None
+
+    def do_attach(self):
+        from glooey.scrolling import ScrollPane
+
+        widget = self.parent
+        while widget is not None and not isinstance(widget, ScrollPane):
+            widget = widget.parent
+
+        self._pane = widget
+        if self._pane is not None:
+            self._pane.push_handlers(
+                    on_scroll=self.on_pane_scroll,
+                    on_resize_children=self.on_pane_scroll,
+            )
+
+    def do_detach(self):
+        if self._pane is not None:
+            self._pane.remove_handlers(
+                    on_scroll=self.on_pane_scroll,
+                    on_resize_children=self.on_pane_scroll,
+            )
+            self._pane = None
+
+    def do_draw(self, ignore_rect=False):
+        super().do_draw(ignore_rect)
+        if not ignore_rect:
+            self._update_visible_range()
+
+    def do_make_new_layout(self, document, kwargs):
+        # Start with an empty view, so no vertex lists are made until we know
+        # which lines are visible.
+        kwargs = {**kwargs, 'height': 0}
+        kwargs.setdefault('width', None)
+        return self.Layout(document, **kwargs)
+
+    def on_pane_scroll(self, pane):
+        self._update_visible_range()
+
+    def _update_visible_range(self):
+        if self._layout is None or self.rect is None or self.is_hidden:
+            return
+
+        # The text is drawn from the top of the widget down.  Any part of the
+        # view that's past the end of the text is ignored, which also keeps
+        # the view_y attribute in the range the layout expects.
+        text_top = self.rect.top
+        text_bottom = text_top - self._layout.content_height
+        view = self._pane.view if self._pane is not None else self.rect
+
+        self._layout.show_range(
+                text_top,
+                clamp(view.top, text_bottom, text_top),
+                clamp(view.bottom, text_bottom, text_top),
+        )
+
+
 @autoprop
 @register_event_type('on_focus')
 @register_event_type('on_unfocus')
@@ -325,6 +679,8 @@ class EditableLabel(Label):
     def __init__(self, text="", line_wrap=None, **style):
         super().__init__(text, line_wrap, **style)
         self._caret = None
+        self._layout_key = None
+        self._drawn_style = {}
         self._focus = False
         self._is_mouse_over = False
         self._unfocus_on_enter = self.custom_unfocus_on_enter
@@ -335,9 +691,46 @@ class EditableLabel(Label):
         self._selection_background_color = self.custom_selection_background_color
 
     def do_claim(self):
-        font = pyglet.font.load(self.font_name)
-        min_size = font.ascent - font.descent
-        return min_size, min_size
+        return self._measure_text()
+
+    def do_draw(self, ignore_rect=False):
+        # Making a new incremental layout and caret is expensive, so only do it 
+        # if the existing ones can't be updated in place.  That's the case the 
+        # first time the label is drawn, after it's been undrawn, and whenever 
+        # the batch, the group, the line wrapping, or the text itself changes.  
+        # Otherwise just move and restyle the layout we already have, which 
+        # also leaves the caret and the selection untouched.
+        layout_key = self.batch, self.group, bool(self._line_wrap_width)
+
+        if layout_key != self._layout_key \
+                or self._text != self._layout.document.text:
+            super().do_draw(ignore_rect)
+            self._layout_key = layout_key
+            self._drawn_style = self._style.copy()
+            return
+
+        self._layout.begin_update()
+
+        self._layout.width = self._line_wrap_width or self.rect.width
+        self._layout.height = self.rect.height
+        self._layout.x = self.rect.bottom_left.x
+        self._layout.y = self.rect.bottom_left.y
+
+        # Styles that have been deleted since the last draw have to be 
+        # explicitly reset, because the document is no longer being replaced.
+        style = {k: None for k in self._drawn_style}
+        style.update(self._style)
+        self._layout.document.set_style(0, len(self._text), style)
+        self._drawn_style = self._style.copy()
+
+        self._update_selection_colors(self._layout)
+        self._caret.color = self.color[:3]
+
+        self._layout.end_update()
+
+    def do_undraw(self):
+        super().do_undraw()
+        self._layout_key = None
 
     def focus(self):
         # Push handlers directly to the window, so even if the user has 
@@ -415,11 +808,7 @@ class EditableLabel(Label):
     def do_make_new_layout(self, document, kwargs):
         # Make a new layout (optimized for editing).
         new_layout = pyglet.text.layout.IncrementalTextLayout(document, **kwargs)
-
-        new_layout.selection_color = drawing.Color.from_anything(
-                self._selection_color).tuple
-        new_layout.selection_background_color = drawing.Color.from_anything(
-                self._selection_background_color or self.color).tuple
+        self._update_selection_colors(new_layout)
 
         # If the previous layout had a selection, keep it.  Note that the 
         # normal text layout doesn't have the concept of a selection, so 
@@ -472,6 +861,17 @@ class EditableLabel(Label):
     def set_unfocus_on_enter(self, new_behavior):
         self._unfocus_on_enter = new_behavior
 
+    def _measure_text(self):
+        # The space claimed by an editable label doesn't depend on its text.
+        min_size = self.font_metrics.line_height
+        return min_size, min_size
+
+    def _update_selection_colors(self, layout):
+        layout.selection_color = drawing.Color.from_anything(
+                self._selection_color).tuple
+        layout.selection_background_color = drawing.Color.from_anything(
+                self._selection_background_color or self.color).tuple
+
 
 @autoprop
 class Form(Widget):
@@ -499,8 +899,8 @@ class Form(Widget):
         else:
             self._bg = self.Deck('base')
             self._bg.add_states(
-                    base=self.Base(),
-                    focused=self.Focused(),
+                    base=self.Base,
+                    focused=self.Focused,
             )
             self._label.push_handlers(
                     on_focus=lambda w: self._bg.set_state('focused'),
@@ -46,12 +46,12 @@ class Form(glooey.Form):
         custom_left_padding = 4
 
     class Base(glooey.Background):
-        custom_top = assets.texture('frames/mini/top_left.png')
-        custom_left = assets.texture('frames/mini/top_left.png')
-        custom_top_left = assets.image('frames/mini/top_left.png')
-        custom_bottom = assets.texture('frames/mini/bottom_right.png')
-        custom_right = assets.texture('frames/mini/bottom_right.png')
-        custom_bottom_right = assets.image('frames/mini/bottom_right.png')
+        custom_top = assets.lazy_texture('frames/mini/top_left.png')
+        custom_left = assets.lazy_texture('frames/mini/top_left.png')
+        custom_top_left = assets.lazy_image('frames/mini/top_left.png')
+        custom_bottom = assets.lazy_texture('frames/mini/bottom_right.png')
+        custom_right = assets.lazy_texture('frames/mini/bottom_right.png')
+        custom_bottom_right = assets.lazy_image('frames/mini/bottom_right.png')
 
 
 @autoprop
@@ -108,14 +108,14 @@ class BasicButton(glooey.Button):
         custom_alignment = 'center'
 
     class Base(glooey.Background):
-        custom_left=assets.image(f'buttons/basic/base_left.png')
-        custom_center=assets.texture('buttons/basic/base_center.png')
-        custom_right=assets.image(f'buttons/basic/base_right.png')
+        custom_left=assets.lazy_image(f'buttons/basic/base_left.png')
+        custom_center=assets.lazy_texture('buttons/basic/base_center.png')
+        custom_right=assets.lazy_image(f'buttons/basic/base_right.png')
 
     class Down(glooey.Background):
-        custom_left=assets.image(f'buttons/basic/down_left.png')
-        custom_center=assets.texture('buttons/basic/down_center.png')
-        custom_right=assets.image(f'buttons/basic/down_right.png')
+        custom_left=assets.lazy_image(f'buttons/basic/down_left.png')
+        custom_center=assets.lazy_texture('buttons/basic/down_center.png')
+        custom_right=assets.lazy_image(f'buttons/basic/down_right.png')
 
 
 @autoprop
@@ -128,31 +128,31 @@ class FancyButton(glooey.Button):
         custom_font_size = 12
 
     class Base(glooey.Background):
-        custom_left = assets.image(f'buttons/fancy/left_base.png')
-        custom_center = assets.texture(f'buttons/fancy/center_base.png')
-        custom_right = assets.image(f'buttons/fancy/right_base.png')
+        custom_left = assets.lazy_image(f'buttons/fancy/left_base.png')
+        custom_center = assets.lazy_texture(f'buttons/fancy/center_base.png')
+        custom_right = assets.lazy_image(f'buttons/fancy/right_base.png')
 
     class Over(glooey.Background):
-        custom_left = assets.image(f'buttons/fancy/left_over.png')
-        custom_center = assets.texture(f'buttons/fancy/center_over.png')
-        custom_right = assets.image(f'buttons/fancy/right_over.png')
+        custom_left = assets.lazy_image(f'buttons/fancy/left_over.png')
+        custom_center = assets.lazy_texture(f'buttons/fancy/center_over.png')
+        custom_right = assets.lazy_image(f'buttons/fancy/right_over.png')
 
     class Down(glooey.Background):
-        custom_left = assets.image(f'buttons/fancy/left_down.png')
-        custom_center = assets.texture(f'buttons/fancy/center_down.png')
-        custom_right = assets.image(f'buttons/fancy/right_down.png')
+        custom_left = assets.lazy_image(f'buttons/fancy/left_down.png')
+        custom_center = assets.lazy_texture(f'buttons/fancy/center_down.png')
+        custom_right = assets.lazy_image(f'buttons/fancy/right_down.png')
 
 
 class RadioButton(glooey.RadioButton):
-    custom_checked_base = assets.image('buttons/radio/checked.png')
-    custom_unchecked_base = assets.image('buttons/radio/unchecked.png')
+    custom_checked_base = assets.lazy_image('buttons/radio/checked.png')
+    custom_unchecked_base = assets.lazy_image('buttons/radio/unchecked.png')
 
 class BigFrame(glooey.Frame):
 
     class Decoration(glooey.Background):
-        custom_left = assets.image('frames/big/left.png')
-        custom_center = assets.texture('frames/big/center.png')
-        custom_right = assets.image('frames/big/right.png')
+        custom_left = assets.lazy_image('frames/big/left.png')
+        custom_center = assets.lazy_texture('frames/big/center.png')
+        custom_right = assets.lazy_image('frames/big/right.png')
 
     class Box(glooey.Bin):
         custom_vert_padding = 16
@@ -162,15 +162,15 @@ class BigFrame(glooey.Frame):
 class SmallFrame(glooey.Frame):
 
     class Decoration(glooey.Background):
-        custom_center = assets.texture('frames/small/center.png')
-        custom_top = assets.texture('frames/small/top.png')
-        custom_bottom = assets.texture('frames/small/bottom.png')
-        custom_left = assets.texture('frames/small/left.png')
-        custom_right = assets.texture('frames/small/right.png')
-        custom_top_left = assets.image('frames/small/top_left.png')
-        custom_top_right = assets.image('frames/small/top_right.png')
-        custom_bottom_left = assets.image('frames/small/bottom_left.png')
-        custom_bottom_right = assets.image('frames/small/bottom_right.png')
+        custom_center = assets.lazy_texture('frames/small/center.png')
+        custom_top = assets.lazy_texture('frames/small/top.png')
+        custom_bottom = assets.lazy_texture('frames/small/bottom.png')
+        custom_left = assets.lazy_texture('frames/small/left.png')
+        custom_right = assets.lazy_texture('frames/small/right.png')
+        custom_top_left = assets.lazy_image('frames/small/top_left.png')
+        custom_top_right = assets.lazy_image('frames/small/top_right.png')
+        custom_bottom_left = assets.lazy_image('frames/small/bottom_left.png')
+        custom_bottom_right = assets.lazy_image('frames/small/bottom_right.png')
 
     class Box(glooey.Bin):
         custom_padding = 10
@@ -179,38 +179,38 @@ class SmallFrame(glooey.Frame):
 class SubFrame(glooey.Frame):
 
     class Decoration(glooey.Background):
-        custom_top = assets.texture('frames/sub/top.png')
-        custom_bottom = assets.texture('frames/sub/bottom.png')
-        custom_left = assets.texture('frames/sub/left.png')
-        custom_right = assets.texture('frames/sub/right.png')
-        custom_top_left = assets.image('frames/sub/top_left.png')
-        custom_top_right = assets.image('frames/sub/top_right.png')
-        custom_bottom_left = assets.image('frames/sub/bottom_left.png')
-        custom_bottom_right = assets.image('frames/sub/bottom_right.png')
+        custom_top = assets.lazy_texture('frames/sub/top.png')
+        custom_bottom = assets.lazy_texture('frames/sub/bottom.png')
+        custom_left = assets.lazy_texture('frames/sub/left.png')
+        custom_right = assets.lazy_texture('frames/sub/right.png')
+        custom_top_left = assets.lazy_image('frames/sub/top_left.png')
+        custom_top_right = assets.lazy_image('frames/sub/top_right.png')
+        custom_bottom_left = assets.lazy_image('frames/sub/bottom_left.png')
+        custom_bottom_right = assets.lazy_image('frames/sub/bottom_right.png')
 
     class Box(glooey.Bin):
         custom_padding = 6
 
 
 class HRule(glooey.Background):
-    custom_center = assets.texture('dividers/hrule/center.png')
-    custom_left = assets.texture('dividers/hrule/left.png')
-    custom_right = assets.texture('dividers/hrule/right.png')
+    custom_center = assets.lazy_texture('dividers/hrule/center.png')
+    custom_left = assets.lazy_texture('dividers/hrule/left.png')
+    custom_right = assets.lazy_texture('dividers/hrule/right.png')
     custom_vert_padding = 3
 
 class VRule(glooey.Background):
-    custom_center = assets.texture('dividers/vrule/center.png')
-    custom_top = assets.texture('dividers/vrule/top.png')
-    custom_bottom = assets.texture('dividers/vrule/bottom.png')
+    custom_center = assets.lazy_texture('dividers/vrule/center.png')
+    custom_top = assets.lazy_texture('dividers/vrule/top.png')
+    custom_bottom = assets.lazy_texture('dividers/vrule/bottom.png')
     custom_horz_padding = 3
 
 @autoprop
 class BasicFillBar(glooey.FillBar):
 
     class Base(glooey.Background):
-        custom_left = assets.image('fill_bars/basic/base_left.png')
-        custom_center = assets.texture('fill_bars/basic/base_center.png')
-        custom_right = assets.image('fill_bars/basic/base_right.png')
+        custom_left = assets.lazy_image('fill_bars/basic/base_left.png')
+        custom_center = assets.lazy_texture('fill_bars/basic/base_center.png')
+        custom_right = assets.lazy_image('fill_bars/basic/base_right.png')
         custom_alignment = 'fill horz'
         custom_htile = True
 
@@ -242,9 +242,9 @@ class BasicFillBar(glooey.FillBar):
 class FancyFillBar(glooey.FillBar):
 
     class Base(glooey.Background):
-        custom_left = assets.image('fill_bars/fancy/base_left.png')
-        custom_center = assets.texture('fill_bars/fancy/base_center.png')
-        custom_right = assets.image('fill_bars/fancy/base_right.png')
+        custom_left = assets.lazy_image('fill_bars/fancy/base_left.png')
+        custom_center = assets.lazy_texture('fill_bars/fancy/base_center.png')
+        custom_right = assets.lazy_image('fill_bars/fancy/base_right.png')
         custom_alignment = 'fill horz'
         custom_htile = True
 
@@ -278,9 +278,9 @@ class ScrollBox(glooey.ScrollBox):
     class VBar(glooey.VScrollBar):
 
         class Decoration(glooey.Background):
-            custom_top = assets.image('scroll_bars/bar_top.png')
-            custom_center = assets.texture('scroll_bars/bar_center.png')
-            custom_bottom = assets.image('scroll_bars/bar_bottom.png')
+            custom_top = assets.lazy_image('scroll_bars/bar_top.png')
+            custom_center = assets.lazy_texture('scroll_bars/bar_center.png')
+            custom_bottom = assets.lazy_image('scroll_bars/bar_bottom.png')
 
         class Forward(RoundButton):
             custom_color = 'green'
@@ -299,7 +299,7 @@ class ScrollBox(glooey.ScrollBox):
             custom_right_padding = 5
 
         class Grip(glooey.Image):
-            custom_image = assets.image('scroll_bars/grip.png')
+            custom_image = assets.lazy_image('scroll_bars/grip.png')
             custom_left_padding = 2
             custom_right_padding = 6
 
@@ -314,8 +314,8 @@ class ScrollBox(glooey.ScrollBox):
 class PopUp(glooey.Dialog):
 
     class Decoration(glooey.Background):
-        custom_left = assets.image('frames/big/left.png')
-        custom_center = assets.texture('frames/big/center.png')
+        custom_left = assets.lazy_image('frames/big/left.png')
+        custom_center = assets.lazy_texture('frames/big/center.png')
         custom_right_padding = 69
 
     class Box(glooey.Grid):
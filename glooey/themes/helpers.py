@@ -1,18 +1,106 @@
 #!/usr/bin/env python3
 
 import pyglet
+import posixpath
 import functools
 import contextlib
 import yaml
 
 from pathlib import Path
+from glooey import drawing
 from glooey.helpers import *
 
 class ResourceLoader(pyglet.resource.Loader):
 
     def __init__(self, paths=None):
         super().__init__(paths, Path(__file__).parent / 'assets')
+        self._bitmap_fonts = {}
+
+    def add_font(self, name):
+        super().add_font(name)
+        with self.file(name) as file:
+            drawing.register_font_file(file)
+
+    def lazy_image(self, name, **kwargs):
+        """
+        Return a `LazyAsset` that loads the given image the first time it's 
+        accessed.  The arguments are the same as for `image()`.
+        """
+        return LazyAsset(self.image, name, **kwargs)
+
+    def lazy_texture(self, name):
+        """
+        Return a `LazyAsset` that loads the given texture the first time it's 
+        accessed.  The arguments are the same as for `texture()`.
+        """
+        return LazyAsset(self.texture, name)
 
     def yaml(self, name):
         return yaml.safe_load(self.file(name))
 
+    def bitmap_font(self, name):
+        """
+        Load a `glooey.drawing.BitmapFont` from the given BMFont metrics file.  
+        The glyph sheet must be in the same directory as the metrics file.
+        """
+        if name not in self._bitmap_fonts:
+            dir = posixpath.dirname(name)
+            self._bitmap_fonts[name] = drawing.BitmapFont.from_fnt(
+                    self.file(name),
+                    lambda page: self.image(posixpath.join(dir, page)),
+            )
+
+        return self._bitmap_fonts[name]
+
+class LazyAsset:
+    """
+    A class attribute that loads an asset the first time it's accessed from an 
+    instance, then keeps returning the same asset.  Accessing it from the 
+    class itself returns the `LazyAsset`.
+
+    Themes use this for ``custom_...`` attributes (via 
+    `ResourceLoader.lazy_image()` and `ResourceLoader.lazy_texture()`), so that 
+    importing a theme doesn't load every image it might use.  Instead, each 
+    image is loaded the first time a widget that uses it is instantiated.
+    """
+
+    def __init__(self, load, *args, **kwargs):
+        self._load = functools.partial(load, *args, **kwargs)
+        self._asset = None
+        self._is_loaded = False
+
+    def __get__(self, obj, cls=None):
+        # Only load the asset for instances, so that just looking at the class 
+        # (e.g. to document it, or to copy its attributes) doesn't load it.
+        if obj is None:
+            return self
+
+        if not self._is_loaded:
+            self._asset = self._load()
+            self._is_loaded = True
+        return self._asset
+
+    @property
+    def is_loaded(self):
+        return self._is_loaded
+
+def prewarm_fonts(names, sizes=None, chars=None, bold=False, italic=False):
+    """
+    Rasterize the given characters for every combination of the given font 
+    names and sizes, and return how many seconds that took.
+
+    This is meant to be called from a loading screen, e.g. after a theme has 
+    used `ResourceLoader.add_font()` to register its fonts, so that the first 
+    frame that shows any text doesn't have to rasterize glyphs.  See 
+    `glooey.drawing.prewarm_font()` for more details.
+    """
+    if isinstance(names, str):
+        names = [names]
+    if sizes is None:
+        sizes = [None]
+
+    return sum(
+            drawing.prewarm_font(name, size, bold, italic, chars=chars)
+            for name in names
+            for size in sizes
+    )
@@ -65,15 +65,15 @@ class Form(glooey.Form):
         custom_font_size = 10
     
     class Base(glooey.Background):
-        custom_center = assets.texture('form/center.png')
-        custom_top = assets.texture('form/top.png')
-        custom_left = assets.texture('form/left.png')
-        custom_right = assets.texture('form/right.png')
-        custom_bottom = assets.texture('form/bottom.png')
-        custom_top_left = assets.image('form/top_left.png')
-        custom_top_right = assets.image('form/top_right.png')
-        custom_bottom_left = assets.image('form/bottom_left.png')
-        custom_bottom_right = assets.image('form/bottom_right.png')
+        custom_center = assets.lazy_texture('form/center.png')
+        custom_top = assets.lazy_texture('form/top.png')
+        custom_left = assets.lazy_texture('form/left.png')
+        custom_right = assets.lazy_texture('form/right.png')
+        custom_bottom = assets.lazy_texture('form/bottom.png')
+        custom_top_left = assets.lazy_image('form/top_left.png')
+        custom_top_right = assets.lazy_image('form/top_right.png')
+        custom_bottom_left = assets.lazy_image('form/bottom_left.png')
+        custom_bottom_right = assets.lazy_image('form/bottom_right.png')
 
 
 
@@ -217,13 +217,13 @@ class YellowMenu(Menu):
 
 
 class HRule(glooey.Background):
-    custom_center = assets.texture('dividers/horz.png')
+    custom_center = assets.lazy_texture('dividers/horz.png')
     custom_htile = True
     custom_vtile = False
     custom_vert_padding = 8
 
 class VRule(glooey.Background):
-    custom_center = assets.texture('dividers/vert.png')
+    custom_center = assets.lazy_texture('dividers/vert.png')
     custom_htile = False
     custom_vtile = True
     custom_horz_padding = 18
@@ -10,9 +10,9 @@ class WesnothButton(glooey.Button):
         custom_font_name = 'Lato Regular'
         custom_font_size = 10
 
-    custom_base = assets.image('buttons/button_normal/button_H22.png')
-    custom_over = assets.image('buttons/button_normal/button_H22-active.png')
-    custom_down = assets.image('buttons/button_normal/button_H22-pressed.png')
+    custom_base = assets.lazy_image('buttons/button_normal/button_H22.png')
+    custom_over = assets.lazy_image('buttons/button_normal/button_H22-active.png')
+    custom_down = assets.lazy_image('buttons/button_normal/button_H22-pressed.png')
     custom_label_placement = 'center'
 
 class BraidedFrame:
@@ -290,6 +290,7 @@ class Widget(EventDispatcher, HoldUpdatesMixin):
 
         self.__is_hidden = False
         self.__is_parent_hidden = False
+        self.__is_culled = False
         self.__is_enabled = True
 
         # Attribute controlling mouse events.
@@ -1243,6 +1244,9 @@ class Widget(EventDispatcher, HoldUpdatesMixin):
                 else:
                     diagnoses.append("{hidden_parent}, a widget {level} level(s) above {self}, is hidden.\nCall {hidden_parent.__class__.__name__}.unhide() to reveal it and its children.")
 
+            if self.__is_culled:
+                diagnoses.append("{self} is scrolled out of view, so it isn't being drawn.\nScroll it back into view to draw it.")
+
         # If no problems were found, say so.
 
         if not diagnoses:
@@ -1323,10 +1327,17 @@ class Widget(EventDispatcher, HoldUpdatesMixin):
             self.parent._repack()
             self.__is_claim_stale = True
 
-        # Otherwise, stop recursing and resize the widget's children.
+        # Otherwise, stop recursing and resize the widget's children.  This may 
+        # move some of them into or out of view, and none of the movers above 
+        # this widget will notice, so cull them here.
         else:
             self._realign()
 
+            if self.__parent is not None:
+                visible_rect = self.__parent._find_visible_rect()
+                if visible_rect is not None:
+                    self._cull(visible_rect)
+
         self.dispatch_event('on_repack')
 
     def _claim(self):
@@ -1428,34 +1439,45 @@ class Widget(EventDispatcher, HoldUpdatesMixin):
             return
 
         # Subtract padding from the full amount of space assigned to this 
-        # widget.
-        max_rect = self.__assigned_rect.copy()
-        max_rect.left += self.left_padding
-        max_rect.bottom += self.bottom_padding
-        max_rect.width -= self.total_horz_padding
-        max_rect.height -= self.total_vert_padding
+        # widget.  This is all done with plain numbers rather than `Rect` 
+        # objects, because every widget in the GUI goes through here on each 
+        # repack, and new rectangles are only needed if something changed.
+        assigned_rect = self.__assigned_rect
+        max_lbwh = (
+                assigned_rect.left + self.left_padding,
+                assigned_rect.bottom + self.bottom_padding,
+                assigned_rect.width - self.total_horz_padding,
+                assigned_rect.height - self.total_vert_padding,
+        )
 
         # Align this widget within the space available to it (i.e. the assigned 
         # space minus the padding).
-        aligned_rect = Rect.from_size(self.__min_width, self.__min_height)
-        drawing.align(self.__alignment, aligned_rect, max_rect)
+        aligned_lbwh = drawing.align_tuple(
+                self.__alignment,
+                (self.__min_width, self.__min_height),
+                max_lbwh,
+        )
 
         # Round the rectangle to the nearest integer pixel, because sometimes 
         # images can't line up right (e.g. in Background widgets) if the widget 
         # has fractional coordinates.
-        aligned_rect.round()
+        left, bottom, width, height = (round(x) for x in aligned_lbwh)
 
         # Guarantee that do_resize() is only called if the size of the widget 
         # actually changed.  This is probably doesn't have a significant effect 
         # on performance, but hopefully it gives people reimplementing 
         # do_resize() less to worry about.
-        if self.__rect is None or self.__rect != aligned_rect:
-            self.__rect = aligned_rect
-            self.__padded_rect = aligned_rect.copy()
-            self.__padded_rect.left -= self.left_padding
-            self.__padded_rect.bottom -= self.bottom_padding
-            self.__padded_rect.width += self.total_horz_padding
-            self.__padded_rect.height += self.total_vert_padding
+        rect = self.__rect
+        if rect is None or \
+                rect.left != left or rect.bottom != bottom or \
+                rect.width != width or rect.height != height:
+            self.__rect = Rect(left, bottom, width, height)
+            self.__padded_rect = Rect(
+                    left - self.left_padding,
+                    bottom - self.bottom_padding,
+                    width + self.total_horz_padding,
+                    height + self.total_vert_padding,
+            )
             self.do_resize()
 
         # Repacking a widget should always cause it to be redrawn.  Widgets use 
@@ -1585,6 +1607,12 @@ class Widget(EventDispatcher, HoldUpdatesMixin):
         else:
             self._unhide_children(False)
 
+        # Children added to a part of the hierarchy that's been scrolled out of 
+        # view shouldn't be drawn either.  See `_cull()`.
+        if self.__is_culled:
+            for widget in child.__yield_self_and_all_children():
+                widget.__is_culled = True
+
         self.dispatch_event('on_attach_child', self, child)
         return child
 
@@ -1609,6 +1637,7 @@ class Widget(EventDispatcher, HoldUpdatesMixin):
             widget._ungrab_mouse()
             widget._undraw()
             widget.__root = None
+            widget.__is_culled = False
 
         self.__children.discard(child)
         child.__parent = None
@@ -1651,12 +1680,13 @@ class Widget(EventDispatcher, HoldUpdatesMixin):
            group is set when the widget is attached to the hierarchy and its 
            parent calls its `_regroup()` method.
 
-        4. The widget must not be hidden.
+        4. The widget must not be hidden, or scrolled out of view.
         """
         if self.root is None: return
         if self.rect is None: return
         if self.group is None: return
         if self.is_hidden: return
+        if self.__is_culled: return
 
         self.do_draw()
 
@@ -1687,6 +1717,65 @@ class Widget(EventDispatcher, HoldUpdatesMixin):
         for child in self.__children:
             child._undraw_all()
 
+    def _cull(self, visible_rect):
+        """
+        Undraw the parts of this widget's hierarchy that are outside the given 
+        rectangle, and redraw the parts that have come back inside it.
+
+        This is how movers avoid drawing (and hit-testing) widgets that have 
+        been scrolled out of view.  The rectangle must be in the same 
+        coordinates as this widget's rect, or None to draw everything.  The 
+        search only goes as deep as it has to: widgets that are completely 
+        outside the rectangle are culled along with all their children, and 
+        widgets that are already culled aren't searched at all.  Culled widgets 
+        still take part in layout, because their sizes are needed to know how 
+        far the content can be scrolled.
+        """
+        rect = self.__rect
+
+        if visible_rect is not None and rect is not None:
+            if not visible_rect.touching(rect):
+                if not self.__is_culled:
+                    for widget in self.__yield_self_and_all_children():
+                        if not widget.__is_culled:
+                            widget.__is_culled = True
+                            widget._undraw()
+                return
+
+            # Everything inside this widget is visible, so there's no need to 
+            # keep checking rectangles.
+            if visible_rect.contains(rect):
+                visible_rect = None
+
+        if self.__is_culled:
+            self.__is_culled = False
+            self._draw()
+
+        self._cull_children(visible_rect)
+
+    def _cull_children(self, visible_rect):
+        """
+        Undraw the children that are outside the given rectangle.
+
+        Widgets that put their children in different coordinates (e.g. movers) 
+        should reimplement this method.
+        """
+        for child in self.__children:
+            child._cull(visible_rect)
+
+    def _find_visible_rect(self):
+        """
+        Return the part of this widget's children that can be seen, in their 
+        coordinates, or None if they can all be seen.
+
+        Only movers actually clip their children, so by default this just asks 
+        the parent widget.  Widgets that reimplement `_cull_children()` should 
+        reimplement this method too.
+        """
+        if self.__parent is None:
+            return None
+        return self.__parent._find_visible_rect()
+
     def _grab_mouse(self):
         """
         Force all mouse events to be funneled to this widget.
@@ -1821,7 +1910,8 @@ class Widget(EventDispatcher, HoldUpdatesMixin):
         else:
             self.__children_under_mouse = {
                     w for w in self.do_find_children_near_mouse(x, y)
-                    if w.is_visible and w.is_under_mouse(x, y)
+                    if w.is_visible and not w.__is_culled
+                    and w.is_under_mouse(x, y)
             }
 
         return Widget.__ChildrenUnderMouse(
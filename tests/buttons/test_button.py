@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+import pytest
+import glooey
+
+def test_shared_background(mock_window):
+
+    class SharedButton(glooey.Button):
+        custom_shared_background = True
+        custom_base_color = 'green'
+        custom_over_color = 'red'
+
+    gui = glooey.Gui(mock_window)
+    button = SharedButton('hello')
+    gui.add(button)
+
+    background = button._background
+    artist = background._artist._color_artist
+    vertex_list = artist.vertex_list
+
+    assert background.state == 'base'
+    assert artist.color == glooey.Color.from_anything('green')
+
+    # Changing state should update the existing vertex list, not make a new 
+    # one.
+    background.set_state('over')
+    assert artist.color == glooey.Color.from_anything('red')
+    assert background._artist._color_artist is artist
+    assert artist.vertex_list is vertex_list
+
+    # There's no separate widget for each state.
+    with pytest.raises(glooey.UsageError):
+        button.over_background
+
+def test_custom_background_override():
+
+    class BaseButton(glooey.Button):
+        custom_base_color = 'green'
+        custom_over_color = 'green'
+
+    class SubButton(BaseButton):
+        custom_base_color = 'red'
+
+    # Attributes defined by a subclass should take precedence over the ones 
+    # it inherits, like any other attribute.
+    button = SubButton()
+    assert button.base_background.color == 'red'
+    assert button.over_background.color == 'green'
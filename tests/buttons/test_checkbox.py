@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+import pyglet
+import glooey
+
+class SpriteSheetCheckbox(glooey.SpriteCheckbox):
+    custom_sprite_sheet = pyglet.image.ImageData(
+            32, 16, 'RGBA', bytes(32 * 16 * 4))
+
+class SpriteSheetRadioButton(glooey.SpriteRadioButton):
+    custom_sprite_sheet = SpriteSheetCheckbox.custom_sprite_sheet
+
+class ImageCheckbox(glooey.Checkbox):
+    custom_checked_base = pyglet.image.ImageData(8, 8, 'RGBA', bytes(8 * 8 * 4))
+    custom_unchecked_base = custom_checked_base
+
+class ImageRadioButton(glooey.RadioButton):
+    custom_checked_base = ImageCheckbox.custom_checked_base
+    custom_unchecked_base = custom_checked_base
+
+def test_sprite_checkbox(mock_window):
+    gui = glooey.Gui(mock_window)
+    checkbox = SpriteSheetCheckbox()
+    gui.add(checkbox)
+
+    images = checkbox._images
+    sprite = checkbox._sprite
+
+    assert checkbox.claimed_size == (8, 8)
+    assert sprite.image is images[False, 'base']
+
+    # Toggling and disabling the checkbox should just change which region of 
+    # the sheet the one sprite shows.
+    checkbox.toggle()
+    assert checkbox.is_checked
+    assert checkbox._sprite is sprite
+    assert sprite.image is images[True, 'base']
+
+    checkbox.disable()
+    assert checkbox.state == 'off'
+    assert checkbox._sprite is sprite
+    assert sprite.image is images[True, 'off']
+
+    # Missing images are substituted, or not drawn at all.
+    checkbox.enable()
+    checkbox.set_images(unchecked_base=images[False, 'base'])
+    assert checkbox.is_checked
+    assert checkbox._sprite is None
+
+    checkbox.toggle()
+    assert checkbox._sprite.image is images[False, 'base']
+
+def test_checkbox_proxy(mock_window):
+    gui = glooey.Gui(mock_window)
+
+    for cls in [ImageCheckbox, SpriteSheetCheckbox]:
+        checkbox = cls()
+        proxy = glooey.Button()
+        gui.add(checkbox)
+        gui.add(proxy)
+
+        # Exclusive proxies take clicks away from the checkbox itself.
+        checkbox.add_proxy(proxy, exclusive=True)
+        proxy.dispatch_event('on_click', proxy)
+        assert checkbox.is_checked
+        checkbox.on_click(checkbox)
+        assert checkbox.is_checked
+
+        checkbox.remove_proxy(proxy)
+        proxy.dispatch_event('on_click', proxy)
+        assert checkbox.is_checked
+        checkbox.on_click(checkbox)
+        assert not checkbox.is_checked
+
+def test_radio_group(mock_window):
+    gui = glooey.Gui(mock_window)
+    group = glooey.RadioGroup()
+    buttons = [SpriteSheetRadioButton(group) for i in range(3)]
+    buttons += [ImageRadioButton(group, is_checked=True)]
+
+    for button in buttons:
+        gui.add(button)
+
+    assert group == buttons
+    assert group.checked is buttons[3]
+
+    buttons[0].toggle()
+    assert group.checked is buttons[0]
+    assert [x.is_checked for x in buttons] == [True, False, False, False]
+
+    # Clicking on a checked radio button doesn't uncheck it.
+    buttons[0].on_click(buttons[0])
+    assert group.checked is buttons[0]
+
+    buttons[2].on_click(buttons[2])
+    assert group.checked is buttons[2]
+    assert [x.is_checked for x in buttons] == [False, False, True, False]
+
+    buttons[2].uncheck()
+    assert group.checked is None
+
+    # Plain lists still work.
+    peers = []
+    buttons = [SpriteSheetRadioButton(peers) for i in range(3)]
+    buttons[0].check()
+    buttons[1].check()
+    assert [x.is_checked for x in buttons] == [False, True, False]
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 
 import pytest
+import pyglet
+import glooey
 from run_demos import run_demo
 
 def pytest_addoption(parser):
@@ -11,6 +13,42 @@ def pytest_collect_file(path, parent):
         if path.fnmatch('demo_*.py'):
             return DemoFile.from_parent(parent, fspath=path)
 
+class MockWindow:
+    """
+    Stand in for a pyglet window, so tests can make a GUI without a display.
+    """
+
+    def __init__(self):
+        self.width = 600
+        self.height = 480
+
+    def push_handlers(self, listener):
+        pass
+
+@pytest.fixture
+def mock_window():
+    return MockWindow()
+
+@pytest.fixture
+def load_image_async(tmp_path):
+    """
+    Save a blank image with the given name, and start loading it in the 
+    background.  The image is decoded by the time it's returned, but it won't 
+    be ready until `glooey.drawing.process_pending_images()` uploads it.
+    """
+    def load_image_async(name, size=(16, 8), **kwargs):
+        path = str(tmp_path / name)
+        width, height = size
+        image = pyglet.image.ImageData(
+                width, height, 'RGBA', bytes(width * height * 4))
+        image.save(path)
+
+        pending = glooey.drawing.load_image_async(path, **kwargs)
+        pending._future.result()
+        return pending
+
+    return load_image_async
+
 class DemoFile(pytest.File):
 
     def collect(self):
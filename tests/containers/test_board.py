@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+import glooey
+
+class Marker(glooey.Widget):
+    custom_alignment = 'fill'
+
+    def do_claim(self):
+        return 10, 10
+
+def test_board_move(mock_window):
+    gui = glooey.Gui(mock_window)
+    board = glooey.Board()
+    board.size_hint = 100, 100
+    board.alignment = 'bottom left'
+    markers = [Marker() for i in range(3)]
+
+    for i, marker in enumerate(markers):
+        board.add(marker, left=40 * i, bottom=40 * i)
+
+    gui.add(board)
+
+    num_repacks = 0
+    def on_repack(): #
+        nonlocal num_repacks
+        num_repacks += 1
+    board.push_handlers(on_repack=on_repack)
+
+    # Moving a widget within the board should only resize that widget.
+    board.move(markers[1], left=50, bottom=60)
+    assert markers[1].rect == glooey.Rect(50, 60, 10, 10)
+    assert markers[0].rect == glooey.Rect(0, 0, 10, 10)
+    assert num_repacks == 0
+
+    # Moving the widget that determines the size of the board should repack 
+    # it, though.
+    board.move(markers[2], left=150, bottom=0)
+    assert markers[2].rect == glooey.Rect(150, 0, 10, 10)
+    assert board.claimed_size == (160, 100)
+    assert num_repacks == 1
+
+    # Moving it back should shrink the board again.  The biggest remaining 
+    # widget is now the one at (50, 60).
+    board.move(markers[2], left=0, bottom=0)
+    assert board.claimed_size == (100, 100)
+    assert board._find_min_size() == (60, 70)
+    assert num_repacks == 2
+
+    # Removed widgets shouldn't count towards the size of the board.
+    board.remove(markers[1])
+    assert board._find_min_size() == (10, 10)
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+
+import glooey
+
+def test_deck_lazy_states(mock_window):
+    gui = glooey.Gui(mock_window)
+    made = []
+
+    def factory(state): #
+        def make(): #
+            made.append(state)
+            return glooey.Placeholder()
+        return make
+
+    deck = glooey.Deck('a', a=factory('a'), b=factory('b'))
+    deck.add_state('c', factory('c'))
+    gui.add(deck)
+
+    # Only the current state should be created right away.
+    assert made == ['a']
+    assert deck.known_states == ('a', 'b', 'c')
+    assert deck.is_state_built('a')
+    assert not deck.is_state_built('b')
+
+    # Configuring a state that hasn't been created should wait until it is.
+    deck.configure_state('c', lambda w: setattr(w, 'configured', True))
+    assert made == ['a']
+
+    deck.state = 'c'
+    assert made == ['a', 'c']
+    assert deck['c'].configured
+    assert deck['c'].is_visible
+    assert not deck['a'].is_visible
+
+    # Removing a state that was never created shouldn't create it.
+    deck.remove_state('b')
+    assert made == ['a', 'c']
+    assert deck.known_states == ('a', 'c')
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+
+import glooey
+
+def test_stack_order(mock_window):
+    gui = glooey.Gui(mock_window)
+    stack = glooey.Stack()
+    gui.add(stack)
+
+    a, b, c, d = [glooey.Placeholder() for i in range(4)]
+    stack.add(a)
+    stack.add_front(b)
+    stack.add_back(c)
+    stack.insert(d, 0)
+
+    # Children in the same layer stay in the order they were added.
+    assert stack.children == (b, a, d, c)
+    assert stack.layers == [1, 0, 0, -1]
+
+    # Each layer gets one group, which is shared by all its children.
+    assert a.group is d.group
+    assert a.group is not b.group
+    assert a.group.order == 0
+
+    stack.remove(b)
+    assert stack.children == (a, d, c)
+    assert 1 not in stack._layer_groups
+
+    # A single child doesn't need its own group.
+    stack.remove(a)
+    stack.remove(d)
+    assert stack.children == (c,)
+    assert c.group is stack.group
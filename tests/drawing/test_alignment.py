@@ -35,3 +35,38 @@ def test_child_outside_parent():
     with pytest.raises(RuntimeError, match='move_1px_right'):
         glooey.drawing.align(move_1px_right, child, parent)
     
+
+def test_align_tuple():
+    parent = Rect(1.5, 2.25, 10.3, 7.7)
+
+    for key in glooey.drawing.alignments:
+        child = Rect.from_size(3.1, 4.9)
+        glooey.drawing.align(key, child, parent)
+
+        child_lbwh = glooey.drawing.align_tuple(
+                key, (3.1, 4.9), (1.5, 2.25, 10.3, 7.7))
+        assert child_lbwh == (child.left, child.bottom, child.width, child.height)
+
+    # Functions should work too, by way of align().
+    def move_1px_right(child_rect, parent_rect):
+        child_rect.left += 1
+
+    assert glooey.drawing.align_tuple(
+            move_1px_right, (1, 1), (0, 0, 2, 2)) == (1, 0, 1, 1)
+
+def test_alignment_checks():
+    def move_2px_right(child_rect, parent_rect):
+        child_rect.left += 2
+
+    with pytest.raises(RuntimeError):
+        glooey.drawing.align(move_2px_right, Rect.null(), Rect.null())
+    with pytest.raises(RuntimeError):
+        glooey.drawing.align_tuple('center', (4, 4), (0, 0, 1, 1))
+
+    were_checked = glooey.drawing.get_alignment_checks()
+    glooey.drawing.set_alignment_checks(False)
+    try:
+        glooey.drawing.align(move_2px_right, Rect.null(), Rect.null())
+        glooey.drawing.align_tuple('center', (4, 4), (0, 0, 1, 1))
+    finally:
+        glooey.drawing.set_alignment_checks(were_checked)
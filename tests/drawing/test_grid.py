@@ -431,6 +431,22 @@ def test_make_cells():
         assert grid.cell_rects == cells
         assert grid.bounding_rect == bbox
 
+def test_make_cells_live_view():
+    grid = drawing.Grid(num_rows=1, num_cols=1)
+    cells = grid.make_cells(Rect.from_size(10, 10))
+    snapshot = dict(cells)
+
+    # The cells returned by the grid are updated when it's laid out again, but 
+    # copies of them aren't.
+    assert grid.make_cells(Rect.from_size(20, 20)) is cells
+    assert cells[0, 0] == Rect.from_size(20, 20)
+    assert snapshot[0, 0] == Rect.from_size(10, 10)
+
+    # make_grid() always returns a new dictionary.
+    cells = drawing.make_grid(Rect.from_size(10, 10), num_rows=1, num_cols=1)
+    assert type(cells) is dict
+    assert cells == {(0, 0): Rect.from_size(10, 10)}
+
 def test_find_cell_under_mouse():
     grid = drawing.Grid()
     grid.num_rows = 2
@@ -472,6 +488,53 @@ def test_find_cell_under_mouse():
     for mouse, cell in expected_results.items():
         assert grid.find_cell_under_mouse(*mouse) == cell
 
+def test_find_cell_under_mouse_many_cells():
+    grid = drawing.Grid()
+    grid.num_rows = 100
+    grid.num_cols = 50
+    grid.inner_padding = 2
+    grid.row_heights = {i: 10 for i in range(100)}
+    grid.col_widths = {j: 20 for j in range(50)}
+    grid.make_cells(Rect.from_size(50 * 22, 100 * 12))
+
+    for (i, j), rect in grid.cell_rects.items():
+        assert grid.find_cell_under_mouse(*rect.center) == (i, j)
+        assert grid.find_cell_under_mouse(*rect.top_left) == (i, j)
+
+    # Points in the padding between cells shouldn't find any cell.
+    assert grid.find_cell_under_mouse(21, 5) is None
+    assert grid.find_cell_under_mouse(5, 100 * 12 - 11) is None
+
+def test_find_cell_under_mouse_negative_sizes():
+    # Rows, columns, and padding can be negative, in which case the cell edges 
+    # aren't sorted and can't be bisected.  The first cell (top-left-most) 
+    # under the mouse should still be found.
+    grid = drawing.Grid()
+    grid.num_rows = 2
+    grid.num_cols = 2
+    grid.row_heights = {0: 5, 1: -3}
+    grid.col_widths = {0: 5, 1: -3}
+    grid.make_cells(Rect.from_size(10, 10))
+
+    for y in range(5, 11):
+        assert grid.find_cell_under_mouse(0, y) == (0, 0)
+    for x in range(0, 6):
+        assert grid.find_cell_under_mouse(x, 10) == (0, 0)
+
+    assert grid.find_cell_under_mouse(0, 4) is None
+    assert grid.find_cell_under_mouse(6, 10) is None
+
+    grid.row_heights = {0: 5, 1: 5}
+    grid.col_widths = {0: 5, 1: 5}
+    grid.inner_padding = -2
+    grid.make_cells(Rect.from_size(8, 8))
+
+    assert grid.find_cell_under_mouse(4, 4) == (0, 0)
+    assert grid.find_cell_under_mouse(2, 2) == (1, 0)
+    assert grid.find_cell_under_mouse(6, 6) == (0, 1)
+    assert grid.find_cell_under_mouse(-1, 5) is None
+    assert grid.find_cell_under_mouse(5, 100 * 12 + 1) is None
+
 def test_setters():
     grid = drawing.Grid()
     assert grid.make_claim() == (0, 0)
@@ -515,6 +578,130 @@ def test_setters():
     grid.del_col_width(0)
     assert grid.make_claim() == (23, 23)
 
+def test_incremental_updates():
+    import random
+    random.seed(0)
+
+    grid = drawing.Grid()
+    grid.padding = 1
+    grid.row_heights = {1: 5}
+    grid.col_widths = {2: 'expand'}
+    grid.default_col_width = 0
+    cells = {
+            (i, j): Rect.from_size(random.randint(0, 10), random.randint(0, 10))
+            for i in range(4) for j in range(4)
+    }
+    bbox = Rect.from_size(100, 100)
+
+    for k in range(200):
+        ij = random.randrange(4), random.randrange(4)
+        if ij in cells and random.random() < 0.1:
+            del cells[ij]
+        else:
+            cells[ij] = Rect.from_size(
+                    random.randint(0, 10), random.randint(0, 10))
+
+        fresh = drawing.Grid(
+                min_cell_rects=cells.copy(),
+                padding=1,
+                row_heights={1: 5},
+                col_widths={2: 'expand'},
+                default_col_width=0,
+        )
+        assert grid.make_claim(cells.copy()) == fresh.make_claim()
+        assert grid.make_cells(bbox) == fresh.make_cells(bbox)
+
+    # Widening the last column also narrows the expandable column before it, 
+    # but the cells to the left of those two columns shouldn't be remade.
+    grid.make_claim({(i, j): Rect.null() for i in range(4) for j in range(4)})
+    before = dict(grid.make_cells(bbox))
+
+    grid.set_min_cell_rect(3, 3, Rect.from_size(5, 5))
+    after = grid.make_cells(bbox)
+
+    assert after[0, 0] is before[0, 0]
+    assert after[3, 1] is before[3, 1]
+    assert after[0, 2] is not before[0, 2]
+    assert after[3, 3].width == 5
+
+def test_numpy_backend():
+    pytest.importorskip('numpy')
+
+    def make_cells(backend): #
+        grid = drawing.Grid(
+                num_rows=500,
+                num_cols=400,
+                padding=1.5,
+                row_heights={3: 20},
+                backend=backend,
+        )
+        return grid.make_cells(Rect.from_size(1234.5, 6789.1))
+
+    python_cells = make_cells('python')
+    numpy_cells = make_cells('numpy')
+
+    assert len(numpy_cells) == 500 * 400
+    assert numpy_cells[3, 7] == python_cells[3, 7]
+    assert numpy_cells[499, 399] == python_cells[499, 399]
+    assert (500, 0) not in numpy_cells
+
+    # Only the rectangles that were looked at should've been made.
+    assert len(numpy_cells._rects) == 2
+
+def test_populated_grid(monkeypatch):
+    cells = {
+            (i, j): Rect.from_size((i * 7 + j) % 5, (i + j * 3) % 4)
+            for i in range(300) for j in range(200)
+    }
+    bbox = Rect.from_size(2000, 2000)
+
+    # Filling an empty grid shouldn't have to update the rows and columns one 
+    # cell at a time.
+    def add_min_cell_rect(*args): #
+        raise AssertionError("grid filled one cell at a time")
+
+    with monkeypatch.context() as m:
+        m.setattr(drawing.Grid, '_add_min_cell_rect', add_min_cell_rect)
+        grid = drawing.Grid(min_cell_rects=cells, padding=1)
+
+    assert grid.make_claim() == (200 * 4 + 201, 300 * 3 + 301)
+    assert grid.make_cells(bbox)[299, 199] == \
+            drawing.make_grid(bbox, cells, padding=1)[299, 199]
+
+    # The grid should still be able to update itself incrementally.
+    grid.set_min_cell_rect(0, 0, Rect.from_size(10, 10))
+    assert grid.make_claim() == (10 * 200 + 201, 10 * 300 + 301)
+
+    del grid.min_cell_rects
+    assert grid.make_claim() == (1, 1)
+
+def test_sparse():
+    grid = drawing.Grid(num_rows=500, num_cols=500, sparse=True)
+    grid.set_min_cell_rect(2, 3, Rect.from_size(10, 10))
+    grid.set_min_cell_rect(400, 7, Rect.from_size(10, 10))
+    cells = grid.make_cells(Rect.from_size(5000, 5000))
+
+    assert sorted(cells) == [(2, 3), (400, 7)]
+    assert len(cells) == 2
+    assert cells[2, 3] == Rect(30, 4970, 10, 10)
+    assert (0, 0) not in cells
+    with pytest.raises(KeyError):
+        cells[0, 0]
+
+    # The cells should reflect changes to which cells are occupied.
+    grid.del_min_cell_rect(2, 3)
+    assert sorted(grid.make_cells()) == [(400, 7)]
+    assert (2, 3) not in cells
+    with pytest.raises(KeyError):
+        cells[2, 3]
+
+    grid.sparse = False
+    assert len(grid.make_cells()) == 500 * 500
+
+def test_unknown_backend():
+    with pytest.raises(UsageError):
+        drawing.Grid(backend='fortran')
+
 def test_negative_sizes():
     # Initially I thought this should be an error, but then I decided that it 
     # probably just works as you'd expect it to, and it might be a useful way 
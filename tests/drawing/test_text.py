@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+import pyglet
+import glooey
+
+def test_load_font_cached():
+    f1 = glooey.drawing.load_font(None, 12)
+    f2 = glooey.drawing.load_font(None, 12, bold=None, italic=None)
+    f3 = glooey.drawing.load_font(None, 14)
+
+    assert f1 is f2
+    assert f1 is not f3
+
+def test_load_font_per_context(monkeypatch):
+    f1 = glooey.drawing.load_font(None, 12)
+    m1 = glooey.drawing.get_font_metrics(None, 12)
+
+    # Contexts that don't share objects shouldn't share fonts, because the 
+    # glyphs are stored in textures.
+    class OtherContext:
+        object_space = pyglet.gl.base.ObjectSpace()
+
+    monkeypatch.setattr(pyglet.gl, 'current_context', OtherContext())
+    f2 = glooey.drawing.load_font(None, 12)
+    m2 = glooey.drawing.get_font_metrics(None, 12)
+
+    assert f2 is not f1
+    assert m2 is not m1
+    assert m2.font is f2
+    assert glooey.drawing.load_font(None, 12) is f2
+
+def test_font_metrics():
+    metrics = glooey.drawing.get_font_metrics(None, 12)
+    font = metrics.font
+
+    assert metrics is glooey.drawing.get_font_metrics(None, 12)
+    assert metrics.line_height == font.ascent - font.descent
+
+    width, height = metrics.measure('abc')
+    assert width == sum(g.advance for g in font.get_glyphs('abc'))
+    assert height == metrics.line_height
+
+def test_prewarm_font():
+    elapsed = glooey.drawing.prewarm_font(None, 12, chars='xyz')
+    metrics = glooey.drawing.get_font_metrics(None, 12)
+
+    assert elapsed >= 0
+    assert set('xyz') <= set(metrics._advances)
+    assert metrics.get_advance('x') == metrics.font.get_glyphs('x')[0].advance
+
+def make_bitmap_font():
+    fnt = '''\
+info face="test" size=8
+common lineHeight=10 base=8 scaleW=16 scaleH=16 pages=1
+page id=0 file="test.png"
+chars count=3
+char id=97 x=0 y=0 width=4 height=6 xoffset=0 yoffset=2 xadvance=5 page=0
+char id=98 x=4 y=0 width=4 height=8 xoffset=0 yoffset=0 xadvance=5 page=0
+char id=32 x=0 y=0 width=0 height=0 xoffset=0 yoffset=0 xadvance=3 page=0
+kerning first=97 second=98 amount=-1
+'''
+    image = pyglet.image.ImageData(16, 16, 'RGBA', bytes(16 * 16 * 4))
+    return glooey.drawing.BitmapFont.from_fnt(
+            fnt.splitlines(), lambda name: image)
+
+def test_bitmap_font_measure():
+    font = make_bitmap_font()
+
+    assert font.line_height == 10
+    assert font.measure('a') == (5, 10)
+    assert font.measure('ab') == (9, 10)
+    assert font.measure('ab\na') == (9, 20)
+    assert font.measure('a a a', wrap_width=13) == (13, 20)
+    assert font.split_lines('a a a', wrap_width=13) == ['a a', 'a']
+
+def test_bitmap_text():
+    font = make_bitmap_font()
+    batch = pyglet.graphics.Batch()
+    rect = glooey.drawing.Rect.from_size(20, 20)
+    text = glooey.drawing.BitmapText(font, 'ab', rect, batch=batch)
+
+    assert text.vertex_list.count == 8
+    assert list(text.vertex_list.vertices[:8]) == [0, 12, 4, 12, 4, 18, 0, 18]
+
+    text.text = 'a b a'
+    assert text.vertex_list.count == 12
+
+    # Characters missing from the font shouldn't affect kerning, when the text 
+    # is either measured or drawn.
+    assert font.get_line_width('axb') == font.get_line_width('ab')
+
+    text.align = 'right'
+    text.text = 'ab'
+    vertices = list(text.vertex_list.vertices)
+
+    text.text = 'axb'
+    assert list(text.vertex_list.vertices) == vertices
+
+def test_shared_text_layout():
+    batch = pyglet.graphics.Batch()
+    parent = pyglet.graphics.Group()
+    layouts = [
+            glooey.drawing.SharedTextLayout(
+                pyglet.text.decode_text('abc'),
+                batch=batch,
+                group=pyglet.graphics.OrderedGroup(1, parent),
+            )
+            for i in range(2)
+    ]
+    assert layouts[0].top_group is not layouts[1].top_group
+    assert layouts[0].top_group == layouts[1].top_group
+
+    # Both layouts should end up in the same branch of the batch's group tree, 
+    # so the batch only has to set their state once.
+    layer, = batch.group_children[parent]
+    top_group, = batch.group_children[layer]
+    assert top_group == layouts[0].top_group
+
+def test_text_raster_cache(tmp_path):
+    glooey.drawing.set_text_raster_cache_dir(tmp_path)
+    try:
+        style = {'font_size': 12, 'color': (255, 0, 0, 255)}
+        raster = glooey.drawing.get_text_raster('abc', style)
+
+        # The color isn't part of the raster, so it isn't part of the key.
+        assert raster is glooey.drawing.get_text_raster('abc', {'font_size': 12})
+        assert len(list(tmp_path.iterdir())) == 1
+
+        glooey.drawing.clear_text_raster_cache()
+        cached_raster = glooey.drawing.get_text_raster('abc', style)
+
+        assert cached_raster is not raster
+        assert cached_raster.width == raster.width
+        assert cached_raster.height == raster.height
+        assert len(list(tmp_path.iterdir())) == 1
+
+    finally:
+        glooey.drawing.set_text_raster_cache_dir(None)
+        glooey.drawing.clear_text_raster_cache()
+
+def test_text_raster_keys(monkeypatch):
+    from glooey.drawing import text
+    from pathlib import Path
+
+    # Don't let the font registered below leak into other tests.
+    monkeypatch.setattr(text, '_font_file_hashes', {})
+
+    font_path = Path(__file__).parents[1] / 'buttons/assets/fonts/LiberationMono-Bold.ttf'
+    style = {'font_name': 'Liberation Mono', 'font_size': 12}
+    other_style = {'font_name': 'Some Other Font', 'font_size': 12}
+
+    key = text._make_raster_key('abc', style, 0)
+    other_key = text._make_raster_key('abc', other_style, 0)
+
+    with font_path.open('rb') as file:
+        glooey.drawing.register_font_file(file)
+
+    # Registering a font should only invalidate the rasters drawn in it.
+    assert text._make_raster_key('abc', style, 0) != key
+    assert text._make_raster_key('abc', other_style, 0) == other_key
+
+def test_read_font_family():
+    from glooey.drawing import text
+    from pathlib import Path
+
+    font_path = Path(__file__).parent / 'assets/fonts/LiberationMono-Bold.ttf'
+    assert text._read_font_family(font_path.read_bytes()) == 'liberation mono'
+    assert text._read_font_family(b'not a font') is None
+
+def test_text_raster_cache_size(monkeypatch):
+    from glooey.drawing import text
+    monkeypatch.setattr(text, '_max_text_rasters', 2)
+
+    try:
+        a = glooey.drawing.get_text_raster('a', {})
+        b = glooey.drawing.get_text_raster('b', {})
+        assert glooey.drawing.get_text_raster('a', {}) is a
+
+        # The least recently used raster is forgotten first.
+        glooey.drawing.get_text_raster('c', {})
+        assert glooey.drawing.get_text_raster('a', {}) is a
+        assert glooey.drawing.get_text_raster('b', {}) is not b
+
+    finally:
+        glooey.drawing.clear_text_raster_cache()
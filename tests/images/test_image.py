@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+
+import pytest
+import pyglet
+import glooey
+
+def test_redraw_fast_path(mock_window):
+    gui = glooey.Gui(mock_window)
+    image = glooey.Image(pyglet.image.ImageData(8, 8, 'RGBA', bytes(8 * 8 * 4)))
+    image.alignment = 'bottom left'
+    gui.add(image)
+
+    sprite = image._sprite
+    texture = sprite._texture
+    num_updates = 0
+
+    def update_position(): #
+        nonlocal num_updates
+        num_updates += 1
+        type(sprite)._update_position(sprite)
+
+    sprite._update_position = update_position
+
+    # Redrawing without changing anything shouldn't touch the sprite.
+    image._draw()
+    assert num_updates == 0
+    assert sprite._texture is texture
+
+    # Moving the image should update the sprite's vertices exactly once.
+    image.alignment = 'top right'
+    assert num_updates == 1
+    assert image._sprite is sprite
+    assert sprite.position == (592, 472)
+
+    # Setting a new image should reassign the sprite image.
+    image.image = pyglet.image.ImageData(8, 8, 'RGBA', bytes(8 * 8 * 4))
+    assert image._sprite is sprite
+    assert sprite._texture is not texture
+    assert sprite.position == (592, 472)
+
+def test_pending_image(mock_window, load_image_async):
+    gui = glooey.Gui(mock_window)
+    placeholder = pyglet.image.ImageData(4, 4, 'RGBA', bytes(4 * 4 * 4))
+    pending = load_image_async(
+            'image.png', size_hint=(16, 8), placeholder=placeholder)
+
+    image = glooey.Image(pending)
+    background = glooey.Background(image=pending)
+    gui.add(image)
+    gui.add(background)
+
+    # Until the image arrives, show the placeholder but reserve space for the 
+    # size hint.
+    assert not pending.is_ready
+    assert image.claimed_size == (16, 8)
+    assert image._sprite_image is placeholder
+    assert background.claimed_size == (4, 4)
+
+    # The texture is only uploaded when the pending images are processed, 
+    # which normally happens once per frame.
+    assert not pending.is_ready
+
+    assert glooey.drawing.process_pending_images() == 1
+    assert pending.is_ready
+    assert image.claimed_size == (16, 8)
+    assert image._sprite_image is pending.image
+    assert background.claimed_size == (16, 8)
+
+def test_pending_image_error(tmp_path, mock_window, load_image_async):
+    gui = glooey.Gui(mock_window)
+    bad_path = tmp_path / 'bad.png'
+    bad_path.write_bytes(b'not an image')
+
+    placeholder = pyglet.image.ImageData(4, 4, 'RGBA', bytes(4 * 4 * 4))
+    bad = glooey.drawing.load_image_async(
+            str(bad_path), placeholder=placeholder)
+    good = load_image_async('good.png')
+    bad._future.result()
+
+    image = glooey.Image(bad)
+    gui.add(image)
+    failures = []
+    bad.add_callback(failures.append)
+
+    # Images that can't be decoded shouldn't stop the others from being 
+    # uploaded, and shouldn't raise from the clock callback.
+    assert glooey.drawing.process_pending_images(budget=float('inf')) == 1
+    assert good.is_ready
+    assert bad.is_failed
+    assert not bad.is_ready
+    assert failures == [bad]
+    assert image._sprite_image is placeholder
+
+    with pytest.raises(Exception) as error:
+        bad.wait()
+    assert error.value is bad.error
+
+def test_pending_background(mock_window, load_image_async):
+    gui = glooey.Gui(mock_window)
+    background = glooey.Background()
+    gui.add(background)
+
+    # Setting other attributes while an image is pending shouldn't be undone 
+    # when the image arrives.
+    pending = load_image_async('image.png')
+    background.set_appearance(color='red', image=pending)
+    background.set_color('green')
+
+    glooey.drawing.process_pending_images(budget=float('inf'))
+    assert background.color == 'green'
+    assert background.appearance[1, 1] is pending.image
+
+    # Setting the image resets the rest of the appearance, just like 
+    # set_appearance(image=...) does, so tiles that were still pending 
+    # shouldn't come back once they're ready.
+    pending_top = load_image_async('top.png')
+    pending_image = load_image_async('image2.png')
+    background.set_appearance(color='green', top=pending_top)
+    background.set_image(pending_image)
+
+    glooey.drawing.process_pending_images(budget=float('inf'))
+    assert background.color is None
+    assert (0, 1) not in background.appearance
+    assert background.appearance[1, 1] is pending_image.image
+
+def test_managed_image(mock_window):
+    gui = glooey.Gui(mock_window)
+    num_loads = 0
+
+    def load_image(): #
+        nonlocal num_loads
+        num_loads += 1
+        return pyglet.image.ImageData(16, 16, 'RGBA', bytes(16 * 16 * 4))
+
+    managed_images = [glooey.drawing.ManagedImage(load_image) for i in range(3)]
+    images = [glooey.Image(x) for x in managed_images]
+    num_bytes = 16 * 16 * 4
+
+    try:
+        glooey.drawing.set_texture_budget(2 * num_bytes)
+
+        # Textures that are being drawn are kept even if that means going over 
+        # budget.
+        for image in images:
+            gui.add(image)
+
+        assert num_loads == 3
+        assert glooey.drawing.get_texture_memory() == 3 * num_bytes
+
+        # Once they aren't drawn anymore, the least recently drawn textures are 
+        # evicted to get back under budget.
+        gui.remove(images[0])
+        gui.remove(images[1])
+        assert not managed_images[0].is_loaded
+        assert managed_images[1].is_loaded
+        assert glooey.drawing.get_texture_memory() == 2 * num_bytes
+
+        # Evicted textures are reloaded when they're needed again.
+        gui.add(images[0])
+        assert num_loads == 4
+        assert images[0]._sprite.image is managed_images[0].get_texture()
+        assert not managed_images[1].is_loaded
+
+    finally:
+        glooey.drawing.set_texture_budget(None)
+
+def test_managed_image_downscale(mock_window):
+    gui = glooey.Gui(mock_window)
+    managed_image = glooey.drawing.ManagedImage(
+            lambda: pyglet.image.ImageData(64, 64, 'RGBA', bytes(64 * 64 * 4)),
+            downscale=True,
+    )
+    image = glooey.Image(managed_image, responsive=True)
+    image.size_hint = 15, 15
+    image.alignment = 'center'
+    gui.add(image)
+
+    # The image is drawn at less than a quarter of its size, so a copy that's 
+    # a quarter of the size can be used instead.
+    assert image._sprite.image.width == 16
+    assert image._sprite.width == 15
+    assert managed_image.get_downscale_factor(1) == 1
+    assert managed_image.get_downscale_factor(0.5) == 2
+
+def test_managed_image_tile():
+    def make_image(): #
+        return pyglet.image.ImageData(8, 8, 'RGBA', bytes(8 * 8 * 4))
+
+    managed_images = [glooey.drawing.ManagedImage(make_image) for i in range(2)]
+    tile = glooey.drawing.Tile(
+            glooey.Rect.from_size(8, 8), make_image(),
+            batch=pyglet.graphics.Batch(), hidden=True)
+
+    # Giving a hidden tile a managed image shouldn't load it.
+    tile.image = managed_images[0]
+    assert not managed_images[0].is_loaded
+
+    # The texture is loaded once the tile is shown, and then can be evicted 
+    # once the tile moves on to another image.
+    tile.show()
+    assert managed_images[0].is_loaded
+
+    tile.image = managed_images[1]
+    managed_images[0].evict()
+    assert not managed_images[0].is_loaded
+    assert managed_images[1].is_loaded
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+import pyglet
+import glooey
+import run_demos
+
+class TestListView(glooey.ListView):
+    custom_size_hint = 300, 300
+    custom_alignment = 'center'
+
+    class Frame(glooey.Frame):
+
+        class Decoration(glooey.Background):
+            custom_outline = 'green'
+
+    class VBar(glooey.VScrollBar):
+        custom_scale_grip = True
+
+        class Decoration(glooey.Background):
+            custom_color = 'dark'
+
+        class Grip(glooey.Button):
+            custom_size_hint = 20, 20
+            custom_alignment = 'fill'
+
+            class Base(glooey.Background):
+                custom_color = 'green'
+
+            class Over(glooey.Background):
+                custom_color = 'orange'
+
+            class Down(glooey.Background):
+                custom_color = 'purple'
+
+    def do_bind_row(self, row, item):
+        row.text = f"Item #{item}"
+
+
+window = pyglet.window.Window()
+gui = glooey.Gui(window)
+view = TestListView(range(100000))
+gui.add(view)
+
+@run_demos.on_space(gui) #
+def test_list_view():
+    yield "Show the first of 100,000 items."
+
+    view.items = range(10)
+    yield "Show only 10 items."
+
+    view.items = range(100000)
+    view.row_height = 30
+    yield "Show 100,000 items with 30 px rows."
+
+pyglet.app.run()
+
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+import pyglet
+import glooey
+import run_demos
+
+class TestTableView(glooey.TableView):
+    custom_size_hint = 400, 300
+    custom_alignment = 'center'
+    custom_num_header_rows = 1
+    custom_num_header_cols = 1
+
+    class HeaderCell(glooey.Label):
+        custom_bold = True
+
+    class HVBar:
+
+        class Decoration(glooey.Background):
+            custom_color = 'dark'
+
+        class Grip(glooey.Button):
+            custom_size_hint = 20, 20
+            custom_alignment = 'fill'
+
+            class Base(glooey.Background):
+                custom_color = 'green'
+
+            class Over(glooey.Background):
+                custom_color = 'orange'
+
+            class Down(glooey.Background):
+                custom_color = 'purple'
+
+    class HBar(HVBar, glooey.HScrollBar):
+        pass
+
+    class VBar(HVBar, glooey.VScrollBar):
+        pass
+
+
+def make_data(num_rows, num_cols):
+    header = [''] + [f"Col {j}" for j in range(1, num_cols)]
+    rows = [
+            [f"Row {i}"] + [f"{i}x{j}" for j in range(1, num_cols)]
+            for i in range(1, num_rows)
+    ]
+    return [header] + rows
+
+window = pyglet.window.Window()
+gui = glooey.Gui(window)
+table = TestTableView(make_data(5000, 40))
+gui.add(table)
+
+@run_demos.on_space(gui) #
+def test_table_view():
+    yield "Show a 5000x40 table with frozen headers."
+
+    table.data = make_data(5, 3)
+    yield "Show a 5x3 table."
+
+    table.data = make_data(5000, 40)
+    table.default_col_width = 80
+    yield "Show a 5000x40 table with 80 px columns."
+
+pyglet.app.run()
+
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+import glooey
+
+class Row(glooey.Widget):
+
+    def __init__(self):
+        super().__init__()
+        self.item = None
+
+    def do_claim(self):
+        return 100, 20
+
+class NumberListView(glooey.ListView):
+    Row = Row
+    custom_buffer_rows = 1
+
+    def do_bind_row(self, row, item):
+        row.item = item
+
+def test_list_view_recycling(mock_window):
+    gui = glooey.Gui(mock_window)
+    view = NumberListView(range(100000))
+    view.size_hint = 100, 100
+    view.alignment = 'center'
+    gui.add(view)
+
+    def bound_items(): #
+        return sorted(
+                view.get_row(i).item
+                for i in range(100000) if view.get_row(i))
+
+    # The content should be as tall as all the rows, but only the rows in
+    # view (plus the buffer) should have widgets.
+    assert view.row_height == 20
+    assert view._pane.child.claimed_height == 20 * 100000
+    assert bound_items() == list(range(6))
+
+    # Scrolling should rebind the existing rows instead of making new ones.
+    view._pane.scroll((0, -200))
+    assert bound_items() == list(range(9, 16))
+    assert view.get_row(9).rect.top == 20 * (100000 - 9)
+
+    view._pane.view = 'bottom'
+    assert bound_items() == list(range(99994, 100000))
+    assert len(view._pane.child) == 7
+
+    # Changing the items should rebind the rows and resize the content.
+    view.items = ['a', 'b', 'c']
+    assert bound_items() == ['a', 'b', 'c']
+    assert view._pane.child.claimed_height == 60
+
+def test_list_view_repack_error(mock_window, monkeypatch):
+    gui = glooey.Gui(mock_window)
+    view = NumberListView(range(10))
+    gui.add(view)
+
+    def fail(self): #
+        raise ZeroDivisionError
+
+    # An error during a repack shouldn't leave the list thinking it's still 
+    # being repacked.
+    monkeypatch.setattr(glooey.Widget, '_repack', fail)
+    try:
+        view._content._repack()
+    except ZeroDivisionError:
+        pass
+
+    assert not view._content.is_repacking
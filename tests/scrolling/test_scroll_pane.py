@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+import glooey
+
+class Row(glooey.Widget):
+
+    def __init__(self, height=20):
+        super().__init__()
+        self.is_drawn = False
+        self.claim_height = height
+
+    def do_claim(self):
+        return 100, self.claim_height
+
+    def do_draw(self):
+        self.is_drawn = True
+
+    def do_undraw(self):
+        self.is_drawn = False
+
+def test_scroll_pane_culling(mock_window):
+    gui = glooey.Gui(mock_window)
+    pane = glooey.ScrollPane()
+    pane.size_hint = 100, 100
+    pane.vert_scrolling = True
+    pane.alignment = 'center'
+    pane._mover.cull_margin = 0
+
+    vbox = glooey.VBox()
+    rows = [Row() for i in range(100)]
+    for row in rows:
+        vbox.pack(row)
+
+    pane.add(vbox)
+    gui.add(pane)
+
+    def drawn_rows(): #
+        return [i for i, row in enumerate(rows) if row.is_drawn]
+
+    # Only the rows inside the pane should be drawn.  Rows that are just
+    # touching the edge of the pane are drawn too, to be safe.
+    assert drawn_rows() == list(range(6))
+
+    # Scrolling should draw the rows that come into view, and undraw the rows
+    # that leave it.
+    pane.scroll((0, -200))
+    assert drawn_rows() == list(range(9, 16))
+
+    pane.view = 'bottom'
+    assert drawn_rows() == list(range(94, 100))
+
+    # Resizing the pane should only cull its content once.
+    num_culls = 0
+
+    def cull(visible_rect): #
+        nonlocal num_culls
+        num_culls += 1
+        glooey.VBox._cull(vbox, visible_rect)
+
+    vbox._cull = cull
+    pane.size_hint = 100, 120
+    assert num_culls == 1
+    assert drawn_rows() == list(range(93, 100))
+    del vbox._cull
+
+    # Rows that are detached shouldn't stay culled.
+    vbox.remove(rows[0])
+    assert not rows[0].is_drawn
+    assert rows[0]._Widget__is_culled == False
+
+    # Movers that don't know where they're clipped draw everything.
+    pane._mover.clip_rect = None
+    assert all(row.is_drawn for row in rows[1:])
+
+def test_scroll_pane_culling_relayout(mock_window):
+    gui = glooey.Gui(mock_window)
+    pane = glooey.ScrollPane()
+    pane.size_hint = 100, 100
+    pane.vert_scrolling = True
+    pane.alignment = 'center'
+    pane._mover.cull_margin = 0
+
+    # Give the box a fixed height, so shrinking a row rearranges the other 
+    # rows without changing the size of the content.
+    vbox = glooey.VBox()
+    vbox.height_hint = 300
+    rows = [Row(200)] + [Row() for i in range(5)]
+    for row in rows:
+        vbox.pack(row)
+
+    pane.add(vbox)
+    gui.add(pane)
+
+    def drawn_rows(): #
+        return [i for i, row in enumerate(rows) if row.is_drawn]
+
+    assert drawn_rows() == [0]
+
+    # The rows that move into view should be drawn.
+    rows[0].claim_height = 20
+    rows[0]._repack()
+    assert drawn_rows() == list(range(6))
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+
+import glooey
+
+class Cell(glooey.Widget):
+
+    def __init__(self):
+        super().__init__()
+        self.item = None
+
+    def do_claim(self):
+        return 20, 10
+
+class CoordTableView(glooey.TableView):
+    Cell = Cell
+    HeaderCell = Cell
+    custom_num_header_rows = 1
+    custom_num_header_cols = 2
+    custom_buffer_cells = 0
+
+    def do_bind_cell(self, cell, item):
+        cell.item = item
+
+def test_table_view_windowing(mock_window):
+    gui = glooey.Gui(mock_window)
+    data = [[(i, j) for j in range(100)] for i in range(10000)]
+    table = CoordTableView(data)
+    table.size_hint = 140, 110
+    table.alignment = 'center'
+    gui.add(table)
+
+    def bound_items(cells): #
+        return sorted(
+                cell.item for cell in cells._cells.values())
+
+    def bound_block(rows, cols): #
+        return [(i, j) for i in rows for j in cols]
+
+    # The body should be as big as all the cells, but only the cells in view
+    # should have widgets.  The body is 100x100 px, because the headers take
+    # up 1 row and 2 columns.
+    assert table.row_height == 10
+    assert table.get_col_width(2) == 20
+    assert table.default_col_width == 20
+    assert table._body_cells.claimed_size == (20 * 98, 10 * 9999)
+    assert bound_items(table._corner_cells) == bound_block(range(1), range(2))
+    assert bound_items(table._body_cells) == \
+            bound_block(range(1, 11), range(2, 7))
+
+    # The headers should scroll along with the body, but only in one
+    # direction each.
+    table._body_pane.scroll((200, -500))
+    assert bound_items(table._body_cells) == \
+            bound_block(range(51, 61), range(12, 17))
+    assert bound_items(table._col_header_cells) == \
+            bound_block(range(1), range(12, 17))
+    assert bound_items(table._row_header_cells) == \
+            bound_block(range(51, 61), range(2))
+
+    assert table.get_cell(51, 0).rect.top == table.get_cell(51, 12).rect.top
+    assert table.get_cell(0, 12).rect.left == table.get_cell(51, 12).rect.left
+
+    # Changing the data should rebind the cells and resize the blocks.
+    table.data = [[(i, j) for j in range(4)] for i in range(3)]
+    assert bound_items(table._body_cells) == \
+            bound_block(range(1, 3), range(2, 4))
+    assert table._body_cells.claimed_size == (40, 20)
+
+def test_table_view_col_widths(mock_window):
+
+    class WideCell(Cell):
+
+        def do_claim(self):
+            if self.item is None:
+                return 0, 0
+            return 10 * (self.item[1] % 3 + 1), 10
+
+    class WideTableView(CoordTableView):
+        Cell = WideCell
+        HeaderCell = WideCell
+
+        def do_bind_cell(self, cell, item):
+            cell.item = item
+            cell._repack()
+
+    gui = glooey.Gui(mock_window)
+    data = [[(i, j) for j in range(100)] for i in range(10000)]
+    table = WideTableView(data)
+    table.size_hint = 140, 110
+    table.alignment = 'center'
+    gui.add(table)
+
+    def col_rects(cells, row): #
+        return {
+                j: (cell.rect.left, cell.rect.width)
+                for (i, j), cell in cells._cells.items()
+                if i == row
+        }
+
+    # Each column should be as wide as the cells that have been displayed in 
+    # it, and the columns should be packed next to each other.
+    table._body_pane.scroll((0, -500))
+    rects = col_rects(table._body_cells, 51)
+    left = table._body_cells.rect.left
+    for j in range(2, 7):
+        assert table.get_col_width(j) == 10 * (j % 3 + 1)
+        assert rects[j] == (left, table.get_col_width(j))
+        left += table.get_col_width(j)
+
+    assert table.get_col_width(0) == 10
+    assert table.get_col_width(1) == 20
+    assert table.default_col_width == 30
+
+    # The headers should line up with the body.
+    header_rects = col_rects(table._col_header_cells, 0)
+    for j in range(2, 7):
+        assert header_rects[j] == rects[j]
+
+    # Only the columns in view should be bound: the body is 110 px wide, 
+    # which fits columns 2-6 (30+10+20+30+10 = 100 px) and part of 7.
+    assert sorted(rects) == list(range(2, 8))
+
+    # Fixed widths take precedence over the estimates, and don't affect the 
+    # width assumed for columns that haven't been measured yet.
+    table.set_col_width(3, 50)
+    cells = table._body_cells
+    assert table.get_col_width(3) == 50
+    assert table.default_col_width == 30
+    assert cells.get_cell_rect(51, 3).width == 50
+    assert cells.get_cell_rect(51, 4).left == cells.get_cell_rect(51, 3).right
+    assert table.get_cell(51, 3).rect == cells.get_cell_rect(51, 3)
+
+    table.del_col_width(3)
+    assert table.get_col_width(3) == 10
+
+    # The body should never have more cell widgets than fit in the view plus 
+    # the ones waiting to be recycled.
+    cells = table._body_cells
+    assert len(cells._cells) + len(cells._spare_cells) == \
+            len(cells)
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+import pyglet
+import glooey
+import run_demos
+
+window = pyglet.window.Window()
+gui = glooey.Gui(window)
+
+frame = glooey.Frame()
+frame.decoration.outline = 'green'
+
+pane = glooey.ScrollPane()
+pane.size_hint = 300, 300
+pane.vert_scrolling = True
+
+lines = [f"Line {i+1}" for i in range(10000)]
+label = glooey.LongLabel('\n'.join(lines))
+
+pane.add(label)
+frame.add(pane)
+gui.add(frame)
+
+@run_demos.on_space(gui) #
+def test_long_label():
+    yield "Show the first lines of a 10,000 line label."
+
+    pane.view = 'bottom'
+    yield "Jump to the last lines."
+
+    pane.jump_percent((0, 0.5))
+    yield "Jump to the middle of the label."
+
+    for i in range(10):
+        pane.scroll((0, 30))
+    yield "Scroll up by 300 px."
+
+    label.text = '\n'.join(lines[:20])
+    yield "Shrink the label to 20 lines."
+
+pyglet.app.run()
+
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+import pyglet
+import glooey
+
+def test_set_text_in_place(mock_window):
+    gui = glooey.Gui(mock_window)
+    label = glooey.Label('01:00')
+    gui.add(label)
+
+    layout = label._layout
+    size = label.claimed_size
+
+    # Text that needs the same amount of space should just be edited into the 
+    # document that's already being displayed.
+    label.text = '00:01'
+    assert label._layout is layout
+    assert label.claimed_size == size
+    assert label.text == layout.document.text
+
+    # Text that needs more space should cause the label to be repacked.
+    label.text = '00:00\n00:00'
+    assert label.claimed_size != size
+    assert label.text == '00:00\n00:00'
+
+def test_set_text_size_hint(mock_window):
+    gui = glooey.Gui(mock_window)
+    label = glooey.Label('0')
+    label.size_hint = 200, 200
+    gui.add(label)
+
+    layout = label._layout
+    label.text = '1000'
+    assert label._layout is layout
+    assert label.claimed_size == (200, 200)
+
+def test_set_text_no_edit_event(mock_window):
+    gui = glooey.Gui(mock_window)
+    label = glooey.Label('a')
+    gui.add(label)
+
+    edits = []
+    label.push_handlers(on_edit_text=edits.append)
+    label.text = 'b'
+    assert edits == []
+
+def test_bitmap_font(mock_window):
+    fnt = [
+            'common lineHeight=10 base=8 scaleW=16 scaleH=16 pages=1',
+            'page id=0 file="test.png"',
+            'char id=48 x=0 y=0 width=4 height=8 xoffset=0 yoffset=0 xadvance=5',
+            'char id=49 x=4 y=0 width=4 height=8 xoffset=0 yoffset=0 xadvance=5',
+    ]
+    image = pyglet.image.ImageData(16, 16, 'RGBA', bytes(16 * 16 * 4))
+    font = glooey.drawing.BitmapFont.from_fnt(fnt, lambda name: image)
+
+    class BitmapLabel(glooey.Label):
+        custom_bitmap_font = font
+
+    gui = glooey.Gui(mock_window)
+    label = BitmapLabel('00')
+    gui.add(label)
+
+    assert label._layout is None
+    assert label.claimed_size == (10, 10)
+    assert label._bitmap_text.vertex_list.count == 8
+
+    label.text = '011'
+    assert label.claimed_size == (15, 10)
+    assert label._bitmap_text.vertex_list.count == 12
+
+def test_shared_layout(mock_window):
+    class SharedLabel(glooey.Label):
+        custom_shared_layout = True
+
+    gui = glooey.Gui(mock_window)
+    hbox = glooey.HBox()
+    label = glooey.Label('abc')
+    shared_label = SharedLabel('abc')
+    hbox.pack(label)
+    hbox.pack(shared_label)
+    gui.add(hbox)
+
+    assert type(label._layout) is pyglet.text.layout.TextLayout
+    assert type(shared_label._layout) is glooey.drawing.SharedTextLayout
@@ -22,3 +22,24 @@ def test_assets_installed(theme):
     # their locations:
     for path in manifest:
         assets.location(path)
+
+def test_lazy_assets():
+    import glooey
+    assets = ResourceLoader('golden')
+
+    class LazyButton(glooey.Button):
+        custom_base_image = assets.lazy_image('buttons/radio/checked.png')
+
+    # Nothing should be loaded until the asset is actually used.
+    lazy_image = LazyButton.__dict__['custom_base_image']
+    assert not lazy_image.is_loaded
+
+    # Looking at the class shouldn't load anything either.
+    assert LazyButton.custom_base_image is lazy_image
+    assert not lazy_image.is_loaded
+
+    button = LazyButton()
+    assert lazy_image.is_loaded
+    assert button.base_background.appearance[1, 1] is \
+            button.custom_base_image
+    assert button.custom_base_image is LazyButton().custom_base_image